@@ -1,6 +1,162 @@
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Type
+
+import numpy as np
+import pytest
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from ttsbench.models import registry  # noqa: E402
+from ttsbench.models.base import BaseTTSModel, ModelCapabilities, SynthResult  # noqa: E402
+from ttsbench.utils.results import ResultsWriter, RunInfo  # noqa: E402
+
+
+class FakeModel(BaseTTSModel):
+    """In-memory model for tests; the ``fake_model`` fixture makes configured subclasses.
+
+    ``synth`` sleeps ``latency()`` and returns ``audio(text)``; with ``chunks`` set it also
+    streams that many such chunks. ``calls``, ``loads`` and ``unloads`` count per subclass.
+    """
+
+    name = "fake"
+    description = "Test model"
+    capabilities = ModelCapabilities(languages=["en"], supports_cloning=False, supports_styles=True)
+    sample_rate = 8000
+    latency: Callable[[], float] = staticmethod(lambda: 0.0)
+    audio: Callable[[str], np.ndarray] = staticmethod(lambda text: np.zeros(160, np.float32))
+    timings: Dict[str, float] = {}
+    # Text that makes ``synth`` raise, to inject failures.
+    fail_text: Optional[str] = None
+    chunks = 0
+    calls = 0
+    loads = 0
+    unloads = 0
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    @classmethod
+    def availability_help(cls) -> str:
+        return ""
+
+    def load(self, config: Dict[str, Any]) -> None:
+        type(self).loads += 1
+
+    def unload(self) -> None:
+        type(self).unloads += 1
+
+    def synth(self, text: str, config: Dict[str, Any], out_dir: Path) -> SynthResult:
+        type(self).calls += 1
+        if text == self.fail_text:
+            raise RuntimeError("injected")
+        time.sleep(self.latency())
+        return SynthResult(
+            audio_path=None,
+            sample_rate=self.sample_rate,
+            timings=dict(self.timings),
+            stats={},
+            audio=self.audio(text),
+        )
+
+    def can_stream(self, config: Dict[str, Any]) -> bool:
+        return self.chunks > 0
+
+    def stream_sample_rate(self, config: Dict[str, Any]) -> int:
+        return self.sample_rate
+
+    def synth_stream(self, text: str, config: Dict[str, Any]) -> Iterator[np.ndarray]:
+        for _ in range(self.chunks):
+            time.sleep(self.latency())
+            yield self.audio(text)
+
+
+@pytest.fixture
+def fake_model(monkeypatch: pytest.MonkeyPatch) -> Callable[..., Type[FakeModel]]:
+    """Registers a ``FakeModel`` subclass named ``name`` with the given attributes.
+
+    ``latency`` and ``audio`` are plain callables; ``supports_styles`` sets the capabilities.
+    """
+
+    def make(
+        name: str = "fake", supports_styles: bool = True, **attributes: Any
+    ) -> Type[FakeModel]:
+        for hook in ("latency", "audio"):
+            if hook in attributes:
+                attributes[hook] = staticmethod(attributes[hook])
+        capabilities = ModelCapabilities(
+            languages=["en"], supports_cloning=False, supports_styles=supports_styles
+        )
+        model = type(
+            f"Fake_{name}",
+            (FakeModel,),
+            dict(attributes, name=name, capabilities=capabilities, calls=0, loads=0, unloads=0),
+        )
+        monkeypatch.setitem(registry.MODEL_REGISTRY, name, model)
+        return model
+
+    return make
+
+
+def write_run(
+    run_dir: Path,
+    outputs: Sequence[Dict[str, Any]],
+    run_id: Optional[str] = None,
+    created_at: datetime = datetime(2026, 10, 1),
+    prompts: Sequence[Dict[str, Any]] = (),
+    models: Sequence[Dict[str, Any]] = (),
+    prompts_path: str = "prompts.yaml",
+    seed: int = 1,
+) -> Path:
+    """A run directory whose ``results.sqlite`` holds ``outputs``, in order.
+
+    Each output names its ``model`` and ``prompt_id`` and may set ``style``, ``audio_path``,
+    ``sample_rate`` (16000), ``metrics`` and ``trials``. Models and prompts not given in
+    ``models``/``prompts`` are added as outputs first name them (prompts as English "hello").
+    ``run_id`` defaults to the directory name.
+    """
+    run_id = run_id or run_dir.name
+    run_dir.mkdir(parents=True, exist_ok=True)
+    model_rows = [dict(model) for model in models]
+    prompt_rows = [dict(prompt) for prompt in prompts]
+    for output in outputs:
+        if output["model"] not in {row["name"] for row in model_rows}:
+            model_rows.append({"name": output["model"], "description": "", "available": True})
+        if output["prompt_id"] not in {row["id"] for row in prompt_rows}:
+            prompt_rows.append(
+                {"id": output["prompt_id"], "text": "hello", "language": "en", "style": "neutral"}
+            )
+    writer = ResultsWriter(run_dir / "results.sqlite")
+    writer.write_run(RunInfo(run_id, created_at, prompts_path, seed))
+    model_ids = writer.write_models(run_id, model_rows)
+    model_ids = dict(zip((row["name"] for row in model_rows), model_ids))
+    prompt_ids = writer.write_prompts(run_id, prompt_rows)
+    prompt_ids = dict(zip((row["id"] for row in prompt_rows), prompt_ids))
+    writer.write_outputs(
+        [
+            {
+                "run_id": run_id,
+                "model_id": model_ids[output["model"]],
+                "prompt_id": prompt_ids[output["prompt_id"]],
+                "audio_path": output.get("audio_path"),
+                "sample_rate": output.get("sample_rate", 16000),
+                "style": output.get("style"),
+                "metrics": output.get("metrics", {}),
+                "trials": output.get("trials"),
+            }
+            for output in outputs
+        ]
+    )
+    writer.engine.dispose()
+    return run_dir
+
+
+@pytest.fixture
+def make_run() -> Callable[..., Path]:
+    """``write_run``: builds a run's ``results.sqlite`` from a list of outputs."""
+    return write_run
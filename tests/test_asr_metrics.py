@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+
+from ttsbench.metrics.asr_metrics import ASR_SAMPLE_RATE, ASRConfig, ASREngine, score_transcript
+from ttsbench.utils.audio import resample
+
+
+class FakeWhisper:
+    """Transcribes every clip as ``"<language> <samples>"``, one utterance at a time."""
+
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+        self.options: List[Dict[str, Any]] = []
+
+    def transcribe(self, audio: np.ndarray, language: str = "en", **options: Any):
+        self.calls.append(language)
+        self.options.append(options)
+        return [SimpleNamespace(text=f" {language} {audio.shape[0]}")], None
+
+
+class FakeTokenizer:
+    def __init__(self, language: str) -> None:
+        self.language = language
+
+    def decode(self, ids: List[int]) -> str:
+        return f" {self.language} {ids[0]}"
+
+
+class BatchedFakeWhisper(FakeWhisper):
+    """Also serves the batched encode/generate path with the same transcripts.
+
+    Each clip's mel features carry its sample count, which ``generate`` returns as its token.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.model = SimpleNamespace(generate=self._generate)
+        self.batches: List[int] = []
+        self.generate_options: List[Dict[str, Any]] = []
+
+    def feature_extractor(self, audio: np.ndarray) -> np.ndarray:
+        return np.full((2, audio.shape[0] // 160), audio.shape[0], dtype=np.float32)
+
+    def encode(self, features: np.ndarray) -> np.ndarray:
+        assert features.shape[1:] == (2, 3000)
+        return features
+
+    def get_prompt(self, tokenizer: FakeTokenizer, previous: List[int], without_timestamps: bool):
+        return [tokenizer.language]
+
+    def _generate(self, encoder_output: np.ndarray, prompts: List[List[str]], **options):
+        self.batches.append(len(prompts))
+        self.generate_options.append(options)
+        return [SimpleNamespace(sequences_ids=[[int(row.max())]]) for row in encoder_output]
+
+
+def test_engine_reuses_model_across_batch() -> None:
+    engine = ASREngine()
+    fake = FakeWhisper()
+    engine._model = fake
+    audios = [np.zeros(ASR_SAMPLE_RATE, dtype=np.float32), np.zeros(800, dtype=np.float32)]
+    transcripts = engine.transcribe_batch(audios, ["en", "es"])
+    assert transcripts == [f"en {ASR_SAMPLE_RATE}", "es 800"]
+    assert engine.model is fake
+
+
+def test_score_transcript_and_resample() -> None:
+    scores = score_transcript("Hello world", "hello world")
+    assert scores == {"wer": 0.0, "cer": 0.0}
+    audio = np.sin(np.linspace(0, 100, 24000)).astype(np.float32)
+    assert resample(audio, 24000, ASR_SAMPLE_RATE).shape[0] == ASR_SAMPLE_RATE
+
+
+def test_batched_generate_matches_per_utterance_transcripts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = ASREngine(ASRConfig(batch_size=2, beam_size=3))
+    fake = BatchedFakeWhisper()
+    engine._model = fake
+    monkeypatch.setattr(engine, "_tokenizer", FakeTokenizer)
+    lengths = [16000, 8000, 40 * ASR_SAMPLE_RATE, 4800, 3200]
+    audios = [np.zeros(length, dtype=np.float32) for length in lengths]
+    languages = ["en", "en", "en", "es", "en"]
+
+    batched = engine.transcribe_batch(audios, languages)
+    assert fake.calls == ["en"]
+    assert fake.batches == [2, 1, 1]
+    assert batched == [engine.transcribe(a, lang) for a, lang in zip(audios, languages)]
+
+    # Both paths decode with the same beam and a single temperature-0 pass (no fallback).
+    assert {options["beam_size"] for options in fake.generate_options} == {3}
+    assert fake.options[0]["beam_size"] == 3
+    assert fake.options[0]["temperature"] == 0.0
@@ -21,3 +21,41 @@ def test_audio_metrics(tmp_path: Path) -> None:
     metrics = AudioMetrics(audio_path).compute()
     assert 0.9 < metrics["duration_s"] < 1.1
     assert metrics["clipping_pct"] == 0.0
+
+
+def test_audio_artifact_caches_views(tmp_path: Path) -> None:
+    import numpy as np
+
+    from ttsbench.utils.audio import AudioArtifact
+
+    sr = 24000
+    stereo = np.zeros((sr, 2), dtype=np.float32)
+    stereo[: sr // 2] = 0.25
+    audio_path = tmp_path / "stereo.wav"
+    write_audio(audio_path, stereo, sr)
+
+    artifact = AudioArtifact.from_path(audio_path)
+    assert artifact.samples.shape == (sr, 2)
+    assert artifact.mono.shape == (sr,)
+    assert artifact.at_rate(16000) is artifact.at_rate(16000)
+    assert artifact.at_rate(16000).shape[0] == 16000
+    assert artifact.frame_energy_db.shape[0] == 50
+
+    metrics = AudioMetrics(artifact).compute()
+    assert metrics["silence_pct"] == 50.0
+
+
+def test_audio_persister_writes_in_background(tmp_path: Path) -> None:
+    import numpy as np
+
+    from ttsbench.utils.audio import AudioPersister, read_audio
+
+    audio = np.full(800, 0.1, dtype=np.float32)
+    with AudioPersister(max_pending=1) as persister:
+        paths = [
+            persister.submit(tmp_path / f"{idx}" / "audio.wav", audio, 8000) for idx in range(3)
+        ]
+    for path in paths:
+        decoded, sr = read_audio(path)
+        assert sr == 8000
+        assert decoded.shape[0] == 800
@@ -0,0 +1,127 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ttsbench.harness.executor import PipelineExecutor
+from ttsbench.harness.jobs import SynthJob
+from ttsbench.harness.scoring import ScoringConfig
+from ttsbench.models.pool import ModelPool
+from ttsbench.utils import audio_store
+from ttsbench.utils.audio import read_audio
+from ttsbench.utils.audio_store import (
+    INDEX_FILE,
+    PACK_FILE,
+    PackedAudioReader,
+    PackedAudioStore,
+    audio_exists,
+    close_packs,
+    export_wavs,
+    load_audio,
+    open_pack,
+    resolve_audio,
+)
+
+
+def test_packed_store_round_trips_and_views_without_copying(tmp_path: Path) -> None:
+    tone = np.sin(np.linspace(0, 40, 801, dtype=np.float32)) * 0.5
+    with PackedAudioStore(tmp_path) as store:
+        ref = store.submit(tmp_path / "m" / "p0" / "neutral" / "audio.wav", tone, 8000)
+        stereo = np.stack([tone, -tone], axis=1)
+        store.append("m/p1/neutral", stereo, 16000)
+    assert ref == "pack:m/p0/neutral"
+
+    reader = PackedAudioReader(tmp_path)
+    samples, sample_rate = reader.view("m/p0/neutral")
+    assert sample_rate == 8000 and samples.dtype == np.int16
+    assert not samples.flags.owndata and not samples.flags.writeable
+    assert samples.ctypes.data % 16 == 0
+    artifact = load_audio(resolve_audio(tmp_path, ref))
+    np.testing.assert_allclose(artifact.samples, tone, atol=1 / 32768)
+    assert reader.view("m/p1/neutral")[0].shape == (801, 2)
+
+
+def test_float32_entries_stay_zero_copy_and_export_as_wav(tmp_path: Path) -> None:
+    tone = np.full(400, 0.25, dtype=np.float32)
+    with PackedAudioStore(tmp_path / "run", dtype="float32") as store:
+        store.append("m/p0/neutral", tone, 8000)
+        store.append("other/p0/neutral", tone, 8000)
+    artifact = load_audio(resolve_audio(tmp_path / "run", "pack:m/p0/neutral"))
+    assert artifact.samples.dtype == np.float32 and not artifact.samples.flags.owndata
+
+    assert export_wavs(tmp_path / "run", tmp_path / "wavs", prefix="m") == 1
+    samples, sample_rate = read_audio(tmp_path / "wavs" / "m" / "p0" / "neutral" / "audio.wav")
+    assert sample_rate == 8000
+    np.testing.assert_allclose(samples, tone, atol=1 / 32768)
+
+
+def test_reopened_store_appends_and_ignores_a_torn_index_line(tmp_path: Path) -> None:
+    with PackedAudioStore(tmp_path) as store:
+        store.append("m/p0/neutral", np.zeros(10, dtype=np.float32), 8000)
+    with (tmp_path / INDEX_FILE).open("a") as index:
+        index.write('{"key": "m/p1/neut')
+    assert "m/p1/neutral" not in PackedAudioReader(tmp_path)
+
+    with PackedAudioStore(tmp_path) as store:
+        assert store.get(tmp_path / "m" / "p0" / "neutral" / "audio.wav") is not None
+        store.append("m/p1/neutral", np.full(10, 0.5, dtype=np.float32), 8000)
+    assert sorted(PackedAudioReader(tmp_path).keys()) == ["m/p0/neutral", "m/p1/neutral"]
+    assert not audio_exists(resolve_audio(tmp_path, "pack:m/p2/neutral"))
+
+
+def test_executor_writes_into_packed_store_and_resumes(tmp_path: Path) -> None:
+    jobs = [SynthJob(0, "synthetic", "p0", "neutral", "hello there", "en")]
+    config = {"sample_rate": 8000, "model_options": {"synthetic": {"latency_ms": 0}}}
+
+    def run():
+        with ModelPool() as pool, PackedAudioStore(tmp_path) as store:
+            executor = PipelineExecutor(
+                pool, config, tmp_path, ScoringConfig(metrics=("audio",)), store, score_workers=0
+            )
+            return list(executor.run(jobs))[0]
+
+    first = run()
+    assert first.audio_path == "pack:synthetic/p0/neutral"
+    assert not (tmp_path / "synthetic").exists()
+    second = run()
+    assert second.audio_path == first.audio_path
+    assert len(PackedAudioReader(tmp_path)) == 1
+    assert second.metrics["duration_s"] == pytest.approx(first.metrics["duration_s"])
+
+
+def test_open_pack_rereads_a_rebuilt_pack(tmp_path: Path) -> None:
+    with PackedAudioStore(tmp_path) as store:
+        store.append("m/p0/neutral", np.full(10, 0.25, dtype=np.float32), 8000)
+    reader = open_pack(tmp_path)
+    assert reader.artifact("m/p0/neutral").samples[0] == pytest.approx(0.25, abs=1e-4)
+
+    # Rebuilt like a repeated merge: new files of the same sizes, so nothing shrank.
+    (tmp_path / PACK_FILE).unlink()
+    (tmp_path / INDEX_FILE).unlink()
+    with PackedAudioStore(tmp_path) as store:
+        store.append("m/p1/neutral", np.full(10, -0.5, dtype=np.float32), 8000)
+    assert open_pack(tmp_path) is reader
+    assert list(reader.keys()) == ["m/p1/neutral"]
+    assert reader.artifact("m/p1/neutral").samples[0] == pytest.approx(-0.5, abs=1e-4)
+    close_packs()
+
+
+def test_open_pack_closes_least_recently_used_readers(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(audio_store, "MAX_OPEN_PACKS", 2)
+    runs = [tmp_path / f"run{index}" for index in range(3)]
+    for run in runs:
+        with PackedAudioStore(run) as store:
+            store.append("m/p0/neutral", np.zeros(10, dtype=np.float32), 8000)
+    first, second = open_pack(runs[0]), open_pack(runs[1])
+    open_pack(runs[0])
+    open_pack(runs[2])
+    assert first._index is not None and second._index is None
+    # An evicted reader still works; it reopens its files.
+    assert second.view("m/p0/neutral")[0].shape == (10,)
+    close_packs()
+    assert first._index is None
+    with PackedAudioReader(runs[2]) as reader:
+        assert "m/p0/neutral" in reader
+    assert reader._index is None and reader._pack is None
@@ -0,0 +1,122 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pytest
+
+from ttsbench.harness.compare import (
+    IMPROVEMENT,
+    REGRESSION,
+    UNCHANGED,
+    compare_runs,
+    load_run_outputs,
+    parse_thresholds,
+)
+from ttsbench.utils import stats
+
+
+def _write_run(make_run, root: Path, run_id: str, rtf: np.ndarray, wer: float) -> Path:
+    outputs = [
+        {
+            "model": "piper",
+            "prompt_id": f"p{index // 2}",
+            "style": ("neutral", "fast")[index % 2],
+            "metrics": {"rtf": float(value), "wer": wer},
+        }
+        for index, value in enumerate(rtf)
+    ]
+    prompts = [
+        {"id": f"p{index}", "text": "hello", "language": "en", "style": None}
+        for index in range(rtf.size // 2)
+    ]
+    return make_run(root / run_id, outputs, prompts=prompts)
+
+
+def _verdicts(result) -> Dict[str, str]:
+    return {item.metric: item.verdict for item in result.metrics}
+
+
+def test_sign_flip_test_separates_shift_from_noise() -> None:
+    rng = np.random.default_rng(0)
+    assert stats.sign_flip_test(rng.normal(0.5, 1.0, 100)) < 0.01
+    assert stats.sign_flip_test(rng.normal(0.0, 1.0, 100)) > 0.05
+    assert stats.sign_flip_test(np.zeros(10)) == 1.0
+    # Large samples take the normal approximation.
+    assert stats.sign_flip_test(rng.normal(0.05, 1.0, 50_000)) < 0.01
+
+
+def test_compare_flags_slower_candidate(tmp_path: Path, make_run) -> None:
+    rng = np.random.default_rng(1)
+    base = rng.uniform(0.2, 0.4, 40)
+    baseline = _write_run(make_run, tmp_path, "base", base, wer=0.10)
+    slower = base * 1.3 + rng.normal(0, 0.001, 40)
+    candidate = _write_run(make_run, tmp_path, "cand", slower, wer=0.02)
+
+    result = compare_runs(baseline, candidate, metrics=["rtf", "wer"])
+    assert _verdicts(result) == {"rtf": REGRESSION, "wer": IMPROVEMENT}
+    (rtf,) = [item for item in result.metrics if item.metric == "rtf"]
+    assert rtf.pairs == 40 and rtf.relative_pct == pytest.approx(30.0, abs=1.0)
+    assert result.baseline_only == result.candidate_only == 0
+
+    relaxed = compare_runs(baseline, candidate, metrics=["rtf"], thresholds={"rtf": 50.0})
+    assert _verdicts(relaxed) == {"rtf": UNCHANGED}
+
+
+def test_history_noise_raises_the_bar(tmp_path: Path, make_run) -> None:
+    rng = np.random.default_rng(2)
+    base = rng.uniform(0.2, 0.4, 40)
+    baseline = _write_run(make_run, tmp_path, "base", base, wer=0.1)
+    candidate = _write_run(make_run, tmp_path, "cand", base * 1.1, wer=0.1)
+    noisy = _write_run(make_run, tmp_path, "earlier", base * 0.85, wer=0.1)
+
+    assert _verdicts(compare_runs(baseline, candidate, metrics=["rtf"]))["rtf"] == REGRESSION
+    result = compare_runs(baseline, candidate, [noisy], metrics=["rtf"])
+    assert result.metrics[0].noise == pytest.approx(100 / 0.85 - 100)
+    assert _verdicts(result)["rtf"] == UNCHANGED
+
+
+def test_outputs_keyed_by_style_from_sqlite_and_json(tmp_path: Path, make_run) -> None:
+    run_dir = _write_run(make_run, tmp_path, "base", np.array([0.1, 0.2]), wer=0.0)
+    outputs = load_run_outputs(run_dir).metrics
+    assert outputs[("piper", "p0", "fast")]["rtf"] == 0.2
+
+    # Runs written before outputs.style existed fall back to the audio layout.
+    connection = sqlite3.connect(run_dir / "results.sqlite")
+    connection.execute("UPDATE outputs SET style = NULL, audio_path = 'r/piper/p0/slow/audio.wav'")
+    connection.commit()
+    connection.close()
+    assert set(load_run_outputs(run_dir).metrics) == {("piper", "p0", "slow")}
+
+    json_dir = tmp_path / "copied"
+    json_dir.mkdir()
+    payload = {
+        "run": {"run_id": "copied"},
+        "outputs": [{"model": "piper", "prompt_id": "p0", "style": "fast", "metrics": {"rtf": 1}}],
+    }
+    (json_dir / "results.json").write_text(json.dumps(payload))
+    assert load_run_outputs(json_dir).metrics == {("piper", "p0", "fast"): {"rtf": 1}}
+
+
+def test_parse_thresholds() -> None:
+    assert parse_thresholds("rtf=10, wer=0.02") == {"rtf": 10.0, "wer": 0.02}
+    bare = parse_thresholds("8,rtf=3")
+    assert bare["rtf"] == 3.0 and bare["total_time_s"] == 8.0 and "wer" not in bare
+
+
+def test_compare_leaves_the_baseline_untouched(tmp_path: Path, make_run) -> None:
+    rtf = np.linspace(0.2, 0.4, 20)
+    baseline = _write_run(make_run, tmp_path, "base", rtf, wer=0.1)
+    candidate = _write_run(make_run, tmp_path, "cand", rtf, wer=0.1)
+    source = baseline / "results.sqlite"
+    # Archived runs are usually in rollback-journal mode; opening them for writing would not be.
+    connection = sqlite3.connect(source)
+    connection.execute("PRAGMA journal_mode=DELETE")
+    connection.close()
+    before, mtime = source.read_bytes(), source.stat().st_mtime_ns
+
+    compare_runs(baseline, candidate, metrics=["rtf"])
+    assert source.read_bytes() == before
+    assert source.stat().st_mtime_ns == mtime
+    assert sorted(path.name for path in baseline.iterdir()) == ["results.sqlite"]
@@ -0,0 +1,75 @@
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ttsbench.harness.executor import PipelineExecutor, parse_worker_counts
+from ttsbench.harness.jobs import SynthJob
+from ttsbench.harness.scoring import ScoringConfig
+from ttsbench.models.base import SynthResult
+from ttsbench.models.pool import ModelPool
+
+
+def _jitter(fake_model):
+    """Sleeps a random amount before returning a tone whose length follows the text."""
+    return fake_model(
+        "jitter",
+        latency=lambda: random.uniform(0.0, 0.01),
+        audio=lambda text: np.full(800 + 10 * len(text), 0.1, dtype=np.float32),
+        timings={"rtf": 0.5},
+    )
+
+
+def _jobs(count: int):
+    return [SynthJob(idx, "jitter", f"p{idx}", "neutral", "x" * idx, "en") for idx in range(count)]
+
+
+@pytest.mark.parametrize("score_workers", [0, 1])
+def test_executor_yields_in_job_order(tmp_path: Path, fake_model, score_workers: int) -> None:
+    _jitter(fake_model)
+    with ModelPool() as pool:
+        executor = PipelineExecutor(
+            pool=pool,
+            config={},
+            run_dir=tmp_path,
+            scoring=ScoringConfig(),
+            synth_workers=3,
+            score_workers=score_workers,
+            batch_size=4,
+            queue_size=5,
+        )
+        outputs = list(executor.run(_jobs(12)))
+    assert [output.job.index for output in outputs] == list(range(12))
+    assert outputs[5].metrics["duration_s"] == pytest.approx((800 + 50) / 8000)
+    assert outputs[5].metrics["rtf"] == 0.5
+    assert all(output.audio_path is None for output in outputs)
+
+
+def test_parse_worker_counts() -> None:
+    assert parse_worker_counts("3") == (3, {})
+    counts = parse_worker_counts("2,piper=4, coqui_xtts_v2=1")
+    assert counts == (2, {"piper": 4, "coqui_xtts_v2": 1})
+
+
+def test_executor_repeats_trials_and_scores_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fake_model
+) -> None:
+    model = _jitter(fake_model)
+    synth = model.synth
+
+    def numbered_synth(self, text, config, out_dir):
+        result = synth(self, text, config, out_dir)
+        timings = {"rtf": float(model.calls), "total_time_s": 0.1}
+        return SynthResult(None, result.sample_rate, timings, {}, audio=result.audio)
+
+    monkeypatch.setattr(model, "synth", numbered_synth)
+    with ModelPool() as pool:
+        executor = PipelineExecutor(
+            pool, {}, tmp_path, ScoringConfig(), score_workers=0, trials=3, warmup=2
+        )
+        outputs = list(executor.run(_jobs(2)))
+    assert model.calls == 10
+    assert [trial["rtf"] for trial in outputs[0].trials] == [3.0, 4.0, 5.0]
+    assert outputs[0].metrics["rtf"] == 4.0
+    assert len(outputs) == 2 and "duration_s" in outputs[1].metrics
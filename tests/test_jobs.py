@@ -0,0 +1,95 @@
+import pytest
+
+from ttsbench.harness.jobs import (
+    SKIP_COLLAPSED,
+    SKIP_LANGUAGE,
+    SKIP_UNAVAILABLE,
+    JobPlanner,
+    SynthJob,
+    parse_shard,
+    plan_jobs,
+    prompt_batches,
+)
+from ttsbench.utils.prompts import PromptConfig, PromptItem, PromptSet
+
+
+def _prompt_set() -> PromptSet:
+    return PromptSet(
+        config=PromptConfig(
+            styles=["neutral", "excited", "whisper"],
+            prompts=[
+                PromptItem(id="hello", text="Hello  there"),
+                PromptItem(id="hello_again", text="Hello there"),
+                PromptItem(id="hola", text="Hola", language="es"),
+                PromptItem(id="bonjour", text="Bonjour", language="fr"),
+            ],
+        )
+    )
+
+
+def test_plan_collapses_styles_for_styleless_models() -> None:
+    plan = plan_jobs(["piper"], _prompt_set(), available=["piper"])
+    assert [(job.prompt_id, job.style) for job in plan.jobs] == [
+        ("hello", "neutral"),
+        ("hola", "neutral"),
+    ]
+    assert [job.index for job in plan.jobs] == [0, 1]
+    assert plan.requested == 12
+    assert plan.summary()["piper"] == {"jobs": 2, SKIP_COLLAPSED: 7, SKIP_LANGUAGE: 3}
+    bonjour = [item for item in plan.skipped if item.prompt_id == "bonjour"]
+    assert {item.reason for item in bonjour} == {"piper does not support language 'fr'"}
+
+
+def test_plan_keeps_styles_and_skips_unavailable_models() -> None:
+    plan = plan_jobs(["coqui_xtts_v2", "bark"], _prompt_set(), available=["coqui_xtts_v2"])
+    assert plan.summary()["coqui_xtts_v2"] == {"jobs": 6, SKIP_COLLAPSED: 3, SKIP_LANGUAGE: 3}
+    assert plan.summary()["bark"] == {SKIP_UNAVAILABLE: 12}
+    assert plan.models() == ["coqui_xtts_v2"]
+
+
+def test_planner_batches_match_plan_jobs_and_collapse_across_batches() -> None:
+    prompt_set = _prompt_set()
+    prompt_set.config.prompts.append(PromptItem(id="hi_fast", text="Hello there", style="fast"))
+    prompt_set.config.prompts.append(PromptItem(id="hola_2", text="Hola", language="es"))
+    models = ["piper", "coqui_xtts_v2"]
+    plan = plan_jobs(models, prompt_set, available=models)
+
+    planner = JobPlanner(models, prompt_set.config.styles, available=models)
+    items = [
+        item
+        for batch in prompt_batches(prompt_set.iter_prompts(), size=2)
+        for item in planner.plan(batch)
+    ]
+    jobs = [item for item in items if isinstance(item, SynthJob)]
+    assert sorted(job.key for job in jobs) == sorted(job.key for job in plan.jobs)
+    assert sorted(job.index for job in jobs) == list(range(len(jobs)))
+    assert planner.summary() == plan.summary()
+    assert planner.runnable({"fr"}) == []
+    assert planner.runnable({"en", "fr"}) == models
+
+    skipped = {
+        (item.model, item.prompt_id, item.style): item.reason
+        for item in items
+        if not isinstance(item, SynthJob)
+    }
+    assert skipped[("piper", "hola_2", "excited")] == "same output as piper/hola/neutral"
+    # "fast" is not a configured style, so the first prompt asking for it owns it.
+    assert ("coqui_xtts_v2", "hi_fast", "fast") in {job.key for job in jobs}
+    assert skipped[("piper", "hi_fast", "fast")] == "same output as piper/hello/neutral"
+
+
+def test_shards_partition_the_plan() -> None:
+    prompt_set = _prompt_set()
+    models = ["piper", "coqui_xtts_v2"]
+    plan = plan_jobs(models, prompt_set, available=models)
+    shards = []
+    for spec in ("1/3", "2/3", "3/3"):
+        planner = JobPlanner(models, prompt_set.config.styles, models, parse_shard(spec))
+        shards.append(list(planner.plan(prompt_set.config.prompts)))
+    keys = [(item.model, item.prompt_id, item.style) for shard in shards for item in shard]
+    assert all(shards) and len(keys) == len(set(keys)) == plan.requested
+    sharded_jobs = {item for shard in shards for item in shard if isinstance(item, SynthJob)}
+    assert {job.key for job in sharded_jobs} == {job.key for job in plan.jobs}
+    for spec in ("0/3", "4/3", "3"):
+        with pytest.raises(ValueError):
+            parse_shard(spec)
@@ -0,0 +1,82 @@
+import math
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ttsbench.harness.loadtest import (
+    LoadTester,
+    RequestRecord,
+    arrival_times,
+    draw_requests,
+    saturation_point,
+    summarize,
+)
+from ttsbench.models.pool import ModelPool
+from ttsbench.utils.prompts import PromptConfig, PromptItem, PromptSet
+from ttsbench.utils.report import write_loadtest_report
+
+
+def _prompts(*texts: str) -> PromptSet:
+    items = [PromptItem(id=f"p{idx}", text=text) for idx, text in enumerate(texts)]
+    return PromptSet(config=PromptConfig(styles=["neutral"], prompts=items))
+
+
+def test_arrival_processes_are_seeded() -> None:
+    constant = arrival_times("constant", 4.0, 4, np.random.default_rng(0))
+    assert constant.tolist() == [0.0, 0.25, 0.5, 0.75]
+    first = arrival_times("poisson", 10.0, 500, np.random.default_rng(3))
+    again = arrival_times("poisson", 10.0, 500, np.random.default_rng(3))
+    assert np.array_equal(first, again)
+    assert np.mean(np.diff(first)) == pytest.approx(0.1, rel=0.15)
+
+
+def test_poisson_offsets_start_at_zero_and_never_go_negative() -> None:
+    for seed in range(50):
+        offsets = arrival_times("poisson", 10.0, 20, np.random.default_rng(seed))
+        assert offsets[0] == 0.0 and np.all(offsets >= 0.0) and np.all(np.diff(offsets) >= 0.0)
+    assert arrival_times("poisson", 10.0, 0, np.random.default_rng(0)).size == 0
+
+
+def test_closed_loop_separates_queueing_from_service(fake_model) -> None:
+    # Sleeps 20 ms per request and fails on "fail".
+    model = fake_model("fixed_latency", latency=lambda: 0.02, fail_text="fail")
+    rng = np.random.default_rng(0)
+    prompt_set = _prompts("hello", "fail")
+    with ModelPool() as pool, LoadTester(pool, model.name, {}, workers=1) as tester:
+        single = tester.run_level("closed", 1, draw_requests(_prompts("hi"), 6, rng), rng)
+        crowded = tester.run_level("closed", 4, draw_requests(_prompts("hi"), 12, rng), rng)
+        mixed = tester.run_level("constant", 50.0, draw_requests(prompt_set, 6, rng), rng)
+
+    one, four = summarize("closed", 1, single), summarize("closed", 4, crowded)
+    assert one.queue_mean_s < 0.005
+    assert four.queue_mean_s > 0.03
+    assert four.service_mean_s == pytest.approx(one.service_mean_s, abs=0.01)
+    assert four.latency_p95_s > one.latency_p95_s
+    assert four.throughput_rps < 60
+    assert [record.index for record in crowded] == list(range(12))
+    assert saturation_point([one, four]) in (one, four)
+
+    failed = [record for record in mixed if not record.ok]
+    assert failed and all(record.error == "RuntimeError: injected" for record in failed)
+    assert summarize("constant", 50.0, mixed).errors == len(failed)
+
+
+def test_level_without_completed_requests_reports_unknown_latency(tmp_path: Path) -> None:
+    records = [
+        RequestRecord(8.0, index, "p0", index * 0.1, index * 0.1, index * 0.1 + 0.01, False, "X")
+        for index in range(3)
+    ]
+    summary = summarize("constant", 8.0, records)
+    assert summary.errors == 3 and summary.throughput_rps == 0.0
+    timings = [summary.latency_p50_s, summary.latency_p95_s, summary.latency_p99_s]
+    timings += [summary.queue_mean_s, summary.queue_p95_s, summary.service_mean_s]
+    assert all(math.isnan(value) for value in timings)
+
+    run = {"run_id": "r", "model": "m", "workers": 1, "mode": "constant"}
+    write_loadtest_report(
+        tmp_path / "report.md", {"run": run, "levels": [asdict(summary)], "saturation": None}
+    )
+    row = (tmp_path / "report.md").read_text().splitlines()[-1]
+    assert row.count("n/a") == 5 and "0.0000" not in row
@@ -0,0 +1,97 @@
+import math
+import shutil
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pytest
+
+from ttsbench.metrics.loudness import integrated_loudness, loudness_range, true_peak
+from ttsbench.utils.audio import write_audio
+
+SR = 48000
+
+
+def _sine(dbfs: float, seconds: float, channels: int = 2, freq: float = 1000.0) -> np.ndarray:
+    t = np.arange(int(SR * seconds)) / SR
+    tone = 10 ** (dbfs / 20.0) * np.sin(2 * np.pi * freq * t)
+    return np.repeat(tone[:, None], channels, axis=1)
+
+
+def _sequence(parts: List[Tuple[float, float]]) -> np.ndarray:
+    return np.concatenate([_sine(dbfs, seconds) for dbfs, seconds in parts])
+
+
+# EBU Tech 3341 / 3342 conformance signals:
+# (segments of (dBFS, seconds), expected LUFS, expected LRA)
+FIXTURES = {
+    "tech3341_1": ([(-23.0, 20.0)], -23.0, None),
+    "tech3341_2": ([(-33.0, 20.0)], -33.0, None),
+    "tech3341_3": ([(-36.0, 10.0), (-23.0, 60.0), (-36.0, 10.0)], -23.0, None),
+    "tech3341_4": (
+        [(-72.0, 10.0), (-36.0, 10.0), (-23.0, 60.0), (-36.0, 10.0), (-72.0, 10.0)],
+        -23.0,
+        None,
+    ),
+    "tech3342_1": ([(-20.0, 20.0), (-30.0, 20.0)], None, 10.0),
+    "tech3342_2": ([(-20.0, 20.0), (-15.0, 20.0)], None, 5.0),
+}
+
+
+@pytest.mark.parametrize("name", sorted(FIXTURES))
+def test_conformance_signals(name: str) -> None:
+    parts, expected_lufs, expected_lra = FIXTURES[name]
+    audio = _sequence(parts)
+    if expected_lufs is not None:
+        assert integrated_loudness(audio, SR) == pytest.approx(expected_lufs, abs=0.1)
+    if expected_lra is not None:
+        assert loudness_range(audio, SR) == pytest.approx(expected_lra, abs=1.0)
+
+
+def test_silence_and_short_clips() -> None:
+    assert integrated_loudness(np.zeros(SR), SR) == -math.inf
+    assert integrated_loudness(np.full(SR // 10, 0.5), SR) == -math.inf
+    assert true_peak(np.zeros(10), SR) == -math.inf
+
+
+def test_true_peak_finds_intersample_peak() -> None:
+    t = np.arange(SR) / SR
+    audio = 0.5 * np.sin(2 * np.pi * (SR / 4) * t + np.pi / 4)
+    sample_peak = 20 * math.log10(np.max(np.abs(audio)))
+    assert true_peak(audio, SR) == pytest.approx(20 * math.log10(0.5), abs=0.1)
+    assert true_peak(audio, SR) > sample_peak + 2.5
+
+
+def _ffmpeg_lufs(path: Path) -> Optional[float]:
+    result = subprocess.run(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostats",
+            "-i",
+            str(path),
+            "-filter_complex",
+            "ebur128",
+            "-f",
+            "null",
+            "-",
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    summary = result.stderr.split("Summary:")[-1]
+    for line in summary.splitlines():
+        if line.strip().startswith("I:") and "LUFS" in line:
+            return float(line.split("I:")[1].split("LUFS")[0])
+    return None
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+@pytest.mark.parametrize("name", ["tech3341_1", "tech3341_3", "tech3342_1"])
+def test_matches_ffmpeg(tmp_path: Path, name: str) -> None:
+    audio = _sequence(FIXTURES[name][0])
+    path = tmp_path / f"{name}.wav"
+    write_audio(path, audio, SR)
+    assert integrated_loudness(audio, SR) == pytest.approx(_ffmpeg_lufs(path), abs=0.1)
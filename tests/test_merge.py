@@ -0,0 +1,170 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import numpy as np
+import pytest
+
+from ttsbench.harness.jobs import SKIP_MISSING
+from ttsbench.harness.merge import MergeError, merge_shards
+from ttsbench.utils.audio_store import PackedAudioReader, PackedAudioStore
+from ttsbench.utils.results_stream import RESULTS_STREAM, ResultsStream
+
+PROMPTS = [
+    {"id": f"p{index}", "text": f"Prompt {index}", "language": "en", "style": "neutral"}
+    for index in range(4)
+]
+
+
+@pytest.fixture
+def make_shard(make_run) -> Callable[..., Path]:
+    def make(
+        root: Path,
+        shard: str,
+        jobs: List[Tuple[str, str]],
+        finished: int,
+        run_id: str = "X",
+        packed: bool = False,
+    ) -> Path:
+        """A shard directory as ``benchmark --shard`` leaves it; only ``finished`` jobs ran."""
+        run_dir = root / shard.replace("/", "of") / run_id
+        run_dir.mkdir(parents=True)
+        models = [{"name": "synthetic", "description": "", "available": True, "load_time_s": 0.1}]
+        run = {"run_id": run_id, "created_at": "2026-10-01T00:00:00", "shard": shard}
+        store = PackedAudioStore(run_dir) if packed else None
+        outputs = []
+        with ResultsStream(run_dir / RESULTS_STREAM) as stream:
+            stream.write("run", run)
+            stream.write_many("model", models)
+            stream.write_many("prompt", PROMPTS)
+            for number, (prompt_id, style) in enumerate(jobs):
+                key = {"model": "synthetic", "prompt_id": prompt_id, "style": style}
+                stream.write("job", key)
+                if number >= finished:
+                    continue
+                audio = run_dir / "synthetic" / prompt_id / style / "audio.wav"
+                if store is not None:
+                    level = np.full(80, int(prompt_id[1:]) / 8, dtype=np.float32)
+                    audio = store.submit(audio, level, 8000)
+                else:
+                    audio.parent.mkdir(parents=True)
+                    audio.write_bytes(b"RIFF" + prompt_id.encode())
+                metrics = {"rtf": 0.1 * (number + 1)}
+                trials = [{"total_time_s": 1.0}, {"total_time_s": 2.0}]
+                outputs.append(
+                    dict(
+                        key,
+                        audio_path=str(audio),
+                        sample_rate=8000,
+                        metrics=metrics,
+                        trials=trials,
+                    )
+                )
+                stream.write("output", dict(key, audio_path=str(audio), metrics=metrics))
+            stream.write(
+                "phase", {"model": "synthetic", "phase": "synth", "calls": 2, "total_s": 1.5}
+            )
+        if store is not None:
+            store.close()
+        return make_run(
+            run_dir,
+            outputs,
+            run_id=run_id,
+            prompts=PROMPTS,
+            models=models,
+            prompts_path="corpus.jsonl",
+            seed=7,
+        )
+
+    return make
+
+
+def test_merge_remaps_ids_and_moves_audio(tmp_path: Path, make_shard) -> None:
+    first = make_shard(tmp_path, "1/2", [("p0", "neutral"), ("p1", "fast")], finished=2)
+    second = make_shard(tmp_path, "2/2", [("p2", "neutral"), ("p3", "fast")], finished=2)
+
+    summary = merge_shards([second, first], tmp_path / "merged")
+    assert summary.outputs == 4 and summary.run_dir == tmp_path / "merged" / "X"
+    connection = sqlite3.connect(summary.run_dir / "results.sqlite")
+    rows = connection.execute(
+        "SELECT p.prompt_id, o.style, o.audio_path, "
+        "(SELECT value FROM metrics WHERE output_id = o.id), "
+        "(SELECT count(*) FROM trials WHERE output_id = o.id) "
+        "FROM outputs o JOIN prompts p ON p.id = o.prompt_id ORDER BY o.id"
+    ).fetchall()
+    assert [row[:2] for row in rows] == [
+        ("p0", "neutral"),
+        ("p1", "fast"),
+        ("p2", "neutral"),
+        ("p3", "fast"),
+    ]
+    assert [round(row[3], 2) for row in rows] == [0.1, 0.2, 0.1, 0.2]
+    assert [row[4] for row in rows] == [2, 2, 2, 2]
+    for prompt_id, _, audio_path, *_ in rows:
+        assert Path(audio_path).parent.parent.parent.parent == summary.run_dir
+        assert Path(audio_path).read_bytes() == b"RIFF" + prompt_id.encode()
+    assert connection.execute("SELECT count(*) FROM prompts").fetchone() == (4,)
+    assert connection.execute("SELECT count(*) FROM models").fetchone() == (1,)
+
+    payload = json.loads((summary.run_dir / "results.json").read_text())
+    assert payload["run"]["shards"] == 2 and len(payload["outputs"]) == 4
+    assert payload["phases"] == [
+        {"model": "synthetic", "phase": "synth", "calls": 4, "total_s": 3.0}
+    ]
+    assert "| rtf      |   4 |" in (summary.run_dir / "report.md").read_text()
+
+
+def test_merge_copies_packed_audio(tmp_path: Path, make_shard) -> None:
+    jobs = [("p0", "neutral"), ("p1", "fast")]
+    first = make_shard(tmp_path, "1/2", jobs, finished=2, packed=True)
+    second = make_shard(tmp_path, "2/2", [("p2", "neutral")], finished=1, packed=True)
+    for _ in range(2):
+        summary = merge_shards([first, second], tmp_path / "merged")
+
+    connection = sqlite3.connect(summary.run_dir / "results.sqlite")
+    paths = [row[0] for row in connection.execute("SELECT audio_path FROM outputs ORDER BY id")]
+    assert paths == [
+        "pack:synthetic/p0/neutral",
+        "pack:synthetic/p1/fast",
+        "pack:synthetic/p2/neutral",
+    ]
+    reader = PackedAudioReader(summary.run_dir)
+    assert len(reader) == 3
+    samples, _ = reader.view("synthetic/p2/neutral")
+    assert samples[0] == 8192
+    assert not (summary.run_dir / "synthetic").exists()
+
+
+def test_merge_detects_duplicate_and_missing_jobs(tmp_path: Path, make_shard) -> None:
+    first = make_shard(tmp_path, "1/3", [("p0", "neutral"), ("p1", "neutral")], finished=2)
+    overlap = make_shard(tmp_path, "2/3", [("p1", "neutral"), ("p2", "neutral")], finished=2)
+    with pytest.raises(MergeError, match="1 jobs appear in more than one shard"):
+        merge_shards([first, overlap], tmp_path / "merged")
+
+    jobs = [("p2", "neutral"), ("p3", "neutral")]
+    second = make_shard(tmp_path / "again", "2/3", jobs, finished=1)
+    with pytest.raises(MergeError, match=r"missing shards \[3/3\], 1 unfinished jobs"):
+        merge_shards([first, second], tmp_path / "merged")
+
+    summary = merge_shards([first, second], tmp_path / "merged", allow_missing=True)
+    assert summary.missing_shards == ["3/3"]
+    assert summary.missing_jobs == [("synthetic", "p3", "neutral")]
+    connection = sqlite3.connect(summary.run_dir / "results.sqlite")
+    assert connection.execute("SELECT prompt_id, kind, reason FROM skipped_jobs").fetchall() == [
+        ("p3", SKIP_MISSING, "shard 2/3 did not finish"),
+    ]
+    assert connection.execute("SELECT count(*) FROM outputs").fetchone() == (3,)
+    payload = json.loads((summary.run_dir / "results.json").read_text())
+    assert payload["run"]["missing_shards"] == ["3/3"]
+    assert [item["kind"] for item in payload["skipped"]] == [SKIP_MISSING]
+
+
+def test_merge_rejects_mismatched_and_unsharded_runs(tmp_path: Path, make_shard) -> None:
+    first = make_shard(tmp_path, "1/2", [("p0", "neutral")], finished=1)
+    other = make_shard(tmp_path / "other", "2/2", [("p1", "neutral")], finished=1, run_id="Y")
+    with pytest.raises(MergeError, match="different runs"):
+        merge_shards([first, other], tmp_path / "merged")
+    (first / RESULTS_STREAM).write_text('{"type": "run", "run_id": "X"}\n')
+    with pytest.raises(MergeError, match="not run with --shard"):
+        merge_shards([first], tmp_path / "merged")
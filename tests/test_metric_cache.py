@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ttsbench.harness.scoring import Scorer, ScoreItem, ScoringConfig
+from ttsbench.metrics.audio_metrics import AudioMetrics
+from ttsbench.utils.audio import audio_hash, read_audio, write_audio
+
+
+def _items(count: int):
+    rng = np.random.default_rng(0)
+    return [
+        ScoreItem(rng.uniform(-0.5, 0.5, 1600).astype(np.float32), 16000, "hi", "en", {"rtf": 0.2})
+        for _ in range(count)
+    ]
+
+
+def test_audio_hash_survives_wav_round_trip(tmp_path: Path) -> None:
+    samples = np.random.default_rng(1).uniform(-1.0, 1.0, 4000).astype(np.float32)
+    write_audio(tmp_path / "a.wav", samples, 16000)
+    decoded, sr = read_audio(tmp_path / "a.wav")
+    assert audio_hash(decoded, sr) == audio_hash(samples, 16000)
+
+
+def test_scorer_only_computes_uncached_metrics(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = []
+    compute = AudioMetrics.compute
+
+    def counting_compute(self):
+        calls.append(1)
+        return compute(self)
+
+    monkeypatch.setattr(AudioMetrics, "compute", counting_compute)
+    config = ScoringConfig(metric_cache=tmp_path / "metrics.sqlite")
+    items = _items(3)
+
+    first = Scorer(config).score(items)
+    second = Scorer(config).score(items[:2] + _items(4)[3:])
+    assert len(calls) == 4
+    assert second[0] == first[0]
+
+    monkeypatch.setattr(AudioMetrics, "version", AudioMetrics.version + 1)
+    Scorer(config).score(items)
+    assert len(calls) == 7
@@ -0,0 +1,60 @@
+
+
+import threading
+from typing import Any, Dict
+
+from ttsbench.models.base import SynthResult
+from ttsbench.models.pool import ModelPool
+
+
+def test_pool_loads_once_per_checkpoint(fake_model) -> None:
+    model = fake_model("counting", supports_styles=False)
+    with ModelPool() as pool:
+        first = pool.acquire("counting", {"model_path": "a.pth", "style": "neutral"})
+        again = pool.acquire("counting", {"model_path": "a.pth", "style": "fast"})
+        other = pool.acquire("counting", {"model_path": "b.pth"})
+        assert first is again
+        assert other is not first
+        assert first.load_time_s >= 0.0
+    assert model.loads == 2
+    assert model.unloads == 2
+
+
+def test_replicas_load_in_parallel_while_loaded_instances_are_served(fake_model) -> None:
+    # The replica loads below only finish once both are in progress and the main thread has
+    # been handed the loaded instance; a pool-wide lock would break the barrier.
+    gate = threading.Barrier(3, timeout=5)
+    blocking = threading.Event()
+
+    def load(self: Any, config: Dict[str, Any]) -> None:
+        type(self).loads += 1
+        if blocking.is_set():
+            gate.wait()
+
+    model = fake_model("slow_load", load=load)
+    with ModelPool() as pool:
+        ready = pool.acquire("slow_load", {})
+        blocking.set()
+        loaders = [
+            threading.Thread(target=pool.acquire, args=("slow_load", {}), kwargs={"replica": r})
+            for r in (1, 2)
+        ]
+        for loader in loaders:
+            loader.start()
+        assert pool.acquire("slow_load", {}) is ready
+        gate.wait()
+        for loader in loaders:
+            loader.join()
+        assert pool.acquire("slow_load", {}, replica=2) is not ready
+    assert model.loads == 3
+
+
+def test_synth_result_samples_from_memoryview() -> None:
+    import array
+
+    pcm = memoryview(array.array("h", [0, 16384, -32768]))
+    result = SynthResult(audio_path=None, sample_rate=22050, timings={}, stats={}, audio=pcm)
+    samples = result.samples()
+    assert samples is not None
+    assert samples.dtype.name == "float32"
+    assert samples.tolist() == [0.0, 0.5, -1.0]
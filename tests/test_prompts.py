@@ -3,7 +3,12 @@ from pathlib import Path
 
 import pytest
 
-from ttsbench.utils.prompts import load_prompts, normalize_prompt
+from ttsbench.utils.prompts import (
+    PromptError,
+    iter_source,
+    load_prompts,
+    normalize_prompt,
+)
 
 
 def test_load_prompts(tmp_path: Path) -> None:
@@ -23,3 +28,32 @@ def test_load_prompts(tmp_path: Path) -> None:
     assert prompt_set.config.sample_rate == 22050
     assert prompt_set.config.prompts[0].id == "test"
     assert normalize_prompt(prompt_set.config.prompts[0].text) == "Hello world"
+
+
+def test_streamed_sources(tmp_path: Path) -> None:
+    (tmp_path / "corpus.jsonl").write_text(
+        '{"id": 1, "text": "One", "language": "es"}\n\n{"id": "two", "text": "Two"}\n'
+    )
+    (tmp_path / "corpus.csv").write_text("id,text,language,style\na,Alpha,,fast\nb,Beta,de,\n")
+    (tmp_path / "texts" / "en").mkdir(parents=True)
+    (tmp_path / "texts" / "en" / "hello.txt").write_text("Hello\n")
+    (tmp_path / "config.yaml").write_text("sample_rate: 16000\nsource: corpus.jsonl\n")
+
+    prompt_set = load_prompts(tmp_path / "config.yaml")
+    assert prompt_set.config.sample_rate == 16000 and prompt_set.config.prompts == []
+    assert [(p.id, p.language) for p in prompt_set.iter_prompts()] == [("1", "es"), ("two", "en")]
+    csv_prompts = list(load_prompts(tmp_path / "corpus.csv").iter_prompts())
+    assert [(p.id, p.language, p.style) for p in csv_prompts] == [
+        ("a", "en", "fast"),
+        ("b", "de", None),
+    ]
+    assert [(p.id, p.text) for p in iter_source(tmp_path / "texts")] == [("en/hello", "Hello\n")]
+
+
+def test_invalid_rows_are_reported_with_their_line(tmp_path: Path) -> None:
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text('{"id": "ok", "text": "Fine"}\n{"id": "bad"}\n')
+    prompts = load_prompts(corpus).iter_prompts()
+    assert next(prompts).id == "ok"
+    with pytest.raises(PromptError, match=r"corpus.jsonl:2: text: Field required"):
+        next(prompts)
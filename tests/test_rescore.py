@@ -0,0 +1,78 @@
+import json
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ttsbench.harness.rescore import rescore_run
+from ttsbench.harness.scoring import ScoringConfig
+from ttsbench.utils.audio import write_audio
+from ttsbench.utils.audio_store import PackedAudioStore
+
+PROMPTS = [{"id": "p1", "text": "hi", "language": "en", "style": "neutral"}]
+
+
+def _fake_run(run_dir: Path, make_run) -> None:
+    outputs = []
+    for style, amplitude in (("neutral", 0.1), ("excited", 0.5)):
+        path = run_dir / "m" / "p1" / style / "audio.wav"
+        write_audio(path, np.full(8000, amplitude, dtype=np.float32), 8000)
+        outputs.append(
+            {
+                "model": "m",
+                "prompt_id": "p1",
+                "style": style,
+                "audio_path": str(path),
+                "sample_rate": 8000,
+                "metrics": {"rtf": 0.3, "rms_db": 0.0},
+            }
+        )
+    without_audio = {"model": "m", "prompt_id": "p1", "sample_rate": 8000, "metrics": {"rtf": 0.3}}
+    make_run(run_dir, outputs + [without_audio], run_id="r1", prompts=PROMPTS)
+    payload = {"run": {"run_id": "r1"}, "models": [], "prompts": [], "outputs": outputs}
+    (run_dir / "results.json").write_text(json.dumps(payload))
+
+
+@pytest.mark.parametrize("score_workers", [0, 2])
+def test_rescore_updates_run_in_place(tmp_path: Path, make_run, score_workers: int) -> None:
+    _fake_run(tmp_path, make_run)
+    summary = rescore_run(
+        tmp_path, ScoringConfig(metrics=("audio",)), score_workers=score_workers, batch_size=1
+    )
+    assert (summary.scored, summary.skipped) == (2, 1)
+
+    conn = sqlite3.connect(tmp_path / "results.sqlite")
+    rows = conn.execute(
+        "SELECT output_id, name, value FROM metrics WHERE name IN ('rms_db', 'rtf') ORDER BY 1, 2"
+    ).fetchall()
+    conn.close()
+    assert rows[0] == (1, "rms_db", pytest.approx(-20.0, abs=0.01))
+    assert rows[1] == (1, "rtf", 0.3)
+    assert rows[2][2] == pytest.approx(-6.02, abs=0.01)
+
+    payload = json.loads((tmp_path / "results.json").read_text())
+    assert payload["outputs"][1]["metrics"]["rms_db"] == pytest.approx(-6.02, abs=0.01)
+    assert payload["outputs"][1]["metrics"]["rtf"] == 0.3
+    assert "## Leaderboard" in (tmp_path / "report.md").read_text()
+
+
+@pytest.mark.parametrize("score_workers", [0, 2])
+def test_rescore_reads_packed_audio(tmp_path: Path, make_run, score_workers: int) -> None:
+    with PackedAudioStore(tmp_path) as store:
+        ref = store.append("m/p1/neutral", np.full(8000, 0.5, dtype=np.float32), 8000)
+    outputs = [
+        {"model": "m", "prompt_id": "p1", "audio_path": audio_path, "sample_rate": 8000}
+        for audio_path in (ref, "pack:m/p2/neutral")
+    ]
+    outputs[0]["metrics"] = {"rms_db": 0.0}
+    make_run(tmp_path, outputs, run_id="r1", prompts=PROMPTS)
+
+    summary = rescore_run(
+        tmp_path, ScoringConfig(metrics=("audio",)), score_workers=score_workers, batch_size=1
+    )
+    assert (summary.scored, summary.skipped) == (1, 1)
+    conn = sqlite3.connect(tmp_path / "results.sqlite")
+    (value,) = conn.execute("SELECT value FROM metrics WHERE name = 'rms_db'").fetchone()
+    conn.close()
+    assert value == pytest.approx(-6.02, abs=0.01)
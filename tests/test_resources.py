@@ -0,0 +1,47 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from ttsbench.harness.executor import PipelineExecutor
+from ttsbench.harness.jobs import SynthJob
+from ttsbench.harness.scoring import ScoringConfig
+from ttsbench.models.pool import ModelPool
+from ttsbench.utils.report import write_report
+from ttsbench.utils.resources import measure_resources, wait_with_rusage
+
+
+def test_measure_resources_records_cpu_and_wall_time() -> None:
+    with measure_resources() as usage:
+        sum(i * i for i in range(300_000))
+    assert usage["wall_time_s"] > 0
+    assert usage["cpu_user_s"] + usage["cpu_sys_s"] > 0
+    assert usage["threads"] >= 1
+    assert usage["peak_rss_delta_mb"] >= 0
+
+
+def test_wait_with_rusage_reports_only_that_child() -> None:
+    busy = "sum(i * i for i in range(2_000_000))"
+    process = subprocess.Popen([sys.executable, "-c", busy])
+    stats = wait_with_rusage(process)
+    assert process.returncode == 0
+    assert stats["child_cpu_user_s"] > 0
+    assert stats["child_peak_rss_mb"] > 1
+
+
+def test_executor_stores_resources_and_report_summarizes_them(tmp_path: Path) -> None:
+    config = {"sample_rate": 8000, "model_options": {"synthetic": {"chunk_ms": 0}}}
+    jobs = [
+        SynthJob(idx, "synthetic", f"p{idx}", "neutral", f"text {idx}", "en") for idx in range(3)
+    ]
+    with ModelPool() as pool:
+        executor = PipelineExecutor(pool, config, tmp_path, ScoringConfig(), score_workers=0)
+        outputs = list(executor.run(jobs))
+    assert all({"wall_time_s", "cpu_user_s", "threads"} <= set(out.metrics) for out in outputs)
+
+    payload = {
+        "run": {"run_id": "r"},
+        "outputs": [{"model": out.job.model, "metrics": out.metrics} for out in outputs],
+    }
+    write_report(tmp_path / "report.md", payload)
+    report = (tmp_path / "report.md").read_text()
+    assert "## Resources" in report and "cpu_s_per_audio_s" in report
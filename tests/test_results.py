@@ -1,3 +1,5 @@
+import os
+import signal
 from datetime import datetime
 from importlib.util import find_spec
 from pathlib import Path
@@ -5,7 +7,7 @@ from pathlib import Path
 import pytest
 import sqlite3
 
-from ttsbench.utils.results import ResultsWriter, RunInfo
+from ttsbench.utils.results import ResultsWriter, RunInfo, sigterm_flush
 
 
 def test_results_writer(tmp_path: Path) -> None:
@@ -37,3 +39,80 @@ def test_results_writer(tmp_path: Path) -> None:
     cursor.execute("SELECT COUNT(*) FROM outputs")
     assert cursor.fetchone()[0] == 1
     conn.close()
+
+
+def _spawned_producer(queue, run_id: str, model_id: int, prompt_id: int) -> None:
+    from ttsbench.utils.results import output_message
+
+    for idx in range(5):
+        queue.put(output_message(run_id, model_id, prompt_id, f"{idx}.wav", 16000, {"rtf": 0.1}))
+
+
+def test_buffered_writer_batches_and_accepts_process_queue(tmp_path: Path) -> None:
+    import multiprocessing
+
+    from ttsbench.utils.results import BufferedResultsWriter
+
+    sqlite_path = tmp_path / "results.sqlite"
+    writer = ResultsWriter(sqlite_path)
+    writer.write_run(RunInfo(run_id="run1", created_at=datetime.utcnow(), prompts_path="p", seed=1))
+    model_id = writer.write_models("run1", [{"name": "m", "description": "", "available": True}])[0]
+    prompt_id = writer.write_prompts(
+        "run1", [{"id": "p1", "text": "hi", "language": "en", "style": "neutral"}]
+    )[0]
+
+    ctx = multiprocessing.get_context("spawn")
+    with BufferedResultsWriter(writer, flush_rows=4, queue=ctx.Queue()) as buffered:
+        for idx in range(10):
+            metrics = {"rtf": 0.5, "wer": 0.0}
+            buffered.write_output("run1", model_id, prompt_id, None, 16000, metrics)
+        buffered.flush()
+        assert buffered.written == 10
+        producer = ctx.Process(
+            target=_spawned_producer, args=(buffered.queue, "run1", model_id, prompt_id)
+        )
+        producer.start()
+        producer.join()
+
+    conn = sqlite3.connect(sqlite_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("SELECT COUNT(*) FROM outputs").fetchone()[0] == 15
+    assert conn.execute("SELECT COUNT(*) FROM metrics").fetchone()[0] == 25
+    assert conn.execute("SELECT COUNT(DISTINCT output_id) FROM metrics").fetchone()[0] == 15
+    conn.close()
+
+
+def test_rewriting_a_run_replaces_its_rows(tmp_path: Path) -> None:
+    writer = ResultsWriter(tmp_path / "results.sqlite")
+    run_info = RunInfo(run_id="run1", created_at=datetime.utcnow(), prompts_path="p.yaml", seed=1)
+    for _ in range(2):
+        writer.write_run(run_info)
+        model_ids = writer.write_models(
+            "run1", [{"name": "piper", "description": "Piper", "available": True}]
+        )
+        prompt_ids = writer.write_prompts(
+            "run1", [{"id": "p1", "text": "hi", "language": "en", "style": "neutral"}]
+        )
+        writer.write_output("run1", model_ids[0], prompt_ids[0], None, 16000, {"rtf": 0.1})
+
+    conn = sqlite3.connect(tmp_path / "results.sqlite")
+    counts = [
+        conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("runs", "models", "prompts", "outputs", "metrics")
+    ]
+    conn.close()
+    assert counts == [1, 1, 1, 1, 1]
+
+
+def test_sigterm_flush_restores_the_previous_handler() -> None:
+    received = []
+    previous = signal.signal(signal.SIGTERM, lambda signum, frame: received.append(signum))
+    try:
+        with pytest.raises(SystemExit) as exit_info:
+            with sigterm_flush():
+                os.kill(os.getpid(), signal.SIGTERM)
+        assert exit_info.value.code == 128 + signal.SIGTERM
+        os.kill(os.getpid(), signal.SIGTERM)
+        assert received == [signal.SIGTERM]
+    finally:
+        signal.signal(signal.SIGTERM, previous)
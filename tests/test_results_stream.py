@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+
+from ttsbench.utils.report import write_report, write_report_from_stream
+from ttsbench.utils.results_stream import (
+    ResultsStream,
+    read_results_stream,
+    rewrite_results_stream,
+    write_results_json,
+)
+
+
+def _output(model: str, prompt_id: str, rtf: float) -> dict:
+    return {
+        "model": model,
+        "prompt_id": prompt_id,
+        "style": "neutral",
+        "audio_path": f"{model}/{prompt_id}.wav",
+        "sample_rate": 16000,
+        "metrics": {"rtf": rtf, "duration_s": 1.0, "wer": 0.0},
+        "trials": [{"rtf": rtf, "total_time_s": rtf}],
+    }
+
+
+def _payload() -> dict:
+    return {
+        "run": {"run_id": "r1", "seed": 1},
+        "models": [{"name": "a", "load_time_s": 0.5}, {"name": "b", "load_time_s": None}],
+        "prompts": [{"id": "p1", "text": "hi"}, {"id": "p2", "text": "yo"}],
+        "outputs": [_output("a", "p1", 0.1), _output("a", "p2", 0.3), _output("b", "p1", 1.0)],
+        "skipped": [
+            {"model": "b", "prompt_id": "p2", "kind": "failed", "reason": "boom"},
+        ],
+        "phases": [{"model": "a", "phase": "synth", "calls": 2, "total_s": 0.2}],
+    }
+
+
+def _write_stream(path: Path, payload: dict) -> None:
+    with ResultsStream(path) as stream:
+        stream.write("run", payload["run"])
+        stream.write_many("model", payload["models"])
+        stream.write_many("prompt", payload["prompts"])
+        # Outputs and failures interleave in completion order.
+        stream.write("output", payload["outputs"][0])
+        stream.write("skipped", payload["skipped"][0])
+        stream.write_many("output", payload["outputs"][1:])
+        stream.write_many("phase", payload["phases"])
+
+
+def test_results_json_matches_in_memory_payload(tmp_path: Path) -> None:
+    payload = _payload()
+    _write_stream(tmp_path / "results.jsonl", payload)
+
+    json_path = write_results_json(tmp_path / "results.jsonl")
+    assert json_path == tmp_path / "results.json"
+    assert json.loads(json_path.read_text()) == payload
+    assert not (tmp_path / "results.json.partial").exists()
+
+
+def test_report_from_stream_matches_payload_report(tmp_path: Path) -> None:
+    payload = _payload()
+    _write_stream(tmp_path / "results.jsonl", payload)
+    write_report(tmp_path / "payload.md", payload)
+    write_report_from_stream(tmp_path / "stream.md", tmp_path / "results.jsonl")
+
+    report = (tmp_path / "stream.md").read_text()
+    assert report == (tmp_path / "payload.md").read_text()
+    assert "| a       |         2 | 0.2000 [" in report
+    assert "| b       | failed |       1 | boom     |" in report
+
+
+def test_truncated_stream_keeps_complete_records(tmp_path: Path) -> None:
+    path = tmp_path / "results.jsonl"
+    _write_stream(path, _payload())
+    with path.open("a") as handle:
+        handle.write('{"type": "output", "model": "a", "met')
+
+    kinds = [kind for kind, _ in read_results_stream(path)]
+    assert kinds.count("output") == 3
+    assert json.loads(write_results_json(path).read_text())["phases"]
+
+
+def test_rewrite_updates_records_in_place(tmp_path: Path) -> None:
+    path = tmp_path / "results.jsonl"
+    _write_stream(path, _payload())
+
+    def bump(kind: str, record: dict) -> dict:
+        if kind == "output":
+            record["metrics"]["wer"] = 0.5
+        return record
+
+    rewrite_results_stream(path, bump)
+    outputs = [record for kind, record in read_results_stream(path) if kind == "output"]
+    assert [output["metrics"]["wer"] for output in outputs] == [0.5, 0.5, 0.5]
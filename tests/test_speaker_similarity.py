@@ -0,0 +1,24 @@
+import numpy as np
+
+from ttsbench.metrics.speaker_similarity import SpeakerEmbedder, similarity_matrix
+from ttsbench.utils.audio import AudioArtifact
+
+
+def test_similarity_matrix_shape_and_values() -> None:
+    outputs = np.array([[1.0, 0.0], [0.0, 2.0], [1.0, 1.0]])
+    references = np.array([[2.0, 0.0], [0.0, 1.0]])
+    matrix = similarity_matrix(outputs, references)
+    assert matrix.shape == (3, 2)
+    np.testing.assert_allclose(matrix[0], [1.0, 0.0], atol=1e-6)
+    np.testing.assert_allclose(matrix[1], [0.0, 1.0], atol=1e-6)
+    np.testing.assert_allclose(matrix[2], [np.sqrt(0.5), np.sqrt(0.5)], atol=1e-6)
+
+
+def test_score_batch_names_each_reference(monkeypatch) -> None:
+    embedder = SpeakerEmbedder()
+    embedder.reference_names = ["alice", "bob"]
+    embedder.references = np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+    monkeypatch.setattr(embedder, "embed", lambda wavs, sample_rate=16000: np.array([[0.0, 3.0]]))
+    scores = embedder.score_batch([AudioArtifact(np.zeros(10, dtype=np.float32), 16000)])
+    assert scores[0]["speaker_similarity"] == 0.0
+    assert scores[0]["speaker_similarity/bob"] == 1.0
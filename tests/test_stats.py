@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from ttsbench.utils import stats
+from ttsbench.utils.report import ReportData, render_report
+
+
+def test_describe_ignores_nan_and_brackets_the_mean() -> None:
+    values = np.array([1.0, 2.0, 3.0, 4.0, np.nan])
+    summary = stats.describe(values, samples=500)
+    assert summary["count"] == 4
+    assert summary["mean"] == 2.5 and summary["min"] == 1.0 and summary["max"] == 4.0
+    assert summary["p50"] == 2.5
+    low, high = summary["ci"]
+    assert 1.0 <= low < 2.5 < high <= 4.0
+    assert stats.describe(np.array([np.nan])) is None
+
+
+def test_large_samples_match_the_normal_interval() -> None:
+    values = np.random.default_rng(0).exponential(size=50_000)
+    low, high = stats.confidence_interval(stats.bootstrap_means(values))
+    half_width = 1.96 * values.std() / np.sqrt(values.size)
+    assert abs(low - (values.mean() - half_width)) < 0.2 * half_width
+    assert abs(high - (values.mean() + half_width)) < 0.2 * half_width
+
+
+def test_bootstrap_columns_matches_per_column_spread() -> None:
+    rng = np.random.default_rng(1)
+    columns = {"a": rng.normal(0, 1, 5_000), "b": rng.normal(0, 10, 5_000)}
+    columns["c"] = np.where(np.arange(5_000) % 2, np.nan, columns["a"])
+    boots = stats.bootstrap_columns(columns)
+    assert set(boots) == {"a", "b", "c"}
+    assert 5 < boots["b"].std() / boots["a"].std() < 20
+
+
+def test_rank_marks_only_separable_neighbours() -> None:
+    rng = np.random.default_rng(2)
+    columns = {
+        "slow": rng.normal(1.0, 0.1, 200),
+        "fast": rng.normal(0.2, 0.1, 200),
+        "fast_twin": rng.normal(0.2, 0.1, 200) + 0.001,
+    }
+    rows = stats.rank(columns, lower_is_better=True)
+    assert [row["model"] for row in rows][2] == "slow"
+    assert [row["significant"] for row in rows] == [False, True, False]
+
+
+def test_report_breakdowns_and_summary(tmp_path: Path) -> None:
+    data = ReportData()
+    data.add("run", {"run_id": "r"})
+    data.add("prompt", {"id": "short", "text": "Hi.", "language": "en"})
+    data.add("prompt", {"id": "long", "text": "word " * 40, "language": "de"})
+    for index in range(20):
+        for model, rtf in (("a", 0.1), ("b", 0.5)):
+            data.add(
+                "output",
+                {
+                    "model": model,
+                    "prompt_id": "short" if index % 2 else "long",
+                    "style": "neutral",
+                    "metrics": {"rtf": rtf + index * 0.001, "wer": 0.1},
+                },
+            )
+
+    render_report(tmp_path / "report.md", data)
+    summary = json.loads((tmp_path / "summary.json").read_text())
+    assert summary["models"]["a"]["metrics"]["rtf"]["count"] == 20
+    assert [row["model"] for row in summary["rankings"]["rtf"]["models"]] == ["a", "b"]
+    assert summary["rankings"]["rtf"]["models"][0]["significant"]
+    assert set(summary["breakdowns"]["length"]) == {"short", "long"}
+    assert summary["breakdowns"]["language"]["de"]["b"]["outputs"] == 10
+
+    report = (tmp_path / "report.md").read_text()
+    assert "## Rankings" in report and "## By prompt length" in report
+    # A single style adds nothing over the leaderboard.
+    assert "## By style" not in report
@@ -0,0 +1,140 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+
+from ttsbench.harness.executor import PipelineExecutor
+from ttsbench.harness.jobs import SynthJob
+from ttsbench.harness.scoring import ScoringConfig
+from ttsbench.models.plugins.synthetic import SyntheticModel
+from ttsbench.models.pool import ModelPool
+from ttsbench.utils.audio import AudioPersister
+from ttsbench.utils.synth_cache import SynthCache, synth_cache_key
+
+
+def _counting_tone(fake_model):
+    return fake_model(
+        "counting_tone",
+        supports_styles=False,
+        audio=lambda text: np.full(400 * len(text), 0.25, dtype=np.float32),
+        timings={"rtf": 0.5},
+    )
+
+
+def test_cache_key_tracks_inputs(tmp_path: Path, fake_model) -> None:
+    tone = _counting_tone(fake_model)
+    voice = tmp_path / "voice.onnx"
+    voice.write_bytes(b"weights")
+    config = {"model_path": str(voice), "temperature": 0.7}
+    key = synth_cache_key(tone, config, "hello", "neutral", "en", 1)
+    # Styles are ignored for models without style support.
+    assert key == synth_cache_key(tone, config, "hello", "excited", "en", 1)
+    assert key != synth_cache_key(tone, config, "hello", "neutral", "en", 2)
+    warmer = dict(config, temperature=0.8)
+    assert key != synth_cache_key(tone, warmer, "hello", "neutral", "en", 1)
+    voice.write_bytes(b"retrained weights")
+    assert key != synth_cache_key(tone, config, "hello", "neutral", "en", 1)
+
+
+def test_cache_prunes_least_recently_used(tmp_path: Path) -> None:
+    cache = SynthCache(tmp_path / "cache")
+    audio = np.zeros(8000, dtype=np.float32)
+    for key in ("aa", "bb", "cc"):
+        cache.put(key, "m", audio, 8000)
+    assert cache.get("aa") is not None
+    size = cache.object_path("aa").stat().st_size
+    assert cache.prune(2 * size) == 1
+    assert cache.get("bb") is None
+    assert cache.get("aa") is not None and cache.get("cc") is not None
+    assert cache.stats().entries == 2
+
+
+def test_cache_evicts_on_put_without_re_summing_the_store(tmp_path: Path) -> None:
+    audio = np.zeros(800, dtype=np.float32)
+    size = SynthCache(tmp_path / "probe").put("aa", "m", audio, 8000).stat().st_size
+    cache = SynthCache(tmp_path / "cache", max_bytes=3 * size)
+    statements = []
+    event.listen(
+        cache.engine,
+        "before_cursor_execute",
+        lambda conn, cursor, sql, *args: statements.append(sql.lower()),
+    )
+    for index in range(20):
+        cache.put(f"k{index:02d}", "m", audio, 8000)
+    # The store is summed once, on the first put; later puts update the running total.
+    assert sum("sum(" in sql for sql in statements) == 1
+    stats = cache.stats()
+    assert stats.entries == 3 and stats.total_bytes == 3 * size
+    assert cache.get("k19") is not None and cache.get("k16") is None
+
+
+def test_executor_reuses_cached_audio_across_runs(tmp_path: Path, fake_model) -> None:
+    tone = _counting_tone(fake_model)
+    cache = SynthCache(tmp_path / "cache")
+    jobs = [SynthJob(0, tone.name, "p0", "neutral", "hi", "en")]
+
+    def run(run_dir: Path):
+        with ModelPool() as pool, AudioPersister() as persister:
+            executor = PipelineExecutor(
+                pool, {}, run_dir, ScoringConfig(), persister, score_workers=0, cache=cache
+            )
+            return list(executor.run(jobs))[0]
+
+    first = run(tmp_path / "run1")
+    second = run(tmp_path / "run2")
+    assert tone.calls == 1
+    assert first.metrics["cache_hit"] == 0.0 and first.metrics["rtf"] == 0.5
+    assert second.metrics["cache_hit"] == 1.0 and "rtf" not in second.metrics
+    assert second.metrics["duration_s"] == pytest.approx(first.metrics["duration_s"])
+    key = synth_cache_key(tone, {}, "hi", "neutral", "en", 0)
+    assert second.audio_path.samefile(cache.object_path(key))
+
+
+def test_executor_misses_when_synthetic_sample_rate_changes(tmp_path: Path) -> None:
+    cache = SynthCache(tmp_path / "cache")
+    jobs = [SynthJob(0, SyntheticModel.name, "p0", "neutral", "hello there", "en")]
+
+    def run(run_dir: Path, sample_rate: int):
+        config = {"sample_rate": sample_rate, "model_options": {"synthetic": {"chunk_ms": 0}}}
+        with ModelPool() as pool, AudioPersister() as persister:
+            executor = PipelineExecutor(
+                pool, config, run_dir, ScoringConfig(), persister, score_workers=0, cache=cache
+            )
+            return list(executor.run(jobs))[0]
+
+    assert run(tmp_path / "run1", 16000).metrics["cache_hit"] == 0.0
+    resampled = run(tmp_path / "run2", 22050)
+    assert resampled.metrics["cache_hit"] == 0.0
+    assert resampled.sample_rate == 22050
+    assert run(tmp_path / "run3", 22050).metrics["cache_hit"] == 1.0
+
+
+def test_entry_pruned_during_a_hit_is_synthesized_again(tmp_path: Path, fake_model) -> None:
+    tone = _counting_tone(fake_model)
+    cache = SynthCache(tmp_path / "cache")
+    jobs = [SynthJob(0, tone.name, "p0", "neutral", "hi", "en")]
+    key = synth_cache_key(tone, {}, "hi", "neutral", "en", 0)
+    cache.put(key, tone.name, np.zeros(800, dtype=np.float32), 8000)
+    lookup = cache.get
+
+    def get_then_prune(key: str):
+        # Another process evicts the entry right after this one found it.
+        found = lookup(key)
+        cache.object_path(key).unlink()
+        return found
+
+    cache.get = get_then_prune
+    with ModelPool() as pool, AudioPersister() as persister:
+        executor = PipelineExecutor(
+            pool, {}, tmp_path / "run", ScoringConfig(), persister, score_workers=0, cache=cache
+        )
+        output = list(executor.run(jobs))[0]
+    assert output.error is None and output.metrics["cache_hit"] == 0.0
+    assert tone.calls == 1 and output.audio_path.exists()
+
+    # A pruned or truncated object reads as a miss rather than raising.
+    cache.object_path(key).write_bytes(b"RIFF")
+    assert lookup(key) is None
+    cache.object_path(key).unlink()
+    assert cache.link_into(key, tmp_path / "copy.wav") is None
@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ttsbench.harness.executor import PipelineExecutor
+from ttsbench.harness.jobs import SynthJob, plan_jobs
+from ttsbench.harness.overhead import OVERHEAD_PHASES, measure_overhead
+from ttsbench.harness.scoring import ScoringConfig
+from ttsbench.models.plugins.synthetic import SyntheticModel
+from ttsbench.models.pool import ModelPool
+from ttsbench.utils.prompts import PromptConfig, PromptItem, PromptSet
+
+
+def _config(**options) -> dict:
+    return {
+        "sample_rate": 8000,
+        "style": "neutral",
+        "language": "en",
+        "model_options": {"synthetic": options},
+    }
+
+
+def test_synthetic_model_is_deterministic_and_streams_the_same_audio(tmp_path: Path) -> None:
+    model = SyntheticModel()
+    first = model.synth("a short sentence", _config(chunk_ms=50), tmp_path).samples()
+    again = model.synth("a short sentence", _config(chunk_ms=50), tmp_path).samples()
+    reseeded = model.synth("a short sentence", _config(seed=1), tmp_path).samples()
+    np.testing.assert_array_equal(first, again)
+    assert not np.array_equal(first, reseeded)
+    assert first.shape[0] == int(len("a short sentence") / 15.0 * 8000)
+
+    chunks = list(model.synth_stream("a short sentence", _config(chunk_ms=50)))
+    assert len(chunks) > 1 and all(chunk.shape[0] <= 400 for chunk in chunks)
+    np.testing.assert_array_equal(np.concatenate(chunks), first)
+    assert not model.can_stream(_config(chunk_ms=0))
+
+
+def test_synthetic_model_failures_are_reported_per_job(tmp_path: Path) -> None:
+    config = _config(failure_rate=0.5)
+    jobs = [
+        SynthJob(idx, "synthetic", f"p{idx}", "neutral", f"text {idx}", "en") for idx in range(20)
+    ]
+    with ModelPool() as pool:
+        executor = PipelineExecutor(pool, config, tmp_path, ScoringConfig(), score_workers=0)
+        outputs = list(executor.run(jobs))
+    failed = [output for output in outputs if output.error is not None]
+    assert [output.job.index for output in outputs] == list(range(20))
+    assert 0 < len(failed) < 20
+    assert all(output.metrics == {} and "Injected failure" in output.error for output in failed)
+    assert all("duration_s" in output.metrics for output in outputs if output.error is None)
+
+
+def test_synthetic_model_accepts_any_language() -> None:
+    prompts = PromptSet(
+        config=PromptConfig(
+            styles=["neutral"],
+            prompts=[PromptItem(id="a", text="x", language="sw"), PromptItem(id="b", text="y")],
+        )
+    )
+    plan = plan_jobs(["synthetic"], prompts)
+    assert len(plan.jobs) == 2 and not plan.skipped
+
+
+def test_overhead_suite_times_every_phase(tmp_path: Path) -> None:
+    result = measure_overhead(12, tmp_path)
+    assert result.outputs == 12
+    assert set(result.phases) == set(OVERHEAD_PHASES)
+    assert all(seconds > 0 for seconds in result.phases.values())
+    assert result.per_output_us()["total"] == pytest.approx(result.total_s * 1e6 / 12)
+    assert (tmp_path / "overhead-12" / "report.md").exists()
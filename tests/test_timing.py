@@ -0,0 +1,21 @@
+
+import numpy as np
+
+from ttsbench.utils.timing import synth_streamed
+
+
+def test_synth_streamed_measures_first_chunk(fake_model) -> None:
+    chunked = fake_model(
+        "chunked",
+        sample_rate=1000,
+        chunks=3,
+        latency=lambda: 0.01,
+        audio=lambda text: np.zeros(500, dtype=np.float32),
+    )
+    result = synth_streamed(chunked(), "hello", {})
+    timings = result.timings
+    assert result.samples().shape[0] == 1500
+    assert timings["chunk_count"] == 3.0
+    assert 5.0 < timings["time_to_first_audio_ms"] < timings["total_time_s"] * 1000.0
+    assert timings["max_chunk_gap_ms"] >= 5.0
+    assert timings["rtf"] > 0.0
@@ -0,0 +1,108 @@
+import json
+import pstats
+import threading
+from pathlib import Path
+
+import pytest
+
+from ttsbench.harness.executor import PipelineExecutor
+from ttsbench.harness.jobs import SynthJob
+from ttsbench.harness.scoring import ScoringConfig
+from ttsbench.models.pool import ModelPool
+from ttsbench.utils.tracing import (
+    SHARED,
+    PhaseTotals,
+    Tracer,
+    get_tracer,
+    model_shares,
+    span,
+    use_tracer,
+)
+
+
+def _traced_work() -> None:
+    with span("threaded"):
+        pass
+
+
+def test_span_is_a_shared_noop_without_tracer() -> None:
+    assert get_tracer() is None
+    assert span("a") is span("b", model="m", rows=3)
+    with span("a"):
+        pass
+
+
+def test_tracer_totals_and_chrome_trace(tmp_path: Path) -> None:
+    tracer = Tracer(record_events=True)
+    with use_tracer(tracer):
+        with span("outer", model="m"):
+            with span("inner", rows=2):
+                pass
+        worker = threading.Thread(target=_traced_work)
+        worker.start()
+        worker.join()
+    assert get_tracer() is None
+    totals = {(row["model"], row["phase"]): row["calls"] for row in tracer.breakdown()}
+    assert totals == {("m", "outer"): 1, (SHARED, "inner"): 1, (SHARED, "threaded"): 1}
+
+    tracer.write_chrome_trace(tmp_path / "trace.json")
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    complete = {event["name"]: event for event in events if event["ph"] == "X"}
+    assert complete["inner"]["args"] == {"rows": 2}
+    assert complete["outer"]["args"] == {"model": "m"}
+    assert complete["outer"]["ts"] <= complete["inner"]["ts"]
+    assert complete["outer"]["dur"] >= complete["inner"]["dur"]
+    assert complete["threaded"]["tid"] != complete["outer"]["tid"]
+    assert sum(1 for event in events if event["ph"] == "M") == 2
+
+
+def test_profile_covers_outermost_spans(tmp_path: Path) -> None:
+    tracer = Tracer(profile=True)
+    with use_tracer(tracer):
+        for _ in range(2):
+            with span("phase"):
+                with span("nested"):
+                    sorted(range(1000), key=lambda value: -value)
+    (path,) = tracer.write_profiles(tmp_path)
+    assert path.name == "phase.prof"
+    assert pstats.Stats(str(path)).total_calls > 0
+
+
+def test_executor_spans_carry_the_model(tmp_path: Path) -> None:
+    config = {"sample_rate": 8000, "model_options": {"synthetic": {"chunk_ms": 0}}}
+    jobs = [
+        SynthJob(idx, "synthetic", f"p{idx}", "neutral", f"text {idx}", "en") for idx in range(3)
+    ]
+    tracer = Tracer()
+    with use_tracer(tracer), ModelPool() as pool:
+        executor = PipelineExecutor(pool, config, tmp_path, ScoringConfig(), score_workers=0)
+        list(executor.run(jobs))
+    calls = {(row["model"], row["phase"]): row["calls"] for row in tracer.breakdown()}
+    assert calls[("synthetic", "synth")] == 3
+    assert calls[("synthetic", "model_load")] == 1
+    assert calls[("synthetic", "metrics.audio")] == 1
+    assert (SHARED, "metrics.audio") not in calls
+    assert not tracer.events
+
+
+def test_phase_totals_split_shared_spans_between_models() -> None:
+    for tracer in (Tracer(record_events=True), PhaseTotals()):
+        with use_tracer(tracer):
+            with model_shares(["a", "a", "a", "b"]):
+                with span("metrics.asr"):
+                    sum(range(20000))
+                with span("synth", model="b"):
+                    pass
+            with span("db_write"):
+                pass
+        rows = {(row["model"], row["phase"]): row for row in tracer.breakdown()}
+        assert set(rows) == {
+            ("a", "metrics.asr"),
+            ("b", "metrics.asr"),
+            ("b", "synth"),
+            (SHARED, "db_write"),
+        }
+        a_asr, b_asr = rows[("a", "metrics.asr")], rows[("b", "metrics.asr")]
+        assert a_asr["calls"] == b_asr["calls"] == 1
+        assert a_asr["total_s"] == pytest.approx(3 * b_asr["total_s"])
+    assert not tracer.events
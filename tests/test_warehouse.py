@@ -0,0 +1,148 @@
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from ttsbench.utils.warehouse import Warehouse, parquet_available
+
+PROMPTS = [
+    {"id": "p1", "text": "Hi.", "language": "en", "style": "neutral"},
+    {"id": "p2", "text": "Hallo " * 30, "language": "de", "style": "neutral"},
+]
+
+
+@pytest.fixture
+def warehouse(tmp_path: Path, make_run) -> Warehouse:
+    store = Warehouse(tmp_path / "warehouse")
+    for run_id, created_at, rtf_offset in (
+        ("mon", datetime(2026, 10, 5, 3), 0.0),
+        ("next", datetime(2026, 10, 12, 3), 1.0),
+    ):
+        outputs = [
+            {
+                "model": model,
+                "prompt_id": prompt["id"],
+                "metrics": {"rtf": rtf_offset + 0.1 * index + 0.01 * slot, "wer": 0.0},
+            }
+            for index, model in enumerate(("piper", "xtts"))
+            for slot, prompt in enumerate(PROMPTS)
+        ]
+        run_dir = make_run(
+            tmp_path / "runs" / run_id, outputs, created_at=created_at, prompts=PROMPTS
+        )
+        store.ingest(run_dir)
+    return store
+
+
+def test_ingest_is_idempotent_and_wide(tmp_path: Path, warehouse: Warehouse) -> None:
+    summary = warehouse.ingest(tmp_path / "runs" / "mon")
+    assert summary.replaced and summary.outputs == 4
+    assert set(warehouse.metric_columns()) == {"rtf", "wer"}
+
+    (row,) = warehouse.lookup(run_id="mon", model="xtts", prompt_id="p2")
+    assert row["rtf"] == pytest.approx(0.11)
+    assert row["language"] == "de" and row["length"] == "long" and row["week"] == "2026-W41"
+    assert len(warehouse.lookup(model="piper")) == 4
+
+
+def test_query_groups_by_model_and_week(warehouse: Warehouse) -> None:
+    rows = warehouse.query(
+        "rtf", stats=("count", "max"), group_by=("model", "week"), engine="sqlite"
+    )
+    assert [(row["model"], row["week"], row["count"]) for row in rows] == [
+        ("piper", "2026-W41", 2),
+        ("piper", "2026-W42", 2),
+        ("xtts", "2026-W41", 2),
+        ("xtts", "2026-W42", 2),
+    ]
+    assert rows[-1]["max"] == pytest.approx(1.11)
+
+
+def test_query_filters_and_row_dimensions(warehouse: Warehouse) -> None:
+    rows = warehouse.query(
+        "rtf",
+        stats=("mean",),
+        group_by=("language",),
+        models=["piper"],
+        since=datetime(2026, 10, 10),
+        engine="sqlite",
+    )
+    assert rows == [
+        {"language": "de", "mean": pytest.approx(1.01)},
+        {"language": "en", "mean": pytest.approx(1.0)},
+    ]
+    with pytest.raises(ValueError):
+        warehouse.query("rtf", group_by=("voice",))
+
+
+def test_parquet_engine_matches_sqlite(warehouse: Warehouse) -> None:
+    pytest.importorskip("pyarrow")
+    assert list((warehouse.parquet_dir / "model=piper").glob("week=*/*.parquet"))
+    for group_by in (("model", "week"), ("run_id", "length"), ()):
+        expected = warehouse.query("rtf", ("count", "p95"), group_by, engine="sqlite")
+        assert warehouse.query("rtf", ("count", "p95"), group_by, engine="parquet") == expected
+
+
+def test_ingest_reads_legacy_runs_without_changing_them(tmp_path: Path) -> None:
+    run_dir = tmp_path / "old"
+    run_dir.mkdir()
+    source = run_dir / "results.sqlite"
+    connection = sqlite3.connect(source)
+    connection.executescript(
+        """
+        CREATE TABLE runs (id VARCHAR PRIMARY KEY, created_at DATETIME, prompts_path VARCHAR,
+                           seed INTEGER, notes VARCHAR);
+        CREATE TABLE models (id INTEGER PRIMARY KEY, run_id VARCHAR, name VARCHAR,
+                             description VARCHAR, available BOOLEAN);
+        CREATE TABLE prompts (id INTEGER PRIMARY KEY, run_id VARCHAR, prompt_id VARCHAR,
+                              text VARCHAR, language VARCHAR, style VARCHAR);
+        CREATE TABLE outputs (id INTEGER PRIMARY KEY, run_id VARCHAR, model_id INTEGER,
+                              prompt_id INTEGER, audio_path VARCHAR, sample_rate INTEGER);
+        CREATE TABLE metrics (id INTEGER PRIMARY KEY, output_id INTEGER, name VARCHAR,
+                              value FLOAT);
+        INSERT INTO runs VALUES ('old', '2026-10-05 03:00:00.000000', 'p.yaml', 1, NULL);
+        INSERT INTO models VALUES (1, 'old', 'piper', '', 1);
+        INSERT INTO prompts VALUES (1, 'old', 'p1', 'Hi.', 'en', 'neutral');
+        INSERT INTO outputs VALUES (1, 'old', 1, 1, 'runs/old/piper/p1/fast/audio.wav', 16000);
+        INSERT INTO metrics VALUES (1, 1, 'rtf', 0.5);
+        """
+    )
+    connection.close()
+    before = source.read_bytes()
+
+    store = Warehouse(tmp_path / "warehouse")
+    assert store.ingest(run_dir).outputs == 1
+    (row,) = store.lookup(run_id="old")
+    assert row["style"] == "fast" and row["rtf"] == 0.5
+    assert source.read_bytes() == before
+    assert sorted(path.name for path in run_dir.iterdir()) == ["results.sqlite"]
+
+
+def test_metric_names_map_to_safe_columns(tmp_path: Path, make_run) -> None:
+    metrics = {
+        "speaker_similarity/alice": 0.8,
+        "speaker_similarity/bob": 0.5,
+        # Both map to a column that is already taken, so they are skipped.
+        "speaker_similarity__alice": 0.1,
+        "sample-rate": 1.0,
+    }
+    run_dir = make_run(
+        tmp_path / "voices", [{"model": "xtts", "prompt_id": "p1", "metrics": metrics}]
+    )
+    store = Warehouse(tmp_path / "warehouse")
+    assert store.ingest(run_dir).metrics == 2
+    assert store.ingest(run_dir).metrics == 2
+    assert store.metric_names() == {
+        "speaker_similarity__alice": "speaker_similarity/alice",
+        "speaker_similarity__bob": "speaker_similarity/bob",
+    }
+
+    (row,) = store.lookup(run_id="voices")
+    assert row["speaker_similarity/alice"] == 0.8 and row["speaker_similarity/bob"] == 0.5
+    for metric in ("speaker_similarity/alice", "speaker_similarity__alice"):
+        (result,) = store.query(metric, stats=("mean",), engine="sqlite")
+        assert result == {"model": "xtts", "mean": pytest.approx(0.8)}
+    if parquet_available():
+        (result,) = store.query("speaker_similarity/bob", stats=("mean",), engine="parquet")
+        assert result["mean"] == pytest.approx(0.5)
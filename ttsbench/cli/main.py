@@ -2,29 +2,66 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import random
 import uuid
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
+import numpy as np
 import typer
 from rich.console import Console
 from rich.table import Table
 
-from ttsbench.metrics.audio_metrics import AudioMetrics
-from ttsbench.metrics.asr_metrics import compute_asr_metrics
-from ttsbench.metrics.speaker_similarity import cosine_similarity
-from ttsbench.models.base import BaseTTSModel
+from ttsbench.harness.benchmark import run_benchmark
+from ttsbench.harness.compare import COMPARE_METRICS, compare_runs, parse_thresholds
+from ttsbench.harness.executor import PipelineExecutor
+from ttsbench.harness.jobs import (
+    parse_shard,
+    plan_jobs,
+)
+from ttsbench.harness.loadtest import (
+    LOAD_MODES,
+    LoadTester,
+    draw_requests,
+    record_payload,
+    saturation_point,
+    summarize,
+)
+from ttsbench.harness.merge import MergeError, merge_shards
+from ttsbench.harness.overhead import OVERHEAD_PHASES, OVERHEAD_SIZES, run_overhead_suite
+from ttsbench.harness.rescore import rescore_run
+from ttsbench.harness.scoring import METRIC_GROUPS, ScoringConfig
+from ttsbench.metrics.asr_metrics import ASRConfig
+from ttsbench.models.pool import ModelPool
 from ttsbench.models.registry import get_model, list_models
 from ttsbench.training.prep import prepare_dataset
 from ttsbench.training.recipes import create_training_plan
+from ttsbench.utils.audio import AudioPersister
+from ttsbench.utils.audio_store import (
+    AUDIO_STORES,
+    PACK_DTYPES,
+    export_wavs,
+)
 from ttsbench.utils.logging import setup_logging
-from ttsbench.utils.prompts import load_prompts, normalize_prompt
-from ttsbench.utils.report import write_report
-from ttsbench.utils.results import ResultsWriter, RunInfo
+from ttsbench.utils.metric_cache import default_metric_cache_path
+from ttsbench.utils.prompts import load_prompts
+from ttsbench.utils.report import (
+    write_compare_report,
+    write_loadtest_report,
+)
+from ttsbench.utils.synth_cache import DEFAULT_MAX_BYTES, SynthCache, default_cache_dir
+from ttsbench.utils.warehouse import GROUP_BY, STATS, Warehouse
 
 app = typer.Typer(add_completion=False)
+cache_app = typer.Typer(add_completion=False, help="Inspect and prune the shared synthesis cache.")
+app.add_typer(cache_app, name="cache")
+warehouse_app = typer.Typer(
+    add_completion=False, help="Consolidate runs into one store and query across them."
+)
+app.add_typer(warehouse_app, name="warehouse")
 console = Console()
 logger = logging.getLogger(__name__)
 
@@ -61,6 +98,25 @@ def _run_id(run_id: Optional[str]) -> str:
     return run_id or datetime.utcnow().strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
 
 
+def _synth_cache(enabled: bool, cache_dir: Optional[Path], max_gb: float) -> Optional[SynthCache]:
+    if not enabled:
+        return None
+    return SynthCache(cache_dir or default_cache_dir(), max_bytes=int(max_gb * 1024**3))
+
+
+def _print_plan(summary: Dict[str, Dict[str, int]]) -> None:
+    jobs = sum(counts.get("jobs", 0) for counts in summary.values())
+    requested = sum(sum(counts.values()) for counts in summary.values())
+    table = Table(title=f"Plan: {jobs} of {requested} requested outputs")
+    columns = ("jobs", "collapsed", "unsupported_language", "unavailable")
+    table.add_column("Model")
+    for column in columns:
+        table.add_column(column)
+    for model, counts in summary.items():
+        table.add_row(model, *(str(counts.get(column, 0)) for column in columns))
+    console.print(table)
+
+
 @app.command("synth")
 def synth_cmd(
     model: str,
@@ -68,173 +124,144 @@ def synth_cmd(
     out: Path,
     run_id: Optional[str] = typer.Option(None, help="Explicit run id."),
     seed: int = typer.Option(1337, help="Random seed."),
+    cache: bool = typer.Option(True, help="Reuse audio from the shared synthesis cache."),
+    cache_dir: Optional[Path] = typer.Option(None, help="Synthesis cache directory."),
+    cache_max_gb: float = typer.Option(DEFAULT_MAX_BYTES / 1024**3, help="Cache size cap in GB."),
+    plan_only: bool = typer.Option(False, help="Print the planned jobs and exit."),
 ) -> None:
-    run_id = _run_id(run_id)
-    run_dir = out / run_id
-    run_dir.mkdir(parents=True, exist_ok=True)
-
-    random.seed(seed)
     prompt_set = load_prompts(prompts)
     model_cls = get_model(model)
+    plan = plan_jobs([model], prompt_set)
+    if plan_only:
+        _print_plan(plan.summary())
+        return
     if not model_cls.is_available():
         raise typer.Exit(model_cls.availability_help())
 
-    model_instance = model_cls()
-    config = prompt_set.config.model_dump()
+    run_id = _run_id(run_id)
+    run_dir = out / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+    random.seed(seed)
 
-    for prompt in prompt_set.config.prompts:
-        text = normalize_prompt(prompt.text)
-        styles = [prompt.style] if prompt.style else prompt_set.config.styles
-        for style in styles:
-            synth_dir = run_dir / model / prompt.id / style
-            output_file = synth_dir / "audio.wav"
-            if output_file.exists():
-                logger.info("Skipping existing output", extra={"path": str(output_file)})
+    config = prompt_set.config.model_dump()
+    with ModelPool() as pool, AudioPersister() as persister:
+        loaded = pool.acquire(model, config)
+        console.print(f"Loaded {model} in {loaded.load_time_s:.2f}s")
+        executor = PipelineExecutor(
+            pool=pool,
+            config=config,
+            run_dir=run_dir,
+            scoring=ScoringConfig(),
+            persister=persister,
+            stream=False,
+            cache=_synth_cache(cache, cache_dir, cache_max_gb),
+            seed=seed,
+        )
+        for output in executor.synthesize(plan.jobs):
+            if output.error is not None:
+                console.print(f"Failed {'/'.join(output.job.key)}: {output.error}")
                 continue
-            config["style"] = style
-            result = model_instance.synth(text=text, config=config, out_dir=synth_dir)
             logger.info(
                 "Synth complete",
-                extra={"path": str(result.audio_path), "timings": result.timings},
+                extra={"path": _path_str(output.audio_path), "timings": output.timings},
             )
 
 
-def _benchmark_run(
-    models: List[str],
-    prompts: Path,
-    out: Path,
-    run_id: str,
-    seed: int,
-    reference_voice: Optional[Path],
-    config_override: Optional[Dict[str, object]] = None,
-) -> None:
-    run_dir = out / run_id
-    run_dir.mkdir(parents=True, exist_ok=True)
+def _path_str(path: Optional[Union[Path, str]]) -> Optional[str]:
+    return str(path) if path is not None else None
 
-    prompt_set = load_prompts(prompts)
-    random.seed(seed)
 
-    results_writer = ResultsWriter(run_dir / "results.sqlite")
-    run_info = RunInfo(
-        run_id=run_id,
-        created_at=datetime.utcnow(),
-        prompts_path=str(prompts),
-        seed=seed,
+def _asr_config(model_size: str, compute_type: str, threads: int, batch_size: int) -> ASRConfig:
+    return ASRConfig(
+        model_size=model_size,
+        compute_type=compute_type,
+        cpu_threads=threads,
+        batch_size=batch_size,
     )
-    results_writer.write_run(run_info)
-
-    model_rows = []
-    model_instances: Dict[str, BaseTTSModel] = {}
-    for name in models:
-        model_cls = get_model(name)
-        available = model_cls.is_available()
-        model_rows.append(
-            {
-                "name": model_cls.name,
-                "description": model_cls.description,
-                "available": available,
-            }
-        )
-        if available:
-            model_instances[name] = model_cls()
-    model_ids = results_writer.write_models(run_id, model_rows)
-    model_id_lookup = {row["name"]: model_ids[idx] for idx, row in enumerate(model_rows)}
-
-    prompt_rows = []
-    for prompt in prompt_set.config.prompts:
-        prompt_rows.append(
-            {
-                "id": prompt.id,
-                "text": normalize_prompt(prompt.text),
-                "language": prompt.language,
-                "style": prompt.style or "neutral",
-            }
-        )
-    prompt_ids = results_writer.write_prompts(run_id, prompt_rows)
-    prompt_id_lookup = {row["id"]: prompt_ids[idx] for idx, row in enumerate(prompt_rows)}
 
-    outputs_payload: List[Dict[str, object]] = []
-    config = prompt_set.config.model_dump()
-    if config_override:
-        config.update(config_override)
-    for name, model_instance in model_instances.items():
-        for prompt in prompt_set.config.prompts:
-            text = normalize_prompt(prompt.text)
-            styles = [prompt.style] if prompt.style else prompt_set.config.styles
-            for style in styles:
-                synth_dir = run_dir / name / prompt.id / style
-                output_path = synth_dir / "audio.wav"
-                if output_path.exists():
-                    logger.info("Skipping existing output", extra={"path": str(output_path)})
-                    audio_path = output_path
-                    sample_rate = prompt_set.config.sample_rate
-                    timings = {}
-                else:
-                    config["style"] = style
-                    config["language"] = prompt.language
-                    result = model_instance.synth(text=text, config=config, out_dir=synth_dir)
-                    audio_path = result.audio_path
-                    sample_rate = result.sample_rate
-                    timings = result.timings
-
-                metrics = AudioMetrics(audio_path).compute()
-                metrics.update(timings)
-                asr_metrics = compute_asr_metrics(audio_path, text, prompt.language)
-                if asr_metrics:
-                    metrics.update(asr_metrics)
-                if reference_voice:
-                    similarity = cosine_similarity(reference_voice, audio_path)
-                    if similarity is not None:
-                        metrics["speaker_similarity"] = similarity
-
-                results_writer.write_output(
-                    run_id=run_id,
-                    model_id=model_id_lookup[name],
-                    prompt_id=prompt_id_lookup[prompt.id],
-                    audio_path=str(audio_path),
-                    sample_rate=sample_rate,
-                    metrics=metrics,
-                )
-                outputs_payload.append(
-                    {
-                        "model": name,
-                        "prompt_id": prompt.id,
-                        "style": style,
-                        "audio_path": str(audio_path),
-                        "sample_rate": sample_rate,
-                        "metrics": metrics,
-                    }
-                )
-
-    results_payload = {
-        "run": {
-            "run_id": run_id,
-            "created_at": run_info.created_at.isoformat(),
-            "prompts_path": run_info.prompts_path,
-            "seed": seed,
-        },
-        "models": model_rows,
-        "prompts": prompt_rows,
-        "outputs": outputs_payload,
-    }
-    results_writer.dump_json(run_dir / "results.json", results_payload)
-    write_report(run_dir / "report.md", results_payload)
-    console.print(f"Run complete: {run_dir}")
+
+def _benchmark_run(**options: Any) -> None:
+    """Run ``run_benchmark`` and report the plan, trace/profile files and the run directory."""
+    result = run_benchmark(**options)
+    if result.run_dir is None:
+        _print_plan(result.plan)
+        return
+    if options.get("trace") is not None:
+        console.print(f"Trace written: {options['trace']}")
+    if result.profiles:
+        console.print(f"Profiles written: {', '.join(str(path) for path in result.profiles)}")
+    console.print(f"Run complete: {result.run_dir}")
 
 
 @app.command("benchmark")
 def benchmark_cmd(
     models: str = typer.Option("all", help="Comma-separated model names or 'all'."),
-    prompts: Path = typer.Option(..., help="Prompt YAML."),
+    prompts: Path = typer.Option(
+        ..., help="Prompt YAML, or a JSONL/CSV file or directory of .txt prompts."
+    ),
     out: Path = typer.Option(Path("runs"), help="Output directory."),
     run_id: Optional[str] = typer.Option(None, help="Explicit run id."),
     seed: int = typer.Option(1337, help="Random seed."),
-    reference_voice: Optional[Path] = typer.Option(None, help="Reference voice for similarity."),
+    reference_voice: Optional[List[Path]] = typer.Option(
+        None, help="Reference voice for similarity; repeat to compare against several voices."
+    ),
+    asr_model: str = typer.Option("small", help="faster-whisper model size for WER/CER."),
+    asr_compute_type: str = typer.Option("int8", help="faster-whisper compute type."),
+    asr_threads: int = typer.Option(0, help="ASR CPU threads (0 = library default)."),
+    asr_batch_size: int = typer.Option(8, help="Outputs transcribed per ASR batch."),
+    keep_audio: bool = typer.Option(
+        True, help="Write audio files; --no-keep-audio for metrics only."
+    ),
+    stream: bool = typer.Option(
+        True, help="Use streaming synthesis where supported to measure TTFA."
+    ),
+    synth_workers: str = typer.Option(
+        "1", help="Synthesis threads: a count, or per model like 'piper=4,coqui_xtts_v2=1'."
+    ),
+    score_workers: int = typer.Option(1, help="Scoring processes (0 scores inline)."),
+    cache: bool = typer.Option(True, help="Reuse audio from the shared synthesis cache."),
+    cache_dir: Optional[Path] = typer.Option(None, help="Synthesis cache directory."),
+    cache_max_gb: float = typer.Option(DEFAULT_MAX_BYTES / 1024**3, help="Cache size cap in GB."),
+    metric_cache: bool = typer.Option(True, help="Reuse stored metric values for unchanged audio."),
+    plan_only: bool = typer.Option(False, help="Print the planned jobs and exit."),
+    trials: int = typer.Option(1, help="Timed synthesis repetitions per job."),
+    warmup: int = typer.Option(0, help="Untimed synthesis repetitions per job before the trials."),
+    trace: Optional[Path] = typer.Option(
+        None, help="Write a Chrome/Perfetto trace of every span to this JSON file."
+    ),
+    profile: bool = typer.Option(
+        False, help="cProfile each phase; writes <run>/profile/<phase>.prof."
+    ),
+    results_json: bool = typer.Option(
+        True, help="Also write results.json from the streamed results.jsonl."
+    ),
+    shard: Optional[str] = typer.Option(
+        None, help="Run only the jobs in shard i of N ('i/N', 1-based); see 'ttsbench merge'."
+    ),
+    limit: Optional[int] = typer.Option(None, help="Use only the first N prompts."),
+    audio_store: str = typer.Option(
+        "files", help="'files' (a WAV per output) or 'packed' (one audio.pack per run)."
+    ),
+    pack_dtype: str = typer.Option(
+        "int16", help="Sample format of a packed store: int16 or float32."
+    ),
 ) -> None:
     run_id = _run_id(run_id)
+    try:
+        shard_range = parse_shard(shard) if shard else None
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--shard") from None
+    if audio_store not in AUDIO_STORES:
+        raise typer.BadParameter(
+            f"expected one of {', '.join(AUDIO_STORES)}", param_hint="--audio-store"
+        )
+    if pack_dtype not in PACK_DTYPES:
+        raise typer.BadParameter(
+            f"expected one of {', '.join(PACK_DTYPES)}", param_hint="--pack-dtype"
+        )
 
     if models == "all":
-        selected_models = [model.name for model in list_models()]
+        selected_models = [model.name for model in list_models() if not model.synthetic]
     else:
         selected_models = [name.strip() for name in models.split(",") if name.strip()]
 
@@ -244,7 +271,24 @@ def benchmark_cmd(
         out=out,
         run_id=run_id,
         seed=seed,
-        reference_voice=reference_voice,
+        reference_voices=reference_voice or [],
+        asr_config=_asr_config(asr_model, asr_compute_type, asr_threads, asr_batch_size),
+        keep_audio=keep_audio,
+        stream=stream,
+        synth_workers=synth_workers,
+        score_workers=score_workers,
+        cache=_synth_cache(cache, cache_dir, cache_max_gb),
+        metric_cache=default_metric_cache_path() if metric_cache else None,
+        plan_only=plan_only,
+        trials=trials,
+        warmup=warmup,
+        trace=trace,
+        profile=profile,
+        results_json=results_json,
+        shard=shard_range,
+        limit=limit,
+        audio_store=audio_store,
+        pack_dtype=pack_dtype,
     )
 
 
@@ -275,6 +319,27 @@ def eval_trained_cmd(
     out: Path = typer.Option(Path("runs"), help="Output directory."),
     model: str = typer.Option("coqui_xtts_v2", help="Model name."),
     reference_voice: Optional[Path] = typer.Option(None, help="Reference voice for similarity."),
+    asr_model: str = typer.Option("small", help="faster-whisper model size for WER/CER."),
+    asr_compute_type: str = typer.Option("int8", help="faster-whisper compute type."),
+    asr_threads: int = typer.Option(0, help="ASR CPU threads (0 = library default)."),
+    asr_batch_size: int = typer.Option(8, help="Outputs transcribed per ASR batch."),
+    keep_audio: bool = typer.Option(
+        True, help="Write audio files; --no-keep-audio for metrics only."
+    ),
+    stream: bool = typer.Option(
+        True, help="Use streaming synthesis where supported to measure TTFA."
+    ),
+    synth_workers: str = typer.Option(
+        "1", help="Synthesis threads: a count, or per model like 'piper=4,coqui_xtts_v2=1'."
+    ),
+    score_workers: int = typer.Option(1, help="Scoring processes (0 scores inline)."),
+    cache: bool = typer.Option(True, help="Reuse audio from the shared synthesis cache."),
+    cache_dir: Optional[Path] = typer.Option(None, help="Synthesis cache directory."),
+    cache_max_gb: float = typer.Option(DEFAULT_MAX_BYTES / 1024**3, help="Cache size cap in GB."),
+    metric_cache: bool = typer.Option(True, help="Reuse stored metric values for unchanged audio."),
+    plan_only: bool = typer.Option(False, help="Print the planned jobs and exit."),
+    trials: int = typer.Option(1, help="Timed synthesis repetitions per job."),
+    warmup: int = typer.Option(0, help="Untimed synthesis repetitions per job before the trials."),
 ) -> None:
     run_id = _run_id(None)
     config_override: Dict[str, object] = {"model_path": str(checkpoint)}
@@ -287,6 +352,353 @@ def eval_trained_cmd(
         out=out,
         run_id=run_id,
         seed=1337,
-        reference_voice=reference_voice,
+        reference_voices=[reference_voice] if reference_voice else [],
         config_override=config_override,
+        asr_config=_asr_config(asr_model, asr_compute_type, asr_threads, asr_batch_size),
+        keep_audio=keep_audio,
+        stream=stream,
+        synth_workers=synth_workers,
+        score_workers=score_workers,
+        cache=_synth_cache(cache, cache_dir, cache_max_gb),
+        metric_cache=default_metric_cache_path() if metric_cache else None,
+        plan_only=plan_only,
+        trials=trials,
+        warmup=warmup,
     )
+
+
+@app.command("loadtest")
+def loadtest_cmd(
+    model: str = typer.Option(..., help="Model to drive."),
+    prompts: Path = typer.Option(..., help="Prompt YAML to draw request texts from."),
+    out: Path = typer.Option(Path("runs"), help="Output directory."),
+    run_id: Optional[str] = typer.Option(None, help="Explicit run id."),
+    mode: str = typer.Option("closed", help="closed (N clients), poisson or constant arrivals."),
+    levels: str = typer.Option(
+        "1,4,16", help="Comma-separated clients (closed) or request rates per second (open)."
+    ),
+    requests: int = typer.Option(64, help="Requests per load level."),
+    workers: int = typer.Option(1, help="Model replicas serving requests concurrently."),
+    stream: bool = typer.Option(
+        True, help="Use streaming synthesis where supported to measure TTFA."
+    ),
+    seed: int = typer.Option(1337, help="Seed for request texts and arrival times."),
+) -> None:
+    if mode not in LOAD_MODES:
+        raise typer.BadParameter(f"mode must be one of {', '.join(LOAD_MODES)}")
+    load_levels = [float(level) for level in levels.split(",") if level.strip()]
+    prompt_set = load_prompts(prompts)
+    model_cls = get_model(model)
+    if not model_cls.is_available():
+        raise typer.Exit(model_cls.availability_help())
+
+    run_id = _run_id(run_id)
+    run_dir = out / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    config = prompt_set.config.model_dump()
+    summaries = []
+    records = []
+    with ModelPool() as pool, LoadTester(pool, model, config, workers, stream) as tester:
+        for level in load_levels:
+            level_records = tester.run_level(
+                mode, level, draw_requests(prompt_set, requests, rng), rng
+            )
+            summaries.append(summarize(mode, level, level_records))
+            records.extend(record_payload(record) for record in level_records)
+            console.print(
+                f"{mode} {level:g}: {summaries[-1].throughput_rps:.2f} req/s, "
+                f"p95 {summaries[-1].latency_p95_s:.3f}s"
+            )
+
+    saturation = saturation_point(summaries)
+    payload = {
+        "run": {
+            "run_id": run_id,
+            "created_at": datetime.utcnow().isoformat(),
+            "prompts_path": str(prompts),
+            "seed": seed,
+            "model": model,
+            "mode": mode,
+            "workers": workers,
+        },
+        "levels": [asdict(summary) for summary in summaries],
+        "saturation": asdict(saturation) if saturation else None,
+        "requests": records,
+    }
+    (run_dir / "loadtest.json").write_text(json.dumps(payload, indent=2))
+    write_loadtest_report(run_dir / "report.md", payload)
+    console.print(f"Load test complete: {run_dir}")
+
+
+@app.command("bench-overhead")
+def bench_overhead_cmd(
+    sizes: str = typer.Option(
+        ",".join(str(size) for size in OVERHEAD_SIZES), help="Comma-separated prompt counts."
+    ),
+    out: Path = typer.Option(Path("runs/overhead"), help="Working directory for the runs."),
+    keep_audio: bool = typer.Option(True, help="Include writing WAV files in the measurement."),
+    max_us_per_output: Optional[float] = typer.Option(
+        None, help="Exit non-zero when any size exceeds this total per-output overhead."
+    ),
+) -> None:
+    """Time the harness itself (planning, metrics, audio, DB, report) with the synthetic model."""
+    counts = [int(size) for size in sizes.split(",") if size.strip()]
+    results = run_overhead_suite(counts, out, keep_audio=keep_audio)
+    table = Table(title="Harness overhead (µs per output)")
+    table.add_column("Prompts")
+    for phase in OVERHEAD_PHASES + ("total",):
+        table.add_column(phase)
+    for result in results:
+        per_output = result.per_output_us()
+        table.add_row(
+            str(result.prompts),
+            *(f"{per_output[phase]:.1f}" for phase in OVERHEAD_PHASES + ("total",)),
+        )
+    console.print(table)
+    (out / "overhead.json").write_text(
+        json.dumps([result.payload() for result in results], indent=2)
+    )
+    over_budget = [
+        result.prompts
+        for result in results
+        if max_us_per_output is not None and result.per_output_us()["total"] > max_us_per_output
+    ]
+    if over_budget:
+        console.print(f"Over {max_us_per_output:g} µs per output at sizes: {over_budget}")
+        raise typer.Exit(1)
+
+
+@app.command("compare")
+def compare_cmd(
+    baseline: Path = typer.Argument(..., help="Baseline run directory."),
+    candidate: Path = typer.Argument(..., help="Candidate run directory."),
+    history: Optional[List[Path]] = typer.Option(
+        None, help="Earlier baseline run to estimate run-to-run noise; repeatable."
+    ),
+    metrics: str = typer.Option(
+        ",".join(COMPARE_METRICS), help="Comma-separated metrics to compare."
+    ),
+    threshold: str = typer.Option(
+        "", help="Regression thresholds like 'rtf=10,wer=0.02'; a bare number sets all timing %."
+    ),
+    alpha: float = typer.Option(0.05, help="Significance level."),
+    out: Optional[Path] = typer.Option(
+        None, help="Write compare.json and compare.md here (default: candidate run directory)."
+    ),
+) -> None:
+    """Test a candidate run against a baseline; exits 1 on a significant regression."""
+    selected = _split(metrics)
+    unknown = sorted(set(selected) - set(COMPARE_METRICS))
+    if unknown:
+        raise typer.BadParameter(f"Unknown metrics: {', '.join(unknown)}")
+    result = compare_runs(
+        baseline,
+        candidate,
+        history or [],
+        metrics=selected,
+        thresholds=parse_thresholds(threshold),
+        alpha=alpha,
+    )
+    out = out or candidate
+    out.mkdir(parents=True, exist_ok=True)
+    payload = result.payload()
+    (out / "compare.json").write_text(json.dumps(payload, indent=2))
+    write_compare_report(out / "compare.md", payload)
+
+    table = Table(title=f"{result.candidate} vs {result.baseline}")
+    for column in ("Model", "Metric", "Pairs", "Baseline", "Candidate", "Delta %", "p", "Verdict"):
+        table.add_column(column)
+    for item in result.metrics:
+        relative = f"{item.relative_pct:+.1f}" if item.relative_pct is not None else "n/a"
+        table.add_row(
+            item.model,
+            item.metric,
+            str(item.pairs),
+            f"{item.baseline:.4f}",
+            f"{item.candidate:.4f}",
+            relative,
+            f"{item.p_value:.4f}",
+            item.verdict,
+        )
+    console.print(table)
+    console.print(f"Comparison written: {out / 'compare.md'}")
+    if result.regressions:
+        names = ", ".join(f"{item.model}/{item.metric}" for item in result.regressions)
+        console.print(f"Regressions: {names}")
+        raise typer.Exit(1)
+
+
+@app.command("merge")
+def merge_cmd(
+    shards: List[Path] = typer.Argument(..., help="Shard run directories of one run."),
+    out: Path = typer.Option(Path("runs"), help="Output directory for the merged run."),
+    allow_missing: bool = typer.Option(
+        False, help="Merge even if shards or jobs are missing; they are listed as skipped."
+    ),
+) -> None:
+    """Combine the directories of a 'benchmark --shard i/N' run into one run."""
+    try:
+        summary = merge_shards(shards, out, allow_missing=allow_missing)
+    except MergeError as exc:
+        console.print(f"Cannot merge: {exc}")
+        raise typer.Exit(1) from None
+    if summary.missing_shards:
+        console.print(f"Missing shards: {', '.join(summary.missing_shards)}")
+    if summary.missing_jobs:
+        console.print(f"Unfinished jobs: {len(summary.missing_jobs)}")
+    console.print(
+        f"Merged {summary.shards} shards, {summary.outputs} outputs: {summary.run_dir}"
+    )
+
+
+@app.command("export-wavs")
+def export_wavs_cmd(
+    run_dir: Path = typer.Argument(
+        ..., help="Run directory benchmarked with --audio-store packed."
+    ),
+    out: Optional[Path] = typer.Option(None, help="Output directory (default: the run directory)."),
+    prefix: str = typer.Option(
+        "", help="Export only outputs under '<model>' or '<model>/<prompt_id>'."
+    ),
+) -> None:
+    """Write the packed audio of a run as <model>/<prompt_id>/<style>/audio.wav files."""
+    written = export_wavs(run_dir, out, prefix)
+    console.print(f"Exported {written} WAV files: {out or run_dir}")
+
+
+@app.command("rescore")
+def rescore_cmd(
+    run_dir: Path = typer.Argument(..., help="Existing run directory (runs/<run_id>)."),
+    metrics: str = typer.Option(
+        ",".join(METRIC_GROUPS), help="Comma-separated metric groups to recompute."
+    ),
+    reference_voice: Optional[List[Path]] = typer.Option(
+        None, help="Reference voice for similarity; repeat to compare against several voices."
+    ),
+    asr_model: str = typer.Option("small", help="faster-whisper model size for WER/CER."),
+    asr_compute_type: str = typer.Option("int8", help="faster-whisper compute type."),
+    asr_threads: int = typer.Option(0, help="ASR CPU threads (0 = library default)."),
+    asr_batch_size: int = typer.Option(8, help="Outputs transcribed per ASR batch."),
+    score_workers: int = typer.Option(
+        os.cpu_count() or 1, help="Scoring processes (0 scores inline)."
+    ),
+    metric_cache: bool = typer.Option(True, help="Reuse stored metric values for unchanged audio."),
+) -> None:
+    selected = tuple(name.strip() for name in metrics.split(",") if name.strip())
+    unknown = sorted(set(selected) - set(METRIC_GROUPS))
+    if unknown:
+        raise typer.BadParameter(f"Unknown metric groups: {', '.join(unknown)}")
+    if not (run_dir / "results.sqlite").exists():
+        raise typer.BadParameter(f"{run_dir} has no results.sqlite")
+    scoring = ScoringConfig(
+        asr=_asr_config(asr_model, asr_compute_type, asr_threads, asr_batch_size),
+        reference_voices=tuple(reference_voice or []),
+        metric_cache=default_metric_cache_path() if metric_cache else None,
+        metrics=selected,
+    )
+    summary = rescore_run(
+        run_dir, scoring, score_workers=score_workers, batch_size=scoring.asr.batch_size
+    )
+    console.print(f"Rescored {summary.scored} outputs ({summary.skipped} without audio): {run_dir}")
+
+
+@cache_app.command("stats")
+def cache_stats_cmd(
+    cache_dir: Optional[Path] = typer.Option(None, help="Synthesis cache directory."),
+) -> None:
+    stats = SynthCache(cache_dir or default_cache_dir()).stats()
+    table = Table(title="Synthesis cache")
+    table.add_column("Entries")
+    table.add_column("Size (MB)")
+    table.add_column("Hits")
+    table.add_row(str(stats.entries), f"{stats.total_bytes / 1024**2:.1f}", str(stats.hits))
+    console.print(table)
+
+
+@cache_app.command("prune")
+def cache_prune_cmd(
+    max_gb: float = typer.Option(..., help="Evict least recently used audio above this size."),
+    cache_dir: Optional[Path] = typer.Option(None, help="Synthesis cache directory."),
+) -> None:
+    removed = SynthCache(cache_dir or default_cache_dir()).prune(int(max_gb * 1024**3))
+    console.print(f"Removed {removed} cached outputs.")
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+@warehouse_app.command("ingest")
+def warehouse_ingest_cmd(
+    runs: List[Path] = typer.Argument(
+        ..., help="Run directories, or directories of runs (e.g. runs/)."
+    ),
+    warehouse: Path = typer.Option(Path("warehouse"), help="Warehouse directory."),
+) -> None:
+    store = Warehouse(warehouse)
+    run_dirs = []
+    for path in runs:
+        if (path / "results.sqlite").exists():
+            run_dirs.append(path)
+        else:
+            run_dirs.extend(sorted(child.parent for child in path.glob("*/results.sqlite")))
+    if not run_dirs:
+        raise typer.BadParameter("No results.sqlite found under the given paths")
+    for run_dir in run_dirs:
+        summary = store.ingest(run_dir)
+        action = "Replaced" if summary.replaced else "Ingested"
+        console.print(
+            f"{action} {summary.run_id}: {summary.outputs} outputs, {summary.metrics} metrics"
+        )
+
+
+@warehouse_app.command("query")
+def warehouse_query_cmd(
+    metric: str = typer.Option(..., help="Metric to aggregate, e.g. rtf."),
+    stats: str = typer.Option("count,mean,p95", help=f"Comma-separated of {', '.join(STATS)}."),
+    by: str = typer.Option("model", help=f"Comma-separated of {', '.join(GROUP_BY)}."),
+    model: Optional[str] = typer.Option(None, help="Only these comma-separated models."),
+    since: Optional[datetime] = typer.Option(None, help="Only runs created at or after (UTC)."),
+    until: Optional[datetime] = typer.Option(None, help="Only runs created before (UTC)."),
+    engine: str = typer.Option("auto", help="auto, sqlite or parquet."),
+    as_json: bool = typer.Option(False, "--json", help="Print rows as JSON."),
+    warehouse: Path = typer.Option(Path("warehouse"), help="Warehouse directory."),
+) -> None:
+    group_by = _split(by)
+    try:
+        rows = Warehouse(warehouse).query(
+            metric,
+            stats=_split(stats),
+            group_by=group_by,
+            models=_split(model) or None,
+            since=since,
+            until=until,
+            engine=engine,
+        )
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    if as_json:
+        typer.echo(json.dumps(rows, indent=2))
+        return
+    table = Table(title=f"{metric} by {', '.join(group_by) or 'all'}")
+    for column in group_by + _split(stats):
+        table.add_column(column)
+    for row in rows:
+        table.add_row(
+            *(f"{value:.4f}" if isinstance(value, float) else str(value) for value in row.values())
+        )
+    console.print(table)
+
+
+@warehouse_app.command("lookup")
+def warehouse_lookup_cmd(
+    run_id: Optional[str] = typer.Option(None, help="Run id."),
+    model: Optional[str] = typer.Option(None, help="Model name."),
+    prompt_id: Optional[str] = typer.Option(None, help="Prompt id."),
+    limit: int = typer.Option(100, help="Maximum outputs to print."),
+    warehouse: Path = typer.Option(Path("warehouse"), help="Warehouse directory."),
+) -> None:
+    """Print matching outputs with all their metrics, one JSON object per line."""
+    for row in Warehouse(warehouse).lookup(run_id, model, prompt_id, limit=limit):
+        typer.echo(json.dumps(row))
@@ -0,0 +1 @@
+"""Benchmark execution: job lists, synthesis and scoring pipeline."""
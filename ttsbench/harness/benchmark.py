@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import random
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from ttsbench.harness.executor import PipelineExecutor, parse_worker_counts
+from ttsbench.harness.jobs import (
+    JOB_FIELDS,
+    SKIP_FAILED,
+    JobPlanner,
+    SynthJob,
+    prompt_batches,
+    shard_label,
+)
+from ttsbench.harness.scoring import ScoringConfig
+from ttsbench.metrics.asr_metrics import ASRConfig
+from ttsbench.models.pool import LoadedModel, ModelPool
+from ttsbench.models.registry import get_model
+from ttsbench.utils.audio import AudioPersister
+from ttsbench.utils.audio_store import PackedAudioStore
+from ttsbench.utils.prompts import load_prompts, normalize_prompt
+from ttsbench.utils.report import write_report_from_stream
+from ttsbench.utils.results import (
+    BufferedResultsWriter,
+    ResultsWriter,
+    RunInfo,
+    sigterm_flush,
+)
+from ttsbench.utils.results_stream import RESULTS_STREAM, ResultsStream, write_results_json
+from ttsbench.utils.synth_cache import SynthCache
+from ttsbench.utils.tracing import PhaseTotals, Tracer, use_tracer
+
+
+@dataclass
+class BenchmarkRun:
+    run_dir: Optional[Path]
+    # Planned and skipped jobs per model (``JobPlanner.summary``).
+    plan: Dict[str, Dict[str, int]]
+    tracer: Tracer
+    outputs: int = 0
+    profiles: List[Path] = field(default_factory=list)
+
+
+def audio_persister(
+    run_dir: Path, audio_store: str, pack_dtype: str
+) -> Union[AudioPersister, PackedAudioStore]:
+    if audio_store == "packed":
+        return PackedAudioStore(run_dir, dtype=pack_dtype)
+    return AudioPersister()
+
+
+def _path_str(path: Optional[Union[Path, str]]) -> Optional[str]:
+    return str(path) if path is not None else None
+
+
+def run_benchmark(
+    models: List[str],
+    prompts: Path,
+    out: Path,
+    run_id: str,
+    seed: int,
+    reference_voices: List[Path],
+    config_override: Optional[Dict[str, object]] = None,
+    asr_config: Optional[ASRConfig] = None,
+    keep_audio: bool = True,
+    stream: bool = True,
+    synth_workers: str = "1",
+    score_workers: int = 1,
+    cache: Optional[SynthCache] = None,
+    metric_cache: Optional[Path] = None,
+    plan_only: bool = False,
+    trials: int = 1,
+    warmup: int = 0,
+    trace: Optional[Path] = None,
+    profile: bool = False,
+    results_json: bool = True,
+    shard: Optional[Tuple[int, int]] = None,
+    limit: Optional[int] = None,
+    audio_store: str = "files",
+    pack_dtype: str = "int16",
+) -> BenchmarkRun:
+    """Plan, synthesize, score and store one run: what ``ttsbench benchmark`` executes.
+
+    With ``plan_only`` nothing runs and ``run_dir`` is ``None``. The returned tracer holds the
+    per-phase totals of the whole run, including writing ``results.json`` and the report.
+    """
+    # The per-phase totals always feed the report; a full tracer only runs when its events or
+    # profiles were asked for.
+    tracer: Tracer
+    if trace is not None or profile:
+        tracer = Tracer(record_events=trace is not None, profile=profile)
+    else:
+        tracer = PhaseTotals()
+    with tracer.span("plan"):
+        prompt_set = load_prompts(prompts)
+        available = [name for name in models if get_model(name).is_available()]
+        planner = JobPlanner(models, prompt_set.config.styles, available=available, shard=shard)
+        # Prompts stream through twice, never held: this pass validates every row before any
+        # model loads and finds which models will get work; the second one feeds the run.
+        languages = {prompt.language for prompt in prompt_set.iter_prompts(limit)}
+        planned_models = planner.runnable(languages)
+    if plan_only:
+        for batch in prompt_batches(prompt_set.iter_prompts(limit)):
+            for _ in planner.plan(batch):
+                pass
+        return BenchmarkRun(run_dir=None, plan=planner.summary(), tracer=tracer)
+
+    run_dir = out / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+    random.seed(seed)
+
+    results_writer = ResultsWriter(run_dir / "results.sqlite")
+    run_info = RunInfo(
+        run_id=run_id,
+        created_at=datetime.utcnow(),
+        prompts_path=str(prompts),
+        seed=seed,
+    )
+    results_writer.write_run(run_info)
+
+    config = prompt_set.config.model_dump()
+    if config_override:
+        config.update(config_override)
+    scoring = ScoringConfig(
+        asr=asr_config or ASRConfig(),
+        reference_voices=tuple(reference_voices),
+        metric_cache=metric_cache,
+        trace=True,
+    )
+    default_workers, model_workers = parse_worker_counts(synth_workers)
+    outputs = 0
+
+    with (
+        sigterm_flush(),
+        use_tracer(tracer),
+        ModelPool() as pool,
+        audio_persister(run_dir, audio_store, pack_dtype) as persister,
+        BufferedResultsWriter(results_writer) as output_writer,
+        ResultsStream(run_dir / RESULTS_STREAM) as results_stream,
+    ):
+        run_record: Dict[str, object] = {
+            "run_id": run_id,
+            "created_at": run_info.created_at.isoformat(),
+            "prompts_path": run_info.prompts_path,
+            "seed": seed,
+        }
+        if shard is not None:
+            run_record["shard"] = shard_label(shard)
+        results_stream.write("run", run_record)
+        model_rows = []
+        model_instances: Dict[str, LoadedModel] = {}
+        # Only models with planned work are loaded.
+        for name in planned_models:
+            model_instances[name] = pool.acquire(name, config)
+        for name in models:
+            model_cls = get_model(name)
+            loaded = model_instances.get(name)
+            model_rows.append(
+                {
+                    "name": model_cls.name,
+                    "description": model_cls.description,
+                    "available": name in available,
+                    "load_time_s": loaded.load_time_s if loaded else None,
+                }
+            )
+        model_ids = results_writer.write_models(run_id, model_rows)
+        model_id_lookup = {row["name"]: model_ids[idx] for idx, row in enumerate(model_rows)}
+        results_stream.write_many("model", model_rows)
+
+        prompt_id_lookup: Dict[str, int] = {}
+
+        def planned_jobs() -> Iterator[SynthJob]:
+            # Each batch's prompts are stored before its jobs are handed to the executor, so
+            # every output finds its prompt row.
+            for batch in prompt_batches(prompt_set.iter_prompts(limit)):
+                prompt_rows = [
+                    {
+                        "id": prompt.id,
+                        "text": normalize_prompt(prompt.text),
+                        "language": prompt.language,
+                        "style": prompt.style or "neutral",
+                    }
+                    for prompt in batch
+                ]
+                prompt_ids = results_writer.write_prompts(run_id, prompt_rows)
+                prompt_id_lookup.update(zip((row["id"] for row in prompt_rows), prompt_ids))
+                results_stream.write_many("prompt", prompt_rows)
+                skipped_rows = []
+                for item in planner.plan(batch):
+                    if isinstance(item, SynthJob):
+                        if shard is not None:
+                            # The shard's manifest: ``merge`` checks every job came back.
+                            results_stream.write("job", dict(zip(JOB_FIELDS, item.key)))
+                        yield item
+                    else:
+                        skipped_rows.append(asdict(item))
+                results_writer.write_skipped(run_id, skipped_rows)
+                results_stream.write_many("skipped", skipped_rows)
+
+        executor = PipelineExecutor(
+            pool=pool,
+            config=config,
+            run_dir=run_dir,
+            scoring=scoring,
+            persister=persister if keep_audio else None,
+            stream=stream,
+            synth_workers=default_workers,
+            model_synth_workers=model_workers,
+            score_workers=score_workers,
+            batch_size=scoring.asr.batch_size,
+            cache=cache,
+            seed=seed,
+            trials=trials,
+            warmup=warmup,
+        )
+        for output in executor.run(planned_jobs()):
+            job = output.job
+            if output.error is not None:
+                failed = {
+                    "model": job.model,
+                    "prompt_id": job.prompt_id,
+                    "style": job.style,
+                    "language": job.language,
+                    "kind": SKIP_FAILED,
+                    "reason": output.error,
+                }
+                results_writer.write_skipped(run_id, [failed])
+                results_stream.write("skipped", failed)
+                continue
+            output_writer.write_output(
+                run_id=run_id,
+                model_id=model_id_lookup[job.model],
+                prompt_id=prompt_id_lookup[job.prompt_id],
+                audio_path=_path_str(output.audio_path),
+                sample_rate=output.sample_rate,
+                metrics=output.metrics,
+                trials=output.trials,
+                style=job.style,
+            )
+            results_stream.write(
+                "output",
+                {
+                    "model": job.model,
+                    "prompt_id": job.prompt_id,
+                    "style": job.style,
+                    "audio_path": _path_str(output.audio_path),
+                    "sample_rate": output.sample_rate,
+                    "metrics": output.metrics,
+                    "trials": output.trials,
+                },
+            )
+            outputs += 1
+
+        output_writer.flush()
+        results_stream.write_many("phase", tracer.breakdown())
+    # The stream is closed and complete here; these spans reach --trace/--profile but not
+    # the phase rows already written to it.
+    if results_json:
+        with tracer.span("results_json"):
+            write_results_json(run_dir / RESULTS_STREAM, run_dir / "results.json")
+    with tracer.span("report"):
+        write_report_from_stream(run_dir / "report.md", run_dir / RESULTS_STREAM)
+    if trace is not None:
+        tracer.write_chrome_trace(trace)
+    profiles = tracer.write_profiles(run_dir / "profile") if profile else []
+    return BenchmarkRun(
+        run_dir=run_dir,
+        plan=planner.summary(),
+        tracer=tracer,
+        outputs=outputs,
+        profiles=profiles,
+    )
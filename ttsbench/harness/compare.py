@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ttsbench.utils import stats
+from ttsbench.utils.results_stream import RESULTS_STREAM, read_results_stream
+from ttsbench.utils.warehouse import read_run
+
+OutputKey = Tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class MetricRule:
+    """How a metric may move: ``lower``/``higher`` is better, or ``either`` way is a change.
+
+    ``threshold`` is in percent of the baseline mean when ``relative``, otherwise in the
+    metric's own units (WER points, LU).
+    """
+
+    direction: str
+    relative: bool
+    threshold: float
+
+
+COMPARE_METRICS: Dict[str, MetricRule] = {
+    "total_time_s": MetricRule("lower", True, 5.0),
+    "rtf": MetricRule("lower", True, 5.0),
+    "time_to_first_audio_ms": MetricRule("lower", True, 5.0),
+    "wer": MetricRule("lower", False, 0.01),
+    "cer": MetricRule("lower", False, 0.01),
+    "speaker_similarity": MetricRule("higher", False, 0.02),
+    "lufs": MetricRule("either", False, 1.0),
+}
+REGRESSION = "regression"
+IMPROVEMENT = "improvement"
+UNCHANGED = "unchanged"
+
+
+@dataclass
+class RunOutputs:
+    run_id: str
+    metrics: Dict[OutputKey, Dict[str, float]]
+
+
+@dataclass
+class MetricComparison:
+    model: str
+    metric: str
+    pairs: int
+    baseline: float
+    candidate: float
+    delta: float
+    relative_pct: Optional[float]
+    ci: List[float]
+    p_value: float
+    noise: Optional[float]
+    threshold: float
+    verdict: str
+
+
+@dataclass
+class Comparison:
+    baseline: str
+    candidate: str
+    history: List[str]
+    alpha: float
+    metrics: List[MetricComparison] = field(default_factory=list)
+    baseline_only: int = 0
+    candidate_only: int = 0
+
+    @property
+    def regressions(self) -> List[MetricComparison]:
+        return [item for item in self.metrics if item.verdict == REGRESSION]
+
+    def payload(self) -> Dict[str, Any]:
+        return dict(asdict(self), regressions=len(self.regressions))
+
+
+def parse_thresholds(spec: str) -> Dict[str, float]:
+    """Parse ``"rtf=10,wer=0.02"``; a bare number sets every relative (percent) threshold."""
+    thresholds: Dict[str, float] = {}
+    for part in (piece.strip() for piece in spec.split(",")):
+        if not part:
+            continue
+        if "=" in part:
+            name, value = part.split("=", 1)
+            thresholds[name.strip()] = float(value)
+        else:
+            for name, rule in COMPARE_METRICS.items():
+                if rule.relative:
+                    thresholds.setdefault(name, float(part))
+    return thresholds
+
+
+def load_run_outputs(run_dir: Path) -> RunOutputs:
+    """Metrics per ``(model, prompt_id, style)`` from ``results.sqlite``, else the JSON files.
+
+    SQLite comes first because ``rescore`` keeps it current; it is opened read-only, so a
+    comparison never migrates or otherwise writes to the baseline. The JSON files cover runs
+    copied around without their database.
+    """
+    metrics: Dict[OutputKey, Dict[str, float]] = {}
+    if (run_dir / "results.sqlite").exists():
+        run, chunks = read_run(run_dir / "results.sqlite")
+        for rows in chunks:
+            for row in rows:
+                metrics[(row["model"], row["prompt_id"], row["style"])] = row["metrics"]
+        return RunOutputs(run["run_id"], metrics)
+    if (run_dir / RESULTS_STREAM).exists():
+        records = list(read_results_stream(run_dir / RESULTS_STREAM))
+        run_id = next((record["run_id"] for kind, record in records if kind == "run"), None)
+        outputs = [record for kind, record in records if kind == "output"]
+    elif (run_dir / "results.json").exists():
+        payload = json.loads((run_dir / "results.json").read_text())
+        run_id = payload.get("run", {}).get("run_id")
+        outputs = payload.get("outputs", [])
+    else:
+        raise FileNotFoundError(f"{run_dir} has no results.sqlite, results.jsonl or results.json")
+    for output in outputs:
+        key = (output["model"], output["prompt_id"], output.get("style") or "neutral")
+        metrics[key] = output["metrics"]
+    return RunOutputs(run_id or run_dir.name, metrics)
+
+
+def _magnitude(rule: MetricRule, delta: float, baseline: float) -> Optional[float]:
+    """``delta`` in the units the rule's threshold uses; ``None`` for a zero relative base."""
+    if not rule.relative:
+        return delta
+    if baseline == 0:
+        return None
+    return delta / abs(baseline) * 100.0
+
+
+def _paired(
+    baseline: Dict[OutputKey, Dict[str, float]],
+    candidate: Dict[OutputKey, Dict[str, float]],
+    model: str,
+    metric: str,
+) -> Tuple[np.ndarray, np.ndarray]:
+    keys = [
+        key
+        for key in baseline
+        if key[0] == model
+        and key in candidate
+        and metric in baseline[key]
+        and metric in candidate[key]
+    ]
+    before = np.array([baseline[key][metric] for key in keys], dtype=np.float64)
+    after = np.array([candidate[key][metric] for key in keys], dtype=np.float64)
+    keep = np.isfinite(before) & np.isfinite(after)
+    return before[keep], after[keep]
+
+
+def compare_runs(
+    baseline_dir: Path,
+    candidate_dir: Path,
+    history_dirs: Sequence[Path] = (),
+    metrics: Optional[Sequence[str]] = None,
+    thresholds: Optional[Dict[str, float]] = None,
+    alpha: float = 0.05,
+    samples: int = 10_000,
+) -> Comparison:
+    """Pair outputs of two runs by ``(model, prompt_id, style)`` and test every metric.
+
+    Per model and metric, the mean paired difference gets a sign-flip permutation p-value and
+    a bootstrap CI. A change is a regression when it goes the wrong way, ``p < alpha`` and it
+    exceeds both the metric's threshold and the noise seen between the baseline and
+    ``history_dirs`` (earlier runs of the same baseline), which therefore widen the margin.
+    """
+    baseline = load_run_outputs(baseline_dir)
+    candidate = load_run_outputs(candidate_dir)
+    history = [load_run_outputs(path) for path in history_dirs]
+    thresholds = thresholds or {}
+    rules = {
+        name: MetricRule(rule.direction, rule.relative, thresholds.get(name, rule.threshold))
+        for name, rule in COMPARE_METRICS.items()
+        if metrics is None or name in metrics
+    }
+    result = Comparison(
+        baseline=baseline.run_id,
+        candidate=candidate.run_id,
+        history=[run.run_id for run in history],
+        alpha=alpha,
+        baseline_only=len(baseline.metrics.keys() - candidate.metrics.keys()),
+        candidate_only=len(candidate.metrics.keys() - baseline.metrics.keys()),
+    )
+    models = sorted({key[0] for key in baseline.metrics.keys() & candidate.metrics.keys()})
+    for model in models:
+        for name, rule in rules.items():
+            before, after = _paired(baseline.metrics, candidate.metrics, model, name)
+            if before.size == 0:
+                continue
+            differences = after - before
+            delta = float(differences.mean())
+            base_mean = float(before.mean())
+            seed = stats.model_seed(0, f"{model}/{name}")
+            ci = stats.confidence_interval(
+                stats.bootstrap_means(differences, seed=seed), 1.0 - alpha
+            )
+            p_value = stats.sign_flip_test(differences, samples, seed)
+            noise = _noise(baseline, history, model, name, rule)
+            magnitude = _magnitude(rule, delta, base_mean)
+            relative = _magnitude(MetricRule(rule.direction, True, 0.0), delta, base_mean)
+            result.metrics.append(
+                MetricComparison(
+                    model=model,
+                    metric=name,
+                    pairs=int(differences.size),
+                    baseline=base_mean,
+                    candidate=float(after.mean()),
+                    delta=delta,
+                    relative_pct=relative,
+                    ci=ci,
+                    p_value=p_value,
+                    noise=noise,
+                    threshold=rule.threshold,
+                    verdict=_verdict(rule, magnitude, p_value, alpha, noise),
+                )
+            )
+    return result
+
+
+def _noise(
+    baseline: RunOutputs,
+    history: List[RunOutputs],
+    model: str,
+    metric: str,
+    rule: MetricRule,
+) -> Optional[float]:
+    """Largest mean change between the baseline and an earlier run, in threshold units."""
+    changes = []
+    for run in history:
+        before, after = _paired(run.metrics, baseline.metrics, model, metric)
+        if before.size == 0:
+            continue
+        magnitude = _magnitude(rule, float((after - before).mean()), float(before.mean()))
+        if magnitude is not None:
+            changes.append(abs(magnitude))
+    return max(changes) if changes else None
+
+
+def _verdict(
+    rule: MetricRule,
+    magnitude: Optional[float],
+    p_value: float,
+    alpha: float,
+    noise: Optional[float],
+) -> str:
+    if magnitude is None or p_value >= alpha:
+        return UNCHANGED
+    if abs(magnitude) <= max(rule.threshold, noise or 0.0):
+        return UNCHANGED
+    if rule.direction == "either":
+        return REGRESSION
+    worse = magnitude > 0 if rule.direction == "lower" else magnitude < 0
+    return REGRESSION if worse else IMPROVEMENT
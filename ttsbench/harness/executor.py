@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ttsbench.harness.jobs import SynthJob
+from ttsbench.harness.scoring import ScoreItem, Scorer, ScoringConfig, init_worker, score_in_worker
+from ttsbench.models.base import BaseTTSModel, SynthResult
+from ttsbench.models.pool import ModelPool
+from ttsbench.models.registry import get_model
+from ttsbench.utils.audio import AudioArtifact, AudioPersister
+from ttsbench.utils.audio_store import PackedAudioStore, pack_reference
+from ttsbench.utils.resources import measure_resources
+from ttsbench.utils.synth_cache import SynthCache, synth_cache_key
+from ttsbench.utils.timing import synth_streamed
+from ttsbench.utils.tracing import SpanRecord, get_tracer, span
+
+logger = logging.getLogger(__name__)
+
+ScoredBatch = Tuple[List[Dict[str, float]], List[SpanRecord]]
+# A WAV file, or a ``pack:`` reference into the run's packed audio store.
+AudioRef = Union[Path, str]
+Persister = Union[AudioPersister, PackedAudioStore]
+
+
+@dataclass
+class SynthOutput:
+    job: SynthJob
+    audio_path: Optional[AudioRef]
+    samples: np.ndarray
+    sample_rate: int
+    timings: Dict[str, float]
+    # Timings of each measured trial (warm-up excluded); empty when nothing was synthesized.
+    trials: List[Dict[str, float]] = field(default_factory=list)
+    # Set when the model raised; such outputs carry no audio and are not scored.
+    error: Optional[str] = None
+
+
+@dataclass
+class ScoredOutput:
+    job: SynthJob
+    audio_path: Optional[AudioRef]
+    sample_rate: int
+    metrics: Dict[str, float]
+    trials: List[Dict[str, float]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def parse_worker_counts(spec: str) -> Tuple[int, Dict[str, int]]:
+    """Parse ``"2"`` or ``"piper=4,coqui_xtts_v2=1"`` (optionally with a bare default)."""
+    default = 1
+    per_model: Dict[str, int] = {}
+    for part in (piece.strip() for piece in spec.split(",")):
+        if not part:
+            continue
+        if "=" in part:
+            name, count = part.split("=", 1)
+            per_model[name.strip()] = max(1, int(count))
+        else:
+            default = max(1, int(part))
+    return default, per_model
+
+
+def median_timings(trials: List[Dict[str, float]]) -> Dict[str, float]:
+    """Per-key median over trials; a single trial is returned unchanged."""
+    if len(trials) == 1:
+        return dict(trials[0])
+    names = dict.fromkeys(name for timings in trials for name in timings)
+    return {
+        name: float(np.median([timings[name] for timings in trials if name in timings]))
+        for name in names
+    }
+
+
+def persist_result(
+    result: SynthResult,
+    output_path: Path,
+    persister: Optional[Persister],
+    on_written: Optional[Callable[[Path], None]] = None,
+) -> Optional[AudioRef]:
+    """Queue an in-memory result for writing; plugins that wrote their own file keep that path."""
+    samples = result.samples()
+    if samples is None:
+        if on_written is not None and result.audio_path is not None:
+            on_written(result.audio_path)
+        return result.audio_path
+    if persister is None:
+        return None
+    if on_written is None:
+        return persister.submit(output_path, samples, result.sample_rate)
+    return persister.submit(output_path, samples, result.sample_rate, on_written)
+
+
+class PipelineExecutor:
+    """Runs synthesis and scoring as two overlapping stages.
+
+    Synthesis runs on per-model thread pools, with each thread holding its own model replica
+    from the ``ModelPool``. Finished outputs are grouped into batches and scored on a process
+    pool, since audio metrics and whisper are CPU-bound. Both stages have bounded in-flight
+    queues, so memory stays flat. Results are yielded in job order regardless of which worker
+    finishes first.
+
+    With a ``SynthCache``, jobs whose inputs were synthesized before (in any run) reuse that
+    audio instead of calling the model. Such outputs carry ``cache_hit=1`` and no timings, so
+    they never enter latency statistics.
+
+    With ``trials > 1`` each job is synthesized ``warmup`` extra times untimed and then
+    ``trials`` times; per-trial timings are kept, the output's timings are their medians, and
+    the last trial's audio is scored once. Trial runs bypass cache lookups, since they exist
+    to measure the model.
+
+    A job whose model raises yields an output with ``error`` set instead of ending the run.
+    """
+
+    def __init__(
+        self,
+        pool: ModelPool,
+        config: Dict[str, Any],
+        run_dir: Path,
+        scoring: ScoringConfig,
+        persister: Optional[Persister] = None,
+        stream: bool = True,
+        synth_workers: int = 1,
+        model_synth_workers: Optional[Dict[str, int]] = None,
+        score_workers: int = 1,
+        batch_size: int = 8,
+        queue_size: int = 32,
+        cache: Optional[SynthCache] = None,
+        seed: int = 0,
+        trials: int = 1,
+        warmup: int = 0,
+    ) -> None:
+        self.pool = pool
+        self.config = config
+        self.run_dir = run_dir
+        self.scoring = scoring
+        self.persister = persister
+        self.stream = stream
+        self.synth_workers = synth_workers
+        self.model_synth_workers = model_synth_workers or {}
+        self.score_workers = score_workers
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+        self.cache = cache
+        self.seed = seed
+        self.trials = max(1, trials)
+        self.warmup = max(0, warmup)
+        self._synth_executors: Dict[str, ThreadPoolExecutor] = {}
+        self._replicas: Dict[str, int] = {}
+        self._replica_lock = threading.Lock()
+        self._local = threading.local()
+
+    def synthesize(self, jobs: Iterable[SynthJob]) -> Iterator[SynthOutput]:
+        """Synthesis stage on its own, yielding outputs in job order."""
+        pending: Deque[Future[SynthOutput]] = deque()
+        try:
+            for job in jobs:
+                pending.append(self._executor_for(job.model).submit(self._synth, job))
+                while len(pending) >= self.queue_size:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            for executor in self._synth_executors.values():
+                executor.shutdown(wait=True, cancel_futures=True)
+            self._synth_executors.clear()
+
+    def run(self, jobs: Iterable[SynthJob]) -> Iterator[ScoredOutput]:
+        score_pending: Deque[Tuple[List[SynthOutput], Future[ScoredBatch]]] = deque()
+        batch: List[SynthOutput] = []
+        score_pool = self._start_scoring()
+        local_scorer = Scorer(self.scoring) if score_pool is None else None
+        max_score_pending = max(1, self.score_workers) * 2
+
+        def submit_batch() -> None:
+            items = [
+                ScoreItem(
+                    out.samples,
+                    out.sample_rate,
+                    out.job.text,
+                    out.job.language,
+                    out.timings,
+                    model=out.job.model,
+                )
+                for out in batch
+                if out.error is None
+            ]
+            if score_pool is not None:
+                future = score_pool.submit(score_in_worker, items)
+            else:
+                future = Future()
+                future.set_result((local_scorer.score(items), []))
+            score_pending.append((list(batch), future))
+            batch.clear()
+
+        def drain_scores(limit: int) -> Iterator[ScoredOutput]:
+            while len(score_pending) > limit:
+                outputs, future = score_pending.popleft()
+                batch_scores, spans = future.result()
+                tracer = get_tracer()
+                if tracer is not None:
+                    tracer.extend(spans)
+                scores = iter(batch_scores)
+                for out in outputs:
+                    metrics = next(scores) if out.error is None else {}
+                    yield ScoredOutput(
+                        out.job, out.audio_path, out.sample_rate, metrics, out.trials, out.error
+                    )
+
+        synthesized = self.synthesize(jobs)
+        try:
+            for output in synthesized:
+                batch.append(output)
+                if len(batch) >= self.batch_size:
+                    submit_batch()
+                    yield from drain_scores(max_score_pending)
+            if batch:
+                submit_batch()
+            yield from drain_scores(0)
+        finally:
+            synthesized.close()
+            if score_pool is not None:
+                score_pool.shutdown(wait=True, cancel_futures=True)
+
+    def _start_scoring(self) -> Optional[Executor]:
+        if self.score_workers <= 0:
+            return None
+        # Spawned workers stay clear of locks held by the synthesis threads at fork time.
+        return ProcessPoolExecutor(
+            max_workers=self.score_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(self.scoring,),
+        )
+
+    def _executor_for(self, model: str) -> ThreadPoolExecutor:
+        if model not in self._synth_executors:
+            workers = self.model_synth_workers.get(model, self.synth_workers)
+            self._synth_executors[model] = ThreadPoolExecutor(
+                max_workers=max(1, workers), thread_name_prefix=f"synth-{model}"
+            )
+        return self._synth_executors[model]
+
+    def _model_for_thread(self, name: str) -> BaseTTSModel:
+        models: Dict[str, BaseTTSModel] = getattr(self._local, "models", {})
+        if name not in models:
+            with self._replica_lock:
+                replica = self._replicas.get(name, 0)
+                self._replicas[name] = replica + 1
+            models[name] = self.pool.acquire(name, self.config, replica=replica).model
+            self._local.models = models
+        return models[name]
+
+    def _synth(self, job: SynthJob) -> SynthOutput:
+        output_path = self.run_dir / job.model / job.prompt_id / job.style / "audio.wav"
+        if isinstance(self.persister, PackedAudioStore):
+            packed = self.persister.get(output_path)
+            if packed is not None:
+                logger.info("Skipping existing output", extra={"path": str(output_path)})
+                audio_ref = pack_reference(self.run_dir, output_path)
+                return SynthOutput(job, audio_ref, packed.samples, packed.sample_rate, {})
+        elif output_path.exists():
+            logger.info("Skipping existing output", extra={"path": str(output_path)})
+            artifact = AudioArtifact.from_path(output_path)
+            return SynthOutput(job, output_path, artifact.samples, artifact.sample_rate, {})
+
+        config = dict(self.config, style=job.style, language=job.language)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = synth_cache_key(
+                get_model(job.model), config, job.text, job.style, job.language, self.seed
+            )
+            if self.trials == 1:
+                hit = self._cached_output(self.cache, job, cache_key, output_path)
+                if hit is not None:
+                    return hit
+
+        model = self._model_for_thread(job.model)
+        trials = []
+        try:
+            for _ in range(self.warmup):
+                self._synth_once(model, job, config, output_path)
+            for _ in range(self.trials):
+                result = self._synth_once(model, job, config, output_path)
+                trials.append(dict(result.timings))
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            logger.warning("Synthesis failed", extra={"job": "/".join(job.key), "error": error})
+            return SynthOutput(job, None, np.zeros(0, dtype=np.float32), 0, {}, error=error)
+        samples = result.samples()
+        if samples is None:
+            samples = AudioArtifact.from_path(result.audio_path).samples
+        timings = median_timings(trials)
+        on_written = None
+        writes_files = self.persister is None or self.persister.writes_files
+        if cache_key is not None:
+            timings["cache_hit"] = 0.0
+            if writes_files:
+                # The cache takes over the written WAV instead of encoding its own copy.
+                on_written = partial(self.cache.adopt, cache_key, job.model, result.sample_rate)
+        audio_path = persist_result(result, output_path, self.persister, on_written)
+        if cache_key is not None and (audio_path is None or not writes_files):
+            self.cache.put(cache_key, job.model, samples, result.sample_rate)
+        return SynthOutput(job, audio_path, samples, result.sample_rate, timings, trials)
+
+    def _cached_output(
+        self, cache: SynthCache, job: SynthJob, cache_key: str, output_path: Path
+    ) -> Optional[SynthOutput]:
+        """The cached synthesis placed at ``output_path``, or None to synthesize instead."""
+        with span("cache_lookup", model=job.model):
+            cached = cache.get(cache_key)
+        if cached is None:
+            return None
+        audio_path: Optional[AudioRef] = None
+        if isinstance(self.persister, PackedAudioStore):
+            audio_path = self.persister.submit(output_path, cached.samples, cached.sample_rate)
+        elif self.persister is not None:
+            # The shared cache may be pruned by another process between ``get`` and the link.
+            audio_path = cache.link_into(cache_key, output_path)
+            if audio_path is None:
+                return None
+        return SynthOutput(job, audio_path, cached.samples, cached.sample_rate, {"cache_hit": 1.0})
+
+    def _synth_once(
+        self, model: BaseTTSModel, job: SynthJob, config: Dict[str, Any], output_path: Path
+    ) -> SynthResult:
+        """One model call; its timings also carry the call's resource usage and plugin stats."""
+        with span("synth", model=job.model), measure_resources() as usage:
+            if self.stream and model.can_stream(config):
+                result = synth_streamed(model, job.text, config)
+            else:
+                result = model.synth(text=job.text, config=config, out_dir=output_path.parent)
+        return replace(result, timings={**result.timings, **usage, **result.stats})
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import hashlib
+import zlib
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from ttsbench.models.base import ANY_LANGUAGE, ModelCapabilities
+from ttsbench.models.registry import get_model
+from ttsbench.utils.prompts import PromptItem, PromptSet, normalize_prompt
+
+# Why a requested (model, prompt, style) combination is not synthesized.
+SKIP_COLLAPSED = "collapsed"
+SKIP_LANGUAGE = "unsupported_language"
+SKIP_UNAVAILABLE = "unavailable"
+# Planned, but synthesis raised.
+SKIP_FAILED = "failed"
+# Planned on a shard that stopped before reaching it; recorded by ``ttsbench merge``.
+SKIP_MISSING = "missing"
+# Names of the parts of ``SynthJob.key``.
+JOB_FIELDS = ("model", "prompt_id", "style")
+# Prompts read from a corpus per planning step.
+PROMPT_BATCH = 512
+
+
+@dataclass(frozen=True)
+class SynthJob:
+    index: int
+    model: str
+    prompt_id: str
+    style: str
+    text: str
+    language: str
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return (self.model, self.prompt_id, self.style)
+
+
+@dataclass(frozen=True)
+class SkippedJob:
+    model: str
+    prompt_id: str
+    style: str
+    language: str
+    kind: str
+    reason: str
+
+
+@dataclass
+class JobPlan:
+    """The work list for a run, decided before any model is loaded."""
+
+    jobs: List[SynthJob] = field(default_factory=list)
+    skipped: List[SkippedJob] = field(default_factory=list)
+
+    @property
+    def requested(self) -> int:
+        return len(self.jobs) + len(self.skipped)
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Per model: planned jobs and skipped combinations by kind."""
+        counts: Dict[str, Counter] = defaultdict(Counter)
+        for job in self.jobs:
+            counts[job.model]["jobs"] += 1
+        for skipped in self.skipped:
+            counts[skipped.model][skipped.kind] += 1
+        return {model: dict(counter) for model, counter in counts.items()}
+
+    def models(self) -> List[str]:
+        return list(dict.fromkeys(job.model for job in self.jobs))
+
+
+class JobPlanner:
+    """``plan_jobs`` in increments, for prompt corpora too large to hold in memory.
+
+    Each ``plan`` call takes one batch of prompts and yields its jobs and skipped combinations
+    as they are decided. Between batches only the collapse index is kept, shared by all
+    models: 8-byte hashes of distinct texts mapped to the prompt that owns them, so
+    duplicates still collapse across the whole corpus. With a ``shard`` only the combinations
+    assigned to it are yielded, but every prompt is still planned, so all shards agree on
+    which combinations collapse.
+    """
+
+    def __init__(
+        self,
+        models: Iterable[str],
+        styles: Sequence[str],
+        available: Optional[Iterable[str]] = None,
+        shard: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        available_models = set(available) if available is not None else None
+        self.styles = list(styles)
+        self.shard = shard
+        self._models: List[Tuple[str, ModelCapabilities, bool]] = []
+        for model in models:
+            model_cls = get_model(model)
+            if available_models is not None:
+                is_available = model in available_models
+            else:
+                is_available = model_cls.is_available()
+            self._models.append((model, model_cls.capabilities, is_available))
+        # First prompt (id, explicit style) per (text, language). When it has no explicit
+        # style it owns that text in every configured style, so unique texts cost one entry.
+        self._texts: Dict[int, Tuple[str, Optional[str]]] = {}
+        # Owners of (text, language, style) for everything else.
+        self._styled: Dict[int, str] = {}
+        self._counts: Dict[str, Counter] = defaultdict(Counter)
+        self._next_index = 0
+
+    def runnable(self, languages: Iterable[str]) -> List[str]:
+        """Models that get at least one job from prompts in ``languages``."""
+        languages = set(languages)
+        return [
+            model
+            for model, capabilities, is_available in self._models
+            if is_available
+            and languages
+            and (ANY_LANGUAGE in capabilities.languages or languages & set(capabilities.languages))
+        ]
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """``JobPlan.summary`` over everything planned so far."""
+        return {model: dict(counter) for model, counter in self._counts.items()}
+
+    def plan(self, prompts: Sequence[PromptItem]) -> Iterator[Union[SynthJob, SkippedJob]]:
+        """Expand one batch, model by model, in the same order ``plan_jobs`` uses."""
+        expanded = []
+        for prompt in prompts:
+            styles = [prompt.style] if prompt.style else self.styles
+            if not styles:
+                continue
+            text = normalize_prompt(prompt.text)
+            text_key = f"{text}\0{prompt.language}"
+            first_id, first_style = self._texts.setdefault(
+                _digest(text_key), (prompt.id, prompt.style)
+            )
+            styleless_owner = (first_id, first_style or self.styles[0])
+            for style in styles:
+                if first_style is None and style in self.styles:
+                    styled_owner = (first_id, style)
+                else:
+                    key = _digest(f"{text_key}\0{style}")
+                    styled_owner = (self._styled.setdefault(key, prompt.id), style)
+                expanded.append((prompt, text, style, styled_owner, styleless_owner))
+        for model, capabilities, is_available in self._models:
+            languages = set(capabilities.languages)
+            any_language = ANY_LANGUAGE in languages
+            counts = self._counts[model]
+            for prompt, text, style, styled_owner, styleless_owner in expanded:
+                if self.shard is not None and not in_shard(
+                    f"{model}/{prompt.id}/{style}", self.shard
+                ):
+                    continue
+                owner = styled_owner if capabilities.supports_styles else styleless_owner
+                if not is_available:
+                    kind, reason = SKIP_UNAVAILABLE, f"{model} is not available"
+                elif not any_language and prompt.language not in languages:
+                    kind = SKIP_LANGUAGE
+                    reason = f"{model} does not support language '{prompt.language}'"
+                elif owner == (prompt.id, style):
+                    counts["jobs"] += 1
+                    yield SynthJob(
+                        index=self._next_index,
+                        model=model,
+                        prompt_id=prompt.id,
+                        style=style,
+                        text=text,
+                        language=prompt.language,
+                    )
+                    self._next_index += 1
+                    continue
+                else:
+                    kind = SKIP_COLLAPSED
+                    reason = f"same output as {model}/{owner[0]}/{owner[1]}"
+                counts[kind] += 1
+                yield SkippedJob(model, prompt.id, style, prompt.language, kind, reason)
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """``"i/N"`` (1-based) to ``(i - 1, N)``."""
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"shard must look like 'i/N', got {spec!r}") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"shard index must be between 1 and N, got {spec!r}")
+    return index - 1, count
+
+
+def shard_label(shard: Tuple[int, int]) -> str:
+    return f"{shard[0] + 1}/{shard[1]}"
+
+
+def in_shard(key: str, shard: Tuple[int, int]) -> bool:
+    """Stable assignment by hash, so a job's shard never depends on order or on other jobs."""
+    index, count = shard
+    return zlib.crc32(key.encode("utf-8")) % count == index
+
+
+def _digest(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def prompt_batches(
+    prompts: Iterable[PromptItem], size: int = PROMPT_BATCH
+) -> Iterator[List[PromptItem]]:
+    iterator = iter(prompts)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def plan_jobs(
+    models: Iterable[str], prompt_set: PromptSet, available: Optional[Iterable[str]] = None
+) -> JobPlan:
+    """Expand prompts × styles per model, pruned by what each model can actually produce.
+
+    Models that ignore styles get one job per prompt instead of one per style, prompts with
+    identical text collapse into a single job, and languages outside
+    ``ModelCapabilities.languages`` are skipped. ``available`` defaults to each model's
+    ``is_available()``. Every combination that is not run is kept in ``skipped`` with a reason.
+    The whole prompt set is held in memory; stream large corpora through ``JobPlanner``.
+    """
+    plan = JobPlan()
+    planner = JobPlanner(models, prompt_set.config.styles, available)
+    for item in planner.plan(list(prompt_set.iter_prompts())):
+        if isinstance(item, SynthJob):
+            plan.jobs.append(item)
+        else:
+            plan.skipped.append(item)
+    return plan
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import logging
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from ttsbench.models.base import BaseTTSModel
+from ttsbench.models.pool import ModelPool
+from ttsbench.utils.prompts import PromptSet, normalize_prompt
+from ttsbench.utils.timing import synth_streamed
+
+logger = logging.getLogger(__name__)
+
+LOAD_MODES = ("closed", "poisson", "constant")
+
+
+@dataclass(frozen=True)
+class LoadRequest:
+    index: int
+    prompt_id: str
+    text: str
+    language: str
+    style: str
+
+
+@dataclass
+class RequestRecord:
+    """One request's timeline, in seconds from the start of its load level."""
+
+    level: float
+    index: int
+    prompt_id: str
+    arrival_s: float
+    start_s: float
+    end_s: float
+    ok: bool
+    error: Optional[str] = None
+    ttfa_ms: Optional[float] = None
+
+    @property
+    def queue_s(self) -> float:
+        return self.start_s - self.arrival_s
+
+    @property
+    def service_s(self) -> float:
+        return self.end_s - self.start_s
+
+    @property
+    def latency_s(self) -> float:
+        return self.end_s - self.arrival_s
+
+
+@dataclass
+class LevelSummary:
+    mode: str
+    level: float
+    requests: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    latency_p50_s: float
+    latency_p95_s: float
+    latency_p99_s: float
+    queue_mean_s: float
+    queue_p95_s: float
+    service_mean_s: float
+    service_p95_s: float
+
+
+def draw_requests(prompt_set: PromptSet, count: int, rng: np.random.Generator) -> List[LoadRequest]:
+    """Sample ``count`` request texts from the prompt set, with replacement."""
+    prompts = list(prompt_set.iter_prompts())
+    if not prompts:
+        return []
+    requests = []
+    for index, choice in enumerate(rng.integers(0, len(prompts), size=count)):
+        prompt = prompts[int(choice)]
+        styles = [prompt.style] if prompt.style else prompt_set.config.styles
+        requests.append(
+            LoadRequest(
+                index=index,
+                prompt_id=prompt.id,
+                text=normalize_prompt(prompt.text),
+                language=prompt.language,
+                style=styles[0] if styles else "neutral",
+            )
+        )
+    return requests
+
+
+def arrival_times(mode: str, rate: float, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Open-loop arrival offsets in seconds: exponential gaps (Poisson) or a fixed period.
+
+    Both start at 0, so the first request is sent as soon as the level begins.
+    """
+    if rate <= 0:
+        raise ValueError("Open-loop load levels are request rates and must be positive.")
+    if mode == "poisson":
+        gaps = rng.exponential(1.0 / rate, size=count)
+        return np.concatenate([[0.0], np.cumsum(gaps[:-1])])[:count]
+    if mode == "constant":
+        return np.arange(count) / rate
+    raise ValueError(f"Unknown open-loop mode: {mode}")
+
+
+def summarize(mode: str, level: float, records: List[RequestRecord]) -> LevelSummary:
+    completed = [record for record in records if record.ok]
+    latency = np.array([record.latency_s for record in completed])
+    queued = np.array([record.queue_s for record in completed])
+    service = np.array([record.service_s for record in completed])
+    if not completed:
+        # Nothing completed, so the level's timings are unknown (NaN), not an ideal 0 s.
+        latency = queued = service = np.full(1, np.nan)
+    duration = 0.0
+    if records:
+        duration = max(r.end_s for r in records) - min(r.arrival_s for r in records)
+    p50, p95, p99 = np.percentile(latency, [50, 95, 99])
+    return LevelSummary(
+        mode=mode,
+        level=level,
+        requests=len(records),
+        errors=len(records) - len(completed),
+        duration_s=duration,
+        throughput_rps=len(completed) / duration if duration > 0 else 0.0,
+        latency_p50_s=float(p50),
+        latency_p95_s=float(p95),
+        latency_p99_s=float(p99),
+        queue_mean_s=float(queued.mean()),
+        queue_p95_s=float(np.percentile(queued, 95)),
+        service_mean_s=float(service.mean()),
+        service_p95_s=float(np.percentile(service, 95)),
+    )
+
+
+def saturation_point(summaries: List[LevelSummary]) -> Optional[LevelSummary]:
+    """The load level with the highest completed throughput."""
+    return max(summaries, key=lambda summary: summary.throughput_rps, default=None)
+
+
+class LoadTester:
+    """Serves synthesis requests from ``workers`` model replicas under simulated traffic.
+
+    The replicas stand in for a deployed service; requests wait in its queue until a replica
+    is free, so ``queue_s`` and ``service_s`` separate contention from model time. Open-loop
+    levels submit at precomputed arrival times regardless of backlog (arrival is the
+    scheduled time, so a slow dispatcher does not hide queueing); closed-loop levels run N
+    clients that each wait for their previous response.
+    """
+
+    def __init__(
+        self,
+        pool: ModelPool,
+        model: str,
+        config: Dict[str, Any],
+        workers: int = 1,
+        stream: bool = True,
+    ) -> None:
+        self.config = config
+        self.stream = stream
+        self.workers = max(1, workers)
+        self._replicas: "queue.Queue[BaseTTSModel]" = queue.Queue()
+        for replica in range(self.workers):
+            self._replicas.put(pool.acquire(model, config, replica=replica).model)
+        self._scratch = tempfile.TemporaryDirectory(prefix="ttsbench-loadtest-")
+
+    def close(self) -> None:
+        self._scratch.cleanup()
+
+    def __enter__(self) -> "LoadTester":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def run_level(
+        self,
+        mode: str,
+        level: float,
+        requests: List[LoadRequest],
+        rng: np.random.Generator,
+    ) -> List[RequestRecord]:
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="loadtest-server") as server:
+            origin = time.perf_counter()
+            if mode == "closed":
+                records = self._closed_loop(server, origin, level, requests)
+            else:
+                records = self._open_loop(server, origin, mode, level, requests, rng)
+        records.sort(key=lambda record: record.index)
+        logger.info("Load level complete", extra={"mode": mode, "level": level})
+        return records
+
+    def _open_loop(
+        self,
+        server: ThreadPoolExecutor,
+        origin: float,
+        mode: str,
+        rate: float,
+        requests: List[LoadRequest],
+        rng: np.random.Generator,
+    ) -> List[RequestRecord]:
+        futures: List[Future[RequestRecord]] = []
+        for request, offset in zip(requests, arrival_times(mode, rate, len(requests), rng)):
+            delay = origin + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(server.submit(self._serve, request, rate, origin, float(offset)))
+        return [future.result() for future in futures]
+
+    def _closed_loop(
+        self,
+        server: ThreadPoolExecutor,
+        origin: float,
+        clients: float,
+        requests: List[LoadRequest],
+    ) -> List[RequestRecord]:
+        pending: Iterator[LoadRequest] = iter(requests)
+        lock = threading.Lock()
+        records: List[RequestRecord] = []
+
+        def client() -> None:
+            while True:
+                with lock:
+                    request = next(pending, None)
+                if request is None:
+                    return
+                arrival = time.perf_counter() - origin
+                record = server.submit(self._serve, request, clients, origin, arrival).result()
+                with lock:
+                    records.append(record)
+
+        with ThreadPoolExecutor(max(1, int(clients)), thread_name_prefix="loadtest-client") as pool:
+            for future in [pool.submit(client) for _ in range(max(1, int(clients)))]:
+                future.result()
+        return records
+
+    def _serve(
+        self, request: LoadRequest, level: float, origin: float, arrival_s: float
+    ) -> RequestRecord:
+        model = self._replicas.get()
+        start = time.perf_counter()
+        error: Optional[str] = None
+        ttfa_ms: Optional[float] = None
+        try:
+            config = dict(self.config, style=request.style, language=request.language)
+            if self.stream and model.can_stream(config):
+                result = synth_streamed(model, request.text, config)
+            else:
+                result = model.synth(request.text, config, Path(self._scratch.name))
+            ttfa_ms = result.timings.get("time_to_first_audio_ms")
+        except Exception as exc:  # a failed request is a data point, not a crash
+            error = f"{type(exc).__name__}: {exc}"
+        finally:
+            end = time.perf_counter()
+            self._replicas.put(model)
+        start_s = start - origin
+        if ttfa_ms is not None:
+            ttfa_ms += (start_s - arrival_s) * 1000.0
+        return RequestRecord(
+            level=level,
+            index=request.index,
+            prompt_id=request.prompt_id,
+            arrival_s=arrival_s,
+            start_s=start_s,
+            end_s=end - origin,
+            ok=error is None,
+            error=error,
+            ttfa_ms=ttfa_ms,
+        )
+
+
+def record_payload(record: RequestRecord) -> Dict[str, Any]:
+    payload = asdict(record)
+    payload.update(
+        queue_s=record.queue_s, service_s=record.service_s, latency_s=record.latency_s
+    )
+    return payload
@@ -0,0 +1,416 @@
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import sqlite3
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from ttsbench.harness.jobs import JOB_FIELDS, SKIP_FAILED, SKIP_MISSING, parse_shard
+from ttsbench.utils.audio_store import (
+    INDEX_FILE,
+    PACK_FILE,
+    PACK_SCHEME,
+    PackedAudioStore,
+    PackedRef,
+    audio_exists,
+    close_packs,
+    open_pack,
+    resolve_audio,
+)
+from ttsbench.utils.report import write_report_from_stream
+from ttsbench.utils.results import ResultsWriter, RunInfo
+from ttsbench.utils.results_stream import (
+    RESULTS_STREAM,
+    ResultsStream,
+    read_results_stream,
+    write_results_json,
+)
+
+logger = logging.getLogger(__name__)
+
+JobKey = Tuple[str, str, str]
+
+
+class MergeError(ValueError):
+    """Shard directories that cannot be combined into one run."""
+
+
+@dataclass
+class ShardRun:
+    path: Path
+    run: Dict[str, Any]
+    index: int
+    count: int
+    # Jobs in the shard's manifest, and those that produced an output or failed.
+    planned: Set[JobKey] = field(default_factory=set)
+    finished: Set[JobKey] = field(default_factory=set)
+
+    @property
+    def label(self) -> str:
+        return f"{self.index + 1}/{self.count}"
+
+
+@dataclass
+class MergeSummary:
+    run_dir: Path
+    shards: int
+    outputs: int
+    missing_shards: List[str]
+    missing_jobs: List[JobKey]
+    duplicate_jobs: List[JobKey]
+
+
+def _key(record: Dict[str, Any]) -> JobKey:
+    return (record["model"], record["prompt_id"], record["style"])
+
+
+def read_shard(path: Path) -> ShardRun:
+    """The run record and job manifest of one ``benchmark --shard`` directory."""
+    stream_path = path / RESULTS_STREAM
+    if not stream_path.exists():
+        raise MergeError(f"{path} has no {RESULTS_STREAM}")
+    shard: Optional[ShardRun] = None
+    for kind, record in read_results_stream(stream_path):
+        if kind == "run":
+            if "shard" not in record:
+                raise MergeError(f"{path} was not run with --shard")
+            index, count = parse_shard(record["shard"])
+            shard = ShardRun(path, record, index, count)
+        elif shard is None:
+            break
+        elif kind == "job":
+            shard.planned.add(_key(record))
+        elif kind == "output" or (kind == "skipped" and record["kind"] == SKIP_FAILED):
+            shard.finished.add(_key(record))
+    if shard is None:
+        raise MergeError(f"{path}: {RESULTS_STREAM} has no run record")
+    return shard
+
+
+def check_shards(shards: Sequence[ShardRun]) -> Tuple[List[str], List[JobKey], List[JobKey]]:
+    """Missing shard labels, unfinished jobs and jobs present in more than one shard."""
+    run_ids = {shard.run["run_id"] for shard in shards}
+    if len(run_ids) > 1:
+        raise MergeError(f"shards belong to different runs: {', '.join(sorted(run_ids))}")
+    counts = {shard.count for shard in shards}
+    if len(counts) > 1:
+        raise MergeError(f"shards were split different ways: {sorted(counts)}")
+    (count,) = counts
+    present = {shard.index for shard in shards}
+    missing_shards = [f"{index + 1}/{count}" for index in range(count) if index not in present]
+    seen: Counter = Counter()
+    missing_jobs: List[JobKey] = []
+    for shard in shards:
+        seen.update(shard.planned | shard.finished)
+        missing_jobs.extend(sorted(shard.planned - shard.finished))
+    duplicates = sorted(key for key, times in seen.items() if times > 1)
+    return missing_shards, missing_jobs, duplicates
+
+
+def merge_shards(
+    shard_dirs: Sequence[Path], out: Path, allow_missing: bool = False
+) -> MergeSummary:
+    """Combine the directories of one sharded run into ``out/<run_id>``.
+
+    The job manifest each shard streams is checked first: jobs claimed by two shards always
+    stop the merge, and missing shards or unfinished jobs do unless ``allow_missing``, in which
+    case known missing jobs are recorded as skipped. ``results.jsonl`` and audio are then copied
+    (hard-linked where possible) in shard order, ``results.sqlite`` is merged with its ids
+    remapped, and ``results.json`` and the report are written once from the merged stream.
+    """
+    if not shard_dirs:
+        raise MergeError("no shard directories given")
+    shards = sorted((read_shard(path) for path in shard_dirs), key=lambda shard: shard.index)
+    missing_shards, missing_jobs, duplicates = check_shards(shards)
+    if duplicates:
+        shown = ", ".join("/".join(key) for key in duplicates[:5])
+        raise MergeError(f"{len(duplicates)} jobs appear in more than one shard: {shown}")
+    if (missing_shards or missing_jobs) and not allow_missing:
+        raise MergeError(
+            f"incomplete run: missing shards [{', '.join(missing_shards)}], "
+            f"{len(missing_jobs)} unfinished jobs (pass --allow-missing to merge anyway)"
+        )
+    run_id = shards[0].run["run_id"]
+    run_dir = out / run_id
+    if any(run_dir.resolve() == shard.path.resolve() for shard in shards):
+        raise MergeError(f"{run_dir} is one of the shards; merge into another directory")
+    run_dir.mkdir(parents=True, exist_ok=True)
+    # A repeated merge rebuilds the packed audio instead of appending a second copy.
+    for name in (PACK_FILE, INDEX_FILE):
+        (run_dir / name).unlink(missing_ok=True)
+
+    unplaced: Set[JobKey] = set()
+    outputs = _merge_stream(shards, run_dir, missing_shards, unplaced)
+    _merge_sqlite(shards, run_dir, missing_jobs, unplaced)
+    write_results_json(run_dir / RESULTS_STREAM, run_dir / "results.json")
+    write_report_from_stream(run_dir / "report.md", run_dir / RESULTS_STREAM)
+    return MergeSummary(
+        run_dir=run_dir,
+        shards=len(shards),
+        outputs=outputs,
+        missing_shards=missing_shards,
+        missing_jobs=missing_jobs,
+        duplicate_jobs=duplicates,
+    )
+
+
+def _audio_path(run_dir: Path, key: JobKey) -> Path:
+    model, prompt_id, style = key
+    return run_dir / model / prompt_id / style / "audio.wav"
+
+
+def _place(source: Path, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if target.exists():
+        target.unlink()
+    try:
+        os.link(source.resolve(), target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def _missing_record(key: JobKey, language: Optional[str], shard: ShardRun) -> Dict[str, Any]:
+    return dict(
+        zip(JOB_FIELDS, key),
+        language=language,
+        kind=SKIP_MISSING,
+        reason=f"shard {shard.label} did not finish",
+    )
+
+
+def _merge_stream(
+    shards: Sequence[ShardRun],
+    run_dir: Path,
+    missing_shards: List[str],
+    unplaced: Set[JobKey],
+) -> int:
+    """Write the merged ``results.jsonl`` and bring each output's audio into ``run_dir``.
+
+    WAV files are linked into the run's layout; packed entries are appended to the merged
+    run's pack, so their ``pack:`` references stay as they are.
+    """
+    models: Dict[str, Dict[str, Any]] = {}
+    phases: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for shard in shards:
+        for kind, record in read_results_stream(shard.path / RESULTS_STREAM):
+            if kind == "model":
+                merged = models.setdefault(record["name"], dict(record))
+                merged["available"] = merged["available"] or record["available"]
+                if merged.get("load_time_s") is None:
+                    merged["load_time_s"] = record.get("load_time_s")
+            elif kind == "phase":
+                total = phases.setdefault(
+                    (record["model"], record["phase"]), dict(record, calls=0, total_s=0.0)
+                )
+                total["calls"] += record["calls"]
+                total["total_s"] += record["total_s"]
+
+    first = shards[0].run
+    run_record: Dict[str, Any] = {
+        "run_id": first["run_id"],
+        "created_at": min(shard.run["created_at"] for shard in shards),
+        "prompts_path": first.get("prompts_path"),
+        "seed": first.get("seed"),
+        "shards": shards[0].count,
+    }
+    if missing_shards:
+        run_record["missing_shards"] = missing_shards
+    languages: Dict[str, str] = {}
+    outputs = 0
+    pack: Optional[PackedAudioStore] = None
+    with ResultsStream(run_dir / RESULTS_STREAM) as stream:
+        stream.write("run", run_record)
+        stream.write_many("model", models.values())
+        for shard in shards:
+            for kind, record in read_results_stream(shard.path / RESULTS_STREAM):
+                if kind == "prompt" and record["id"] not in languages:
+                    languages[record["id"]] = record.get("language")
+                    stream.write("prompt", record)
+                elif kind == "skipped":
+                    stream.write("skipped", record)
+                elif kind == "output":
+                    key = _key(record)
+                    if record.get("audio_path"):
+                        source = resolve_audio(shard.path, record["audio_path"])
+                        if not audio_exists(source):
+                            source = None
+                        if isinstance(source, PackedRef):
+                            pack = pack or PackedAudioStore(run_dir)
+                            pack.copy_from(open_pack(source.run_dir), source.key)
+                        elif source is not None:
+                            target = _audio_path(run_dir, key)
+                            _place(source, target)
+                            record["audio_path"] = str(target)
+                        else:
+                            logger.warning(
+                                "Audio not found", extra={"path": record["audio_path"]}
+                            )
+                            unplaced.add(key)
+                    stream.write("output", record)
+                    outputs += 1
+            stream.write_many(
+                "skipped",
+                (
+                    _missing_record(key, languages.get(key[1]), shard)
+                    for key in sorted(shard.planned - shard.finished)
+                ),
+            )
+        stream.write_many("phase", sorted(phases.values(), key=lambda row: row["model"]))
+    if pack is not None:
+        pack.close()
+    # The shards' packs were only needed for the copy.
+    close_packs()
+    return outputs
+
+
+def _merge_sqlite(
+    shards: Sequence[ShardRun],
+    run_dir: Path,
+    missing_jobs: List[JobKey],
+    unplaced: Set[JobKey],
+) -> None:
+    """Copy every shard's rows into one ``results.sqlite`` with fresh ids.
+
+    Models and prompts are matched by name and prompt id. Output ids are shifted by the
+    current maximum, so metrics and trials keep pointing at their output.
+    """
+    first = shards[0].run
+    path = run_dir / "results.sqlite"
+    writer = ResultsWriter(path)
+    writer.write_run(
+        RunInfo(
+            run_id=first["run_id"],
+            created_at=datetime.fromisoformat(min(shard.run["created_at"] for shard in shards)),
+            prompts_path=first.get("prompts_path") or "",
+            seed=first.get("seed") or 0,
+            notes=f"merged from {len(shards)} of {shards[0].count} shards",
+        )
+    )
+    writer.engine.dispose()
+    run_id = first["run_id"]
+    connection = sqlite3.connect(path, isolation_level=None)
+    try:
+        for shard in shards:
+            connection.execute("ATTACH DATABASE ? AS shard", (str(shard.path / "results.sqlite"),))
+            try:
+                connection.execute("BEGIN")
+                _copy_shard(connection, run_id, run_dir, unplaced)
+                connection.execute("COMMIT")
+            finally:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                connection.execute("DETACH DATABASE shard")
+        languages = dict(
+            connection.execute(
+                "SELECT prompt_id, language FROM prompts WHERE run_id = ?", (run_id,)
+            )
+        )
+        shard_of = {key: shard for shard in shards for key in shard.planned - shard.finished}
+        connection.executemany(
+            "INSERT INTO skipped_jobs (run_id, model, prompt_id, style, language, kind, reason) "
+            "VALUES (:run_id, :model, :prompt_id, :style, :language, :kind, :reason)",
+            [
+                dict(_missing_record(key, languages.get(key[1]), shard_of[key]), run_id=run_id)
+                for key in missing_jobs
+            ],
+        )
+    finally:
+        connection.close()
+
+
+def _copy_shard(
+    connection: sqlite3.Connection, run_id: str, run_dir: Path, unplaced: Set[JobKey]
+) -> None:
+    params = {"run": run_id}
+    connection.execute(
+        """
+        INSERT INTO models (run_id, name, description, available, load_time_s)
+        SELECT :run, name, description, available, load_time_s FROM shard.models
+        WHERE run_id = :run AND name NOT IN (SELECT name FROM models WHERE run_id = :run)
+        """,
+        params,
+    )
+    connection.execute(
+        """
+        UPDATE models SET
+            available = available OR coalesce(
+                (SELECT max(s.available) FROM shard.models s
+                 WHERE s.run_id = :run AND s.name = models.name), 0),
+            load_time_s = coalesce(load_time_s,
+                (SELECT max(s.load_time_s) FROM shard.models s
+                 WHERE s.run_id = :run AND s.name = models.name))
+        WHERE run_id = :run
+        """,
+        params,
+    )
+    connection.execute(
+        """
+        INSERT INTO prompts (run_id, prompt_id, text, language, style)
+        SELECT :run, prompt_id, text, language, style FROM shard.prompts
+        WHERE run_id = :run
+          AND prompt_id NOT IN (SELECT prompt_id FROM prompts WHERE run_id = :run)
+        """,
+        params,
+    )
+    (offset,) = connection.execute("SELECT coalesce(max(id), 0) FROM outputs").fetchone()
+    params["offset"] = offset
+    connection.execute(
+        """
+        INSERT INTO outputs (id, run_id, model_id, prompt_id, audio_path, sample_rate, style)
+        SELECT o.id + :offset, :run, m.id, p.id, o.audio_path, o.sample_rate, o.style
+        FROM shard.outputs o
+        JOIN shard.models sm ON sm.id = o.model_id
+        JOIN models m ON m.run_id = :run AND m.name = sm.name
+        JOIN shard.prompts sp ON sp.id = o.prompt_id
+        JOIN prompts p ON p.run_id = :run AND p.prompt_id = sp.prompt_id
+        WHERE o.run_id = :run
+        """,
+        params,
+    )
+    connection.execute(
+        """
+        INSERT INTO metrics (output_id, name, value)
+        SELECT t.output_id + :offset, t.name, t.value
+        FROM shard.metrics t JOIN shard.outputs o ON o.id = t.output_id
+        WHERE o.run_id = :run
+        """,
+        params,
+    )
+    connection.execute(
+        """
+        INSERT INTO trials (output_id, trial, name, value)
+        SELECT t.output_id + :offset, t.trial, t.name, t.value
+        FROM shard.trials t JOIN shard.outputs o ON o.id = t.output_id
+        WHERE o.run_id = :run
+        """,
+        params,
+    )
+    connection.execute(
+        """
+        INSERT INTO skipped_jobs (run_id, model, prompt_id, style, language, kind, reason)
+        SELECT :run, model, prompt_id, style, language, kind, reason FROM shard.skipped_jobs
+        WHERE run_id = :run
+        """,
+        params,
+    )
+    rows = connection.execute(
+        """
+        SELECT o.id, m.name, p.prompt_id, o.style FROM outputs o
+        JOIN models m ON m.id = o.model_id JOIN prompts p ON p.id = o.prompt_id
+        WHERE o.id > :offset AND o.audio_path IS NOT NULL AND o.audio_path NOT LIKE :packed
+        """,
+        dict(params, packed=PACK_SCHEME + "%"),
+    ).fetchall()
+    connection.executemany(
+        "UPDATE outputs SET audio_path = ? WHERE id = ?",
+        [
+            (str(_audio_path(run_dir, (model, prompt_id, style))), output_id)
+            for output_id, model, prompt_id, style in rows
+            if (model, prompt_id, style) not in unplaced
+        ],
+    )
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import shutil
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import yaml
+
+from ttsbench.harness.benchmark import run_benchmark
+from ttsbench.models.plugins.synthetic import SyntheticModel
+from ttsbench.utils.prompts import PromptConfig, PromptItem, PromptSet
+
+OVERHEAD_SIZES = (10, 1_000, 100_000)
+OVERHEAD_PHASES = ("plan", "synth", "metrics", "audio_write", "db", "report")
+
+_WORDS = (
+    "the quick brown fox jumps over a lazy dog while seven bright voices read "
+    "numbers dates and names aloud for the benchmark"
+).split()
+
+
+def synthetic_prompt_set(count: int, seed: int = 0) -> PromptSet:
+    """``count`` distinct prompts of 3-12 words over two languages and three styles."""
+    rng = np.random.default_rng(seed)
+    prompts = []
+    for index in range(count):
+        words = rng.choice(_WORDS, size=int(rng.integers(3, 13)))
+        prompts.append(
+            PromptItem(
+                id=f"p{index:06d}",
+                text=f"{index} " + " ".join(words),
+                language="en" if index % 4 else "es",
+                style=("neutral", "fast", "slow")[index % 3],
+            )
+        )
+    return PromptSet(
+        config=PromptConfig(
+            sample_rate=8000,
+            # Short clips: the suite measures per-output cost, not per-second-of-audio cost.
+            model_options={
+                SyntheticModel.name: {"seed": seed, "chunk_ms": 0, "chars_per_second": 150}
+            },
+            prompts=prompts,
+        )
+    )
+
+
+@dataclass
+class OverheadResult:
+    prompts: int
+    outputs: int
+    phases: Dict[str, float]
+
+    @property
+    def total_s(self) -> float:
+        return sum(self.phases.values())
+
+    def per_output_us(self) -> Dict[str, float]:
+        outputs = max(1, self.outputs)
+        per_phase = {name: seconds * 1e6 / outputs for name, seconds in self.phases.items()}
+        per_phase["total"] = self.total_s * 1e6 / outputs
+        return per_phase
+
+    def payload(self) -> Dict[str, Any]:
+        return dict(asdict(self), total_s=self.total_s, per_output_us=self.per_output_us())
+
+
+# Tracer spans of a benchmark run, grouped into the suite's phases.
+_PHASE_SPANS = {
+    "plan": ("plan",),
+    "synth": ("synth", "cache_lookup", "model_load"),
+    "metrics": ("metrics.", "whisper."),
+    "audio_write": ("audio_write",),
+    "db": ("db_write",),
+    "report": ("results_json", "report"),
+}
+
+
+def _phase_of(span_name: str) -> Optional[str]:
+    for phase, prefixes in _PHASE_SPANS.items():
+        if any(
+            span_name.startswith(prefix) if prefix.endswith(".") else span_name == prefix
+            for prefix in prefixes
+        ):
+            return phase
+    return None
+
+
+def write_prompt_corpus(prompt_set: PromptSet, directory: Path) -> Path:
+    """Write ``prompt_set`` as a YAML config streaming its prompts from a JSONL source."""
+    directory.mkdir(parents=True, exist_ok=True)
+    with (directory / "prompts.jsonl").open("w", encoding="utf-8") as handle:
+        for prompt in prompt_set.config.prompts:
+            handle.write(json.dumps(prompt.model_dump()) + "\n")
+    config = prompt_set.config.model_dump(exclude={"prompts"}, exclude_none=True)
+    path = directory / "prompts.yaml"
+    path.write_text(yaml.safe_dump(dict(config, source="prompts.jsonl")))
+    return path
+
+
+def measure_overhead(count: int, work_dir: Path, keep_audio: bool = True) -> OverheadResult:
+    """Run ``count`` synthetic prompts through ``run_benchmark``, the ``benchmark`` command's path.
+
+    Prompts stream from a JSONL corpus and the run uses one synthesis thread and inline
+    scoring, so each phase's time is its own cost rather than overlap with the others. The
+    synthetic model returns instantly, which leaves ``synth`` as the executor's own per-job
+    overhead (plus generating the samples). Phase times are the run's tracer totals.
+    """
+    run_id = f"overhead-{count}"
+    # Leftover audio would be reused by the executor instead of synthesized.
+    shutil.rmtree(work_dir / run_id, ignore_errors=True)
+    prompts = write_prompt_corpus(synthetic_prompt_set(count), work_dir / f"{run_id}-prompts")
+    result = run_benchmark(
+        models=[SyntheticModel.name],
+        prompts=prompts,
+        out=work_dir,
+        run_id=run_id,
+        seed=0,
+        reference_voices=[],
+        keep_audio=keep_audio,
+        stream=False,
+        score_workers=0,
+    )
+    phases = dict.fromkeys(OVERHEAD_PHASES, 0.0)
+    for row in result.tracer.breakdown():
+        phase = _phase_of(row["phase"])
+        if phase is not None:
+            phases[phase] += row["total_s"]
+    return OverheadResult(prompts=count, outputs=result.outputs, phases=phases)
+
+
+def run_overhead_suite(
+    sizes: Sequence[int], work_dir: Path, keep_audio: bool = True
+) -> List[OverheadResult]:
+    return [measure_overhead(count, work_dir, keep_audio=keep_audio) for count in sizes]
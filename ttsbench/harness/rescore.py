@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Tuple
+
+from ttsbench.harness.scoring import (
+    Scorer,
+    ScoringConfig,
+    init_worker,
+    load_score_items,
+    score_files_in_worker,
+)
+from ttsbench.utils.audio_store import AudioSource, audio_exists, resolve_audio
+from ttsbench.utils.report import write_report, write_report_from_stream
+from ttsbench.utils.results import ResultsWriter
+from ttsbench.utils.results_stream import (
+    RESULTS_STREAM,
+    rewrite_results_stream,
+    write_results_json,
+)
+
+logger = logging.getLogger(__name__)
+
+Batch = List[Tuple[Dict[str, Any], Tuple[AudioSource, str, str]]]
+
+
+@dataclass
+class RescoreSummary:
+    scored: int
+    skipped: int
+
+
+def rescore_run(
+    run_dir: Path,
+    scoring: ScoringConfig,
+    score_workers: int = 1,
+    batch_size: int = 8,
+    flush_rows: int = 1000,
+) -> RescoreSummary:
+    """Recompute the selected metrics of an existing run and update it in place.
+
+    Outputs are read from ``results.sqlite``, decoded and scored on a process pool, and
+    written back in large transactions. ``results.jsonl`` (or, for runs that predate it,
+    ``results.json``) and ``report.md`` are then refreshed from the new values. Outputs without
+    stored audio (a WAV file or a packed entry) are left untouched.
+    """
+    writer = ResultsWriter(run_dir / "results.sqlite")
+    batch: Batch = []
+    batches: List[Batch] = []
+    skipped = 0
+    for row in writer.read_outputs():
+        source = resolve_audio(run_dir, row["audio_path"]) if row["audio_path"] else None
+        if source is None or not audio_exists(source):
+            skipped += 1
+            continue
+        batch.append((row, (source, row["text"], row["language"])))
+        if len(batch) >= batch_size:
+            batches.append(batch)
+            batch = []
+    if batch:
+        batches.append(batch)
+    if skipped:
+        logger.warning("Skipping outputs without audio", extra={"count": skipped})
+
+    by_path: Dict[str, Dict[str, float]] = {}
+    pending: Dict[int, Dict[str, float]] = {}
+    scored = 0
+    for rows, metrics in _score_batches(batches, scoring, score_workers):
+        for row, values in zip(rows, metrics):
+            pending[row["id"]] = values
+            by_path[row["audio_path"]] = values
+        scored += len(rows)
+        if len(pending) >= flush_rows:
+            writer.update_metrics(pending)
+            pending = {}
+    writer.update_metrics(pending)
+
+    stream_path = run_dir / RESULTS_STREAM
+    json_path = run_dir / "results.json"
+    if stream_path.exists():
+        rewrite_results_stream(stream_path, lambda kind, record: _patch(kind, record, by_path))
+        if json_path.exists():
+            write_results_json(stream_path, json_path)
+        write_report_from_stream(run_dir / "report.md", stream_path)
+    elif json_path.exists():
+        payload = json.loads(json_path.read_text())
+        for output in payload.get("outputs", []):
+            if output.get("audio_path") in by_path:
+                output["metrics"].update(by_path[output["audio_path"]])
+        writer.dump_json(json_path, payload)
+        write_report(run_dir / "report.md", payload)
+    else:
+        logger.warning("No results.json to refresh", extra={"run": str(run_dir)})
+    return RescoreSummary(scored=scored, skipped=skipped)
+
+
+def _patch(
+    kind: str, record: Dict[str, Any], by_path: Dict[str, Dict[str, float]]
+) -> Dict[str, Any]:
+    if kind == "output" and record.get("audio_path") in by_path:
+        record["metrics"].update(by_path[record["audio_path"]])
+    return record
+
+
+def _score_batches(
+    batches: List[Batch], scoring: ScoringConfig, score_workers: int
+) -> Iterator[Tuple[List[Dict[str, Any]], List[Dict[str, float]]]]:
+    if score_workers <= 0:
+        scorer = Scorer(scoring)
+        for batch in batches:
+            rows = [row for row, _ in batch]
+            yield rows, scorer.score(load_score_items([item for _, item in batch]))
+        return
+
+    pending: Deque[Tuple[List[Dict[str, Any]], Future[List[Dict[str, float]]]]] = deque()
+    with ProcessPoolExecutor(
+        max_workers=score_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(scoring,),
+    ) as pool:
+        for batch in batches:
+            files = [item for _, item in batch]
+            pending.append(([row for row, _ in batch], pool.submit(score_files_in_worker, files)))
+            # Keep every worker busy while bounding decoded audio held in flight.
+            while len(pending) >= score_workers * 2:
+                rows, future = pending.popleft()
+                yield rows, future.result()
+        while pending:
+            rows, future = pending.popleft()
+            yield rows, future.result()
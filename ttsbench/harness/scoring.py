@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ttsbench.metrics.asr_metrics import ASRConfig, ASREngine
+from ttsbench.metrics.audio_metrics import AudioMetrics
+from ttsbench.metrics.speaker_similarity import SpeakerEmbedder
+from ttsbench.utils.audio import AudioArtifact, audio_hash
+from ttsbench.utils.audio_store import AudioSource, load_audio
+from ttsbench.utils.metric_cache import MetricCache, metric_cache_key
+from ttsbench.utils.synth_cache import file_fingerprint
+from ttsbench.utils.tracing import (
+    SpanRecord,
+    Tracer,
+    get_tracer,
+    model_shares,
+    set_tracer,
+    span,
+)
+
+METRIC_GROUPS = ("audio", "asr", "speaker_similarity")
+
+
+@dataclass(frozen=True)
+class ScoringConfig:
+    asr: ASRConfig = field(default_factory=ASRConfig)
+    reference_voices: Tuple[Path, ...] = ()
+    # Shared metric cache database; ``None`` computes every metric.
+    metric_cache: Optional[Path] = None
+    # Metric groups to compute, a subset of ``METRIC_GROUPS``.
+    metrics: Tuple[str, ...] = METRIC_GROUPS
+    # Record spans in scoring worker processes and send them back with each batch.
+    trace: bool = False
+
+
+@dataclass
+class ScoreItem:
+    samples: np.ndarray
+    sample_rate: int
+    text: str
+    language: str
+    timings: Dict[str, float]
+    # Model that synthesized the output; metric spans are charged to it.
+    model: Optional[str] = None
+
+
+class Scorer:
+    """Computes every quality metric for a batch of outputs.
+
+    Engines are created on first use and kept for the scorer's lifetime, so each scoring
+    process loads whisper and the speaker encoder once. With a metric cache, each metric group
+    is only computed for outputs whose audio, parameters or metric version have no stored result.
+    """
+
+    def __init__(self, config: ScoringConfig) -> None:
+        self.config = config
+        self._asr: Optional[ASREngine] = None
+        self._embedder: Optional[SpeakerEmbedder] = None
+        self.cache = MetricCache(config.metric_cache) if config.metric_cache else None
+
+    @property
+    def asr(self) -> Optional[ASREngine]:
+        if self._asr is None and ASREngine.is_available():
+            self._asr = ASREngine(self.config.asr)
+        return self._asr
+
+    @property
+    def embedder(self) -> Optional[SpeakerEmbedder]:
+        if (
+            self._embedder is None
+            and self.config.reference_voices
+            and SpeakerEmbedder.is_available()
+        ):
+            self._embedder = SpeakerEmbedder()
+            self._embedder.set_references(list(self.config.reference_voices))
+        return self._embedder
+
+    def score(self, items: List[ScoreItem]) -> List[Dict[str, float]]:
+        with model_shares([item.model for item in items if item.model]):
+            return self._score(items)
+
+    def _score(self, items: List[ScoreItem]) -> List[Dict[str, float]]:
+        artifacts = [AudioArtifact(item.samples, item.sample_rate) for item in items]
+        hashes = [audio_hash(a.samples, a.sample_rate) for a in artifacts] if self.cache else []
+
+        def subset(indices: List[int]) -> List[AudioArtifact]:
+            return [artifacts[idx] for idx in indices]
+
+        results: List[Dict[str, float]] = [{} for _ in items]
+        if "audio" in self.config.metrics:
+            results = self._cached(
+                "audio",
+                AudioMetrics.version,
+                hashes,
+                [{} for _ in items],
+                lambda indices: [AudioMetrics(artifact).compute() for artifact in subset(indices)],
+            )
+        for metrics, item in zip(results, items):
+            metrics.update(item.timings)
+        if "asr" in self.config.metrics and ASREngine.is_available():
+            asr = self.config.asr
+            params = [
+                {
+                    "model_size": asr.model_size,
+                    "compute_type": asr.compute_type,
+                    **self.asr.decode_options,
+                    "text": item.text,
+                    "language": item.language,
+                }
+                for item in items
+            ]
+            scores = self._cached(
+                "asr",
+                ASREngine.version,
+                hashes,
+                params,
+                lambda indices: self.asr.score_batch(
+                    subset(indices),
+                    [items[idx].text for idx in indices],
+                    [items[idx].language for idx in indices],
+                ),
+            )
+            for metrics, asr_metrics in zip(results, scores):
+                metrics.update(asr_metrics)
+        selected = "speaker_similarity" in self.config.metrics
+        if selected and self.config.reference_voices and SpeakerEmbedder.is_available():
+            references = [file_fingerprint(str(path)) for path in self.config.reference_voices]
+            similarities = self._cached(
+                "speaker_similarity",
+                SpeakerEmbedder.version,
+                hashes,
+                [{"references": references} for _ in items],
+                lambda indices: self.embedder.score_batch(subset(indices)),
+            )
+            for metrics, similarity in zip(results, similarities):
+                metrics.update(similarity)
+        return results
+
+    def _cached(
+        self,
+        metric: str,
+        version: int,
+        hashes: Sequence[str],
+        params: Sequence[Dict[str, Any]],
+        compute: Callable[[List[int]], List[Dict[str, float]]],
+    ) -> List[Dict[str, float]]:
+        """Look up one metric group per output and compute only the misses."""
+        if self.cache is None:
+            with span(f"metrics.{metric}", outputs=len(params)):
+                return compute(list(range(len(params))))
+        keys = [metric_cache_key(h, metric, version, p) for h, p in zip(hashes, params)]
+        found = self.cache.get_many(keys)
+        missing = [idx for idx, key in enumerate(keys) if key not in found]
+        if missing:
+            with span(f"metrics.{metric}", outputs=len(missing)):
+                fresh = compute(missing)
+            entries = [
+                (keys[idx], hashes[idx], metric, version, values)
+                for idx, values in zip(missing, fresh)
+            ]
+            self.cache.put_many(entries)
+            found.update((keys[idx], values) for idx, values in zip(missing, fresh))
+        return [dict(found[key]) for key in keys]
+
+
+_WORKER_SCORER: Optional[Scorer] = None
+
+
+def init_worker(config: ScoringConfig) -> None:
+    global _WORKER_SCORER
+    _WORKER_SCORER = Scorer(config)
+    if config.trace:
+        set_tracer(Tracer(record_events=True))
+
+
+def score_in_worker(items: List[ScoreItem]) -> Tuple[List[Dict[str, float]], List[SpanRecord]]:
+    """Scores for ``items`` plus the worker's spans, which the parent merges into its tracer."""
+    if _WORKER_SCORER is None:
+        raise RuntimeError("Scoring worker was not initialised.")
+    scores = _WORKER_SCORER.score(items)
+    tracer = get_tracer()
+    return scores, tracer.drain() if tracer is not None else []
+
+
+def load_score_items(files: Sequence[Tuple[AudioSource, str, str]]) -> List[ScoreItem]:
+    """Decode ``(audio, text, language)`` triples into items without timings.
+
+    ``audio`` is a WAV path or a ``PackedRef``, which is read from the run's memory map.
+    """
+    items = []
+    for source, text, language in files:
+        artifact = load_audio(source)
+        items.append(ScoreItem(artifact.samples, artifact.sample_rate, text, language, {}))
+    return items
+
+
+def score_files_in_worker(files: List[Tuple[AudioSource, str, str]]) -> List[Dict[str, float]]:
+    """Like ``score_in_worker``, but decodes the audio in the worker process."""
+    scores, _ = score_in_worker(load_score_items(files))
+    return scores
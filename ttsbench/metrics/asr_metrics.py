@@ -1,12 +1,42 @@
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
 from importlib.util import find_spec
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
+import numpy as np
 from jiwer import cer, wer
 
+from ttsbench.utils.audio import AudioArtifact
+from ttsbench.utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+ASR_SAMPLE_RATE = 16000
+# Whisper decodes fixed 30 s windows; shorter clips can share one encoder/decoder batch.
+_WHISPER_WINDOW_S = 30.0
+# Mel frames in one window (10 ms hop).
+_WHISPER_FRAMES = 3000
+# Longer clips go through ``transcribe``; these keep it decoding like the batched ``generate``
+# path: one temperature-0 pass, no timestamps, no prompt from the previous window and no
+# skipping of windows judged silent.
+_TRANSCRIBE_OPTIONS: Dict[str, Any] = {
+    "without_timestamps": True,
+    "condition_on_previous_text": False,
+    "no_speech_threshold": None,
+}
+
+
+def _pad_or_trim(features: np.ndarray, frames: int = _WHISPER_FRAMES) -> np.ndarray:
+    """Fit mel features to one Whisper window, like ``faster_whisper.audio.pad_or_trim``."""
+    features = features[..., :frames]
+    padding = frames - features.shape[-1]
+    if padding:
+        features = np.pad(features, [(0, 0)] * (features.ndim - 1) + [(0, padding)])
+    return features
+
 
 @dataclass
 class ASRResult:
@@ -15,23 +45,142 @@ class ASRResult:
     cer: float
 
 
-def run_asr(audio_path: Path, language: str = "en") -> Optional[str]:
-    if find_spec("faster_whisper") is None:
-        return None
-    from faster_whisper import WhisperModel
-    model = WhisperModel("small", device="cpu", compute_type="int8")
-    segments, _info = model.transcribe(str(audio_path), language=language)
-    transcript = " ".join(segment.text for segment in segments).strip()
-    return transcript
+@dataclass(frozen=True)
+class ASRConfig:
+    model_size: str = "small"
+    compute_type: str = "int8"
+    cpu_threads: int = 0
+    device: str = "cpu"
+    batch_size: int = 8
+    beam_size: int = 5
 
 
-def compute_asr_metrics(audio_path: Path, reference: str, language: str = "en") -> Optional[Dict[str, float]]:
-    transcript = run_asr(audio_path, language)
-    if transcript is None:
+class ASREngine:
+    """Long-lived faster-whisper model shared by every output in a run."""
+
+    # Bump when WER/CER values change; invalidates cached results for this metric only.
+    version = 2
+
+    def __init__(self, config: Optional[ASRConfig] = None) -> None:
+        self.config = config or ASRConfig()
+        self._model: Optional[Any] = None
+
+    @staticmethod
+    def is_available() -> bool:
+        return find_spec("faster_whisper") is not None
+
+    @property
+    def model(self) -> Any:
+        if self._model is None:
+            from faster_whisper import WhisperModel
+
+            self._model = WhisperModel(
+                self.config.model_size,
+                device=self.config.device,
+                compute_type=self.config.compute_type,
+                cpu_threads=self.config.cpu_threads,
+            )
+            logger.info("ASR model loaded", extra={"model_size": self.config.model_size})
+        return self._model
+
+    @property
+    def decode_options(self) -> Dict[str, Any]:
+        """Decoding used for every clip, batched or not; part of the cached result's key."""
+        return {"beam_size": self.config.beam_size, "temperature": 0.0}
+
+    def transcribe(self, audio: np.ndarray, language: str = "en") -> str:
+        segments, _info = self.model.transcribe(
+            audio, language=language, **self.decode_options, **_TRANSCRIBE_OPTIONS
+        )
+        return " ".join(segment.text for segment in segments).strip()
+
+    def transcribe_batch(self, audios: Sequence[np.ndarray], languages: Sequence[str]) -> List[str]:
+        """Transcribe 16 kHz mono buffers, batching clips that fit one Whisper window."""
+        transcripts: List[str] = [""] * len(audios)
+        short: Dict[str, List[int]] = {}
+        window = int(_WHISPER_WINDOW_S * ASR_SAMPLE_RATE)
+        for idx, (audio, language) in enumerate(zip(audios, languages)):
+            if audio.shape[0] <= window and self._supports_batched_generate():
+                short.setdefault(language, []).append(idx)
+            else:
+                transcripts[idx] = self.transcribe(audio, language)
+        size = max(1, self.config.batch_size)
+        for language, indices in short.items():
+            for start in range(0, len(indices), size):
+                chunk = indices[start : start + size]
+                texts = self._generate_batch([audios[idx] for idx in chunk], language)
+                for idx, text in zip(chunk, texts):
+                    transcripts[idx] = text
+        return transcripts
+
+    def _supports_batched_generate(self) -> bool:
+        model = self.model
+        return all(hasattr(model, attr) for attr in ("encode", "get_prompt", "feature_extractor"))
+
+    def _generate_batch(self, audios: Sequence[np.ndarray], language: str) -> List[str]:
+        model = self.model
+        tokenizer = self._tokenizer(language)
+        features = np.stack([_pad_or_trim(model.feature_extractor(audio)) for audio in audios])
+        encoder_output = model.encode(features)
+        prompt = model.get_prompt(tokenizer, [], without_timestamps=True)
+        results = model.model.generate(
+            encoder_output,
+            [prompt] * len(audios),
+            beam_size=self.config.beam_size,
+            max_length=448,
+            suppress_blank=True,
+        )
+        return [tokenizer.decode(result.sequences_ids[0]).strip() for result in results]
+
+    def _tokenizer(self, language: str) -> Any:
+        from faster_whisper.tokenizer import Tokenizer
+
+        model = self.model
+        return Tokenizer(
+            model.hf_tokenizer, model.model.is_multilingual, task="transcribe", language=language
+        )
+
+    def score_batch(
+        self,
+        artifacts: Sequence[AudioArtifact],
+        references: Sequence[str],
+        languages: Sequence[str],
+    ) -> List[Dict[str, float]]:
+        audios = [artifact.at_rate(ASR_SAMPLE_RATE) for artifact in artifacts]
+        with span("whisper.transcribe", outputs=len(audios)):
+            transcripts = self.transcribe_batch(audios, languages)
+        return [score_transcript(ref, hyp) for ref, hyp in zip(references, transcripts)]
+
+
+def load_asr_audio(audio_path: Path) -> np.ndarray:
+    return AudioArtifact.from_path(audio_path).at_rate(ASR_SAMPLE_RATE)
+
+
+def run_asr(
+    audio_path: Path, language: str = "en", engine: Optional[ASREngine] = None
+) -> Optional[str]:
+    if not ASREngine.is_available():
         return None
+    engine = engine or ASREngine()
+    return engine.transcribe(load_asr_audio(audio_path), language)
+
+
+def score_transcript(reference: str, transcript: str) -> Dict[str, float]:
     normalized_ref = reference.strip().lower()
     normalized_hyp = transcript.strip().lower()
     return {
         "wer": float(wer(normalized_ref, normalized_hyp)),
         "cer": float(cer(normalized_ref, normalized_hyp)),
     }
+
+
+def compute_asr_metrics(
+    audio_path: Path,
+    reference: str,
+    language: str = "en",
+    engine: Optional[ASREngine] = None,
+) -> Optional[Dict[str, float]]:
+    transcript = run_asr(audio_path, language, engine)
+    if transcript is None:
+        return None
+    return score_transcript(reference, transcript)
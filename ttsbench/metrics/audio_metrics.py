@@ -1,62 +1,51 @@
 from __future__ import annotations
 
-import json
-import subprocess
+import math
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 
 import numpy as np
 
-from ttsbench.utils.audio import clipping_percent, duration_seconds, read_audio, rms_db
+from ttsbench.metrics.loudness import integrated_loudness, loudness_range, true_peak
+from ttsbench.utils.audio import AudioArtifact, clipping_percent, rms_db
+from ttsbench.utils.tracing import span
+
+SILENCE_THRESHOLD_DB = -60.0
 
 
 class AudioMetrics:
-    def __init__(self, audio_path: Path) -> None:
-        self.audio_path = audio_path
-        self.audio, self.sr = read_audio(audio_path)
+    # Bump when computed values change; invalidates cached results for this metric only.
+    version = 1
+
+    def __init__(self, audio: Union[AudioArtifact, Path]) -> None:
+        if not isinstance(audio, AudioArtifact):
+            audio = AudioArtifact.from_path(audio)
+        self.artifact = audio
+        self.audio_path = self.artifact.path
+        self.audio = self.artifact.mono
+        self.sr = self.artifact.sample_rate
 
     def compute(self) -> Dict[str, float]:
+        samples = self.artifact.samples
+        energy = self.artifact.frame_energy_db
         metrics = {
-            "duration_s": duration_seconds(self.audio, self.sr),
+            "duration_s": self.artifact.duration_s,
             "rms_db": rms_db(self.audio),
             "clipping_pct": clipping_percent(self.audio),
+            "true_peak_dbtp": true_peak(samples, self.sr),
+            "silence_pct": (
+                float(np.mean(energy < SILENCE_THRESHOLD_DB) * 100.0) if energy.size else 0.0
+            ),
         }
-        lufs = estimate_lufs(self.audio_path)
-        if lufs is not None:
-            metrics["lufs"] = lufs
+        with span("metrics.loudness"):
+            lufs = integrated_loudness(samples, self.sr)
+            if math.isfinite(lufs):
+                metrics["lufs"] = lufs
+                metrics["loudness_range_lu"] = loudness_range(samples, self.sr)
         return metrics
 
 
-def estimate_lufs(audio_path: Path) -> Optional[float]:
-    try:
-        result = subprocess.run(
-            [
-                "ffmpeg",
-                "-hide_banner",
-                "-nostats",
-                "-i",
-                str(audio_path),
-                "-filter_complex",
-                "ebur128=framelog=verbose",
-                "-f",
-                "null",
-                "-",
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=False,
-            text=True,
-        )
-    except FileNotFoundError:
-        return None
-    for line in result.stderr.splitlines():
-        if "I:" in line and "LUFS" in line:
-            parts = line.split("I:")
-            if len(parts) < 2:
-                continue
-            try:
-                lufs = float(parts[1].split("LUFS")[0].strip())
-                return lufs
-            except ValueError:
-                continue
-    return None
+def estimate_lufs(audio: Union[AudioArtifact, Path]) -> Optional[float]:
+    artifact = audio if isinstance(audio, AudioArtifact) else AudioArtifact.from_path(audio)
+    lufs = integrated_loudness(artifact.samples, artifact.sample_rate)
+    return lufs if math.isfinite(lufs) else None
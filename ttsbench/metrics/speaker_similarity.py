@@ -1,30 +1,130 @@
 from __future__ import annotations
 
+import logging
 from importlib.util import find_spec
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 import numpy as np
 
+from ttsbench.utils.audio import AudioArtifact
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_SAMPLE_RATE = 16000
+
+
+class SpeakerEmbedder:
+    """Loads the resemblyzer encoder once and embeds many utterances per forward pass.
+
+    Reference voices are embedded once via ``set_references``; generated outputs are then
+    compared against all of them with a single matrix product.
+    """
+
+    # Bump when similarity values change; invalidates cached results for this metric only.
+    version = 1
+
+    def __init__(self, device: Optional[str] = None) -> None:
+        self.device = device
+        self._encoder: Optional[Any] = None
+        self.reference_names: List[str] = []
+        self.references: Optional[np.ndarray] = None
+
+    @staticmethod
+    def is_available() -> bool:
+        return find_spec("resemblyzer") is not None
+
+    @property
+    def encoder(self) -> Any:
+        if self._encoder is None:
+            from resemblyzer import VoiceEncoder
+
+            self._encoder = VoiceEncoder(device=self.device, verbose=False)
+            logger.info("Speaker encoder loaded")
+        return self._encoder
+
+    def embed(
+        self, wavs: Sequence[np.ndarray], sample_rate: int = EMBEDDING_SAMPLE_RATE
+    ) -> np.ndarray:
+        """Return an ``(n, dim)`` matrix of L2-normalised utterance embeddings."""
+        import torch
+        from resemblyzer import preprocess_wav
+        from resemblyzer.audio import wav_to_mel_spectrogram
+
+        encoder = self.encoder
+        mel_batches: List[np.ndarray] = []
+        owners: List[int] = []
+        for idx, wav in enumerate(wavs):
+            wav = preprocess_wav(wav, source_sr=sample_rate)
+            wav_slices, mel_slices = encoder.compute_partial_slices(len(wav))
+            max_length = wav_slices[-1].stop
+            if max_length >= len(wav):
+                wav = np.pad(wav, (0, max_length - len(wav)), "constant")
+            mel = wav_to_mel_spectrogram(wav)
+            mel_batches.extend(mel[s] for s in mel_slices)
+            owners.extend([idx] * len(mel_slices))
+        dim = encoder.linear.out_features
+        if not mel_batches:
+            return np.zeros((0, dim), dtype=np.float32)
+        with torch.no_grad():
+            mels = torch.from_numpy(np.array(mel_batches)).to(encoder.device)
+            partials = encoder(mels).cpu().numpy()
+        owner_idx = np.asarray(owners)
+        sums = np.zeros((len(wavs), dim), dtype=np.float64)
+        np.add.at(sums, owner_idx, partials)
+        return _normalize_rows(sums / np.bincount(owner_idx, minlength=len(wavs))[:, None])
+
+    def set_references(self, paths: Sequence[Path]) -> None:
+        self.reference_names = [path.stem for path in paths]
+        self.references = self.embed([load_embedding_audio(path) for path in paths])
+
+    def similarity(
+        self, wavs: Sequence[np.ndarray], sample_rate: int = EMBEDDING_SAMPLE_RATE
+    ) -> np.ndarray:
+        """Cosine similarity of each output against each reference.
+
+        Shape ``(outputs, references)``.
+        """
+        if self.references is None:
+            raise RuntimeError("Call set_references() before scoring outputs.")
+        return similarity_matrix(self.embed(wavs, sample_rate), self.references)
+
+    def score_batch(self, artifacts: Sequence[AudioArtifact]) -> List[Dict[str, float]]:
+        wavs = [artifact.at_rate(EMBEDDING_SAMPLE_RATE) for artifact in artifacts]
+        matrix = self.similarity(wavs)
+        scores: List[Dict[str, float]] = []
+        for row in matrix:
+            metrics = {"speaker_similarity": float(row[0])}
+            if len(self.reference_names) > 1:
+                for name, value in zip(self.reference_names, row):
+                    metrics[f"speaker_similarity/{name}"] = float(value)
+            scores.append(metrics)
+        return scores
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def similarity_matrix(outputs: np.ndarray, references: np.ndarray) -> np.ndarray:
+    return _normalize_rows(np.atleast_2d(outputs)) @ _normalize_rows(np.atleast_2d(references)).T
 
-def _load_embedding(path: Path) -> Optional[np.ndarray]:
-    if find_spec("resemblyzer") is None:
-        return None
-    from resemblyzer import VoiceEncoder, preprocess_wav
 
-    wav = preprocess_wav(str(path))
-    encoder = VoiceEncoder()
-    emb = encoder.embed_utterance(wav)
-    return np.asarray(emb)
+def load_embedding_audio(path: Path) -> np.ndarray:
+    return AudioArtifact.from_path(path).at_rate(EMBEDDING_SAMPLE_RATE)
 
 
-def cosine_similarity(ref_path: Path, sample_path: Path) -> Optional[float]:
-    ref_emb = _load_embedding(ref_path)
-    sample_emb = _load_embedding(sample_path)
-    if ref_emb is None or sample_emb is None:
+def cosine_similarity(
+    ref_path: Path,
+    sample_path: Path,
+    embedder: Optional[SpeakerEmbedder] = None,
+) -> Optional[float]:
+    if not SpeakerEmbedder.is_available():
         return None
-    numerator = float(np.dot(ref_emb, sample_emb))
-    denominator = float(np.linalg.norm(ref_emb) * np.linalg.norm(sample_emb))
-    if denominator == 0:
+    embedder = embedder or SpeakerEmbedder()
+    embeddings = embedder.embed([load_embedding_audio(ref_path), load_embedding_audio(sample_path)])
+    if not np.any(embeddings[0]) or not np.any(embeddings[1]):
         return None
-    return numerator / denominator
+    return float(similarity_matrix(embeddings[1], embeddings[0])[0, 0])
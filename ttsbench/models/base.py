@@ -3,15 +3,39 @@ from __future__ import annotations
 import abc
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+import numpy as np
 
 
 @dataclass(frozen=True)
 class SynthResult:
-    audio_path: Path
+    """Output of one ``synth`` call.
+
+    Plugins either write ``audio_path`` themselves or hand back the sample buffer in ``audio``
+    (float32 array, or an int16/float32 memoryview such as raw PCM from a subprocess) and leave
+    persistence to the harness.
+    """
+
+    audio_path: Optional[Path]
     sample_rate: int
     timings: Dict[str, float]
+    # Resource usage the harness cannot see itself, e.g. a subprocess's CPU time and peak RSS.
     stats: Dict[str, float]
+    audio: Optional[Union[np.ndarray, memoryview]] = None
+
+    def samples(self) -> Optional[np.ndarray]:
+        """The in-memory buffer as float32, without copying when it already is float32."""
+        if self.audio is None:
+            return None
+        samples = np.asarray(self.audio)
+        if samples.dtype == np.int16:
+            return samples.astype(np.float32) / 32768.0
+        return samples.astype(np.float32, copy=False)
+
+
+# Listed in ``ModelCapabilities.languages`` by models that accept any language code.
+ANY_LANGUAGE = "*"
 
 
 @dataclass(frozen=True)
@@ -25,6 +49,19 @@ class BaseTTSModel(abc.ABC):
     name: str
     description: str
     capabilities: ModelCapabilities
+    # Config keys that select which weights get loaded; instances are cached per distinct values.
+    load_keys: Tuple[str, ...] = ("model_name", "model_path")
+    # Further config keys that change the synthesized audio; together with ``load_keys`` they
+    # form the synthesis cache key.
+    cache_keys: Tuple[str, ...] = (
+        "speaker",
+        "speaker_wav",
+        "temperature",
+        "top_p",
+        "max_duration_s",
+    )
+    # Synthetic models exercise the harness itself and are left out of ``--models all``.
+    synthetic: bool = False
 
     @classmethod
     @abc.abstractmethod
@@ -36,6 +73,30 @@ class BaseTTSModel(abc.ABC):
     def availability_help(cls) -> str:
         raise NotImplementedError
 
+    @classmethod
+    def instance_key(cls, config: Dict[str, Any]) -> Tuple[str, ...]:
+        return (cls.name,) + tuple(str(config.get(key) or "") for key in cls.load_keys)
+
+    def load(self, config: Dict[str, Any]) -> None:
+        """Load weights ahead of synthesis. Plugins without warm state keep this no-op."""
+
+    def unload(self) -> None:
+        """Release anything acquired by ``load``."""
+
     @abc.abstractmethod
     def synth(self, text: str, config: Dict[str, Any], out_dir: Path) -> SynthResult:
         raise NotImplementedError
+
+    def can_stream(self, config: Dict[str, Any]) -> bool:
+        """Whether ``synth_stream`` can serve this config; the harness falls back to ``synth``."""
+        return False
+
+    def stream_sample_rate(self, config: Dict[str, Any]) -> int:
+        raise NotImplementedError(f"Model {self.name} does not support streaming.")
+
+    def synth_stream(self, text: str, config: Dict[str, Any]) -> Iterator[np.ndarray]:
+        """Yield float32 audio chunks as soon as the model produces them.
+
+        A generator may ``return`` a stats dict, which ends up in ``SynthResult.stats``.
+        """
+        raise NotImplementedError(f"Model {self.name} does not support streaming.")
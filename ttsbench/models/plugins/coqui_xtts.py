@@ -3,16 +3,20 @@ from __future__ import annotations
 import time
 from importlib.util import find_spec
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
 
 from ttsbench.models.base import BaseTTSModel, ModelCapabilities, SynthResult
-from ttsbench.utils.audio import read_audio
+from ttsbench.utils.tracing import span
 
 
 class CoquiXTTSModel(BaseTTSModel):
     name = "coqui_xtts_v2"
     description = "Coqui XTTS v2 via TTS library"
     capabilities = ModelCapabilities(languages=["en", "es"], supports_cloning=True, supports_styles=True)
+    _tts: Optional[Any] = None
+    _latents: Optional[Dict[str, Tuple[Any, Any]]] = None
 
     @classmethod
     def is_available(cls) -> bool:
@@ -25,29 +29,61 @@ class CoquiXTTSModel(BaseTTSModel):
             "Ensure the XTTS v2 model is available locally; pass model_name or model_path."
         )
 
-    def synth(self, text: str, config: Dict[str, Any], out_dir: Path) -> SynthResult:
+    def load(self, config: Dict[str, Any]) -> None:
         from TTS.api import TTS
         model_name = config.get("model_name", "tts_models/multilingual/multi-dataset/xtts_v2")
-        model_path = config.get("model_path")
+        self._tts = TTS(model_name=model_name, model_path=config.get("model_path"))
+
+    def unload(self) -> None:
+        self._tts = None
+        self._latents = None
+
+    def can_stream(self, config: Dict[str, Any]) -> bool:
+        # Streaming goes through the XTTS model directly and needs reference audio for latents.
+        if not config.get("speaker_wav"):
+            return False
+        if self._tts is None:
+            self.load(config)
+        return hasattr(self._tts.synthesizer.tts_model, "inference_stream")
+
+    def stream_sample_rate(self, config: Dict[str, Any]) -> int:
+        if self._tts is None:
+            self.load(config)
+        return int(self._tts.synthesizer.output_sample_rate)
+
+    def synth_stream(self, text: str, config: Dict[str, Any]) -> Iterator[np.ndarray]:
+        if self._tts is None:
+            self.load(config)
+        model = self._tts.synthesizer.tts_model
+        speaker_wav = str(config["speaker_wav"])
+        if self._latents is None:
+            self._latents = {}
+        if speaker_wav not in self._latents:
+            with span("xtts.conditioning_latents", model=self.name):
+                latents = model.get_conditioning_latents(audio_path=[speaker_wav])
+            self._latents[speaker_wav] = latents
+        gpt_cond_latent, speaker_embedding = self._latents[speaker_wav]
+        for chunk in model.inference_stream(
+            text, config.get("language", "en"), gpt_cond_latent, speaker_embedding
+        ):
+            yield chunk.detach().cpu().numpy().astype(np.float32).reshape(-1)
+
+    def synth(self, text: str, config: Dict[str, Any], out_dir: Path) -> SynthResult:
+        if self._tts is None:
+            self.load(config)
+        tts = self._tts
         speaker_wav = config.get("speaker_wav")
         language = config.get("language", "en")
-        out_dir.mkdir(parents=True, exist_ok=True)
-        output_path = out_dir / "audio.wav"
 
-        tts = TTS(model_name=model_name, model_path=model_path)
         start = time.perf_counter()
-        tts.tts_to_file(
-            text=text,
-            file_path=str(output_path),
-            speaker_wav=speaker_wav,
-            language=language,
-        )
+        with span("xtts.inference", model=self.name):
+            wav = tts.tts(text=text, speaker_wav=speaker_wav, language=language)
         total = time.perf_counter() - start
-        audio, sr = read_audio(output_path)
+        audio = np.asarray(wav, dtype=np.float32)
+        sr = int(tts.synthesizer.output_sample_rate)
         duration = audio.shape[0] / sr if sr > 0 else 0.0
         timings = {
-            "time_to_first_audio_ms": total * 1000.0,
             "total_time_s": total,
             "rtf": total / duration if duration > 0 else 0.0,
         }
-        return SynthResult(audio_path=output_path, sample_rate=sr, timings=timings, stats={})
+        return SynthResult(audio_path=None, sample_rate=sr, timings=timings, stats={}, audio=audio)
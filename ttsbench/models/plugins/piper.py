@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+import json
 import subprocess
+import tempfile
 import time
 from pathlib import Path
-from typing import Any, Dict
+from typing import IO, Any, Dict, Generator, List
+
+import numpy as np
 
 from ttsbench.models.base import BaseTTSModel, ModelCapabilities, SynthResult
-from ttsbench.utils.audio import read_audio
+from ttsbench.utils.resources import wait_with_rusage
+from ttsbench.utils.tracing import span
+
+DEFAULT_SAMPLE_RATE = 22050
+STREAM_READ_BYTES = 8192
 
 
 class PiperModel(BaseTTSModel):
     name = "piper"
     description = "Piper local CLI"
     capabilities = ModelCapabilities(languages=["en", "es"], supports_cloning=False, supports_styles=False)
+    load_keys = ("voice",)
 
     @classmethod
     def is_available(cls) -> bool:
@@ -22,33 +31,95 @@ class PiperModel(BaseTTSModel):
     def availability_help(cls) -> str:
         return "Install piper-tts and ensure `piper` is on PATH. Provide a .onnx voice file."
 
+    def can_stream(self, config: Dict[str, Any]) -> bool:
+        return bool(config.get("voice"))
+
+    def stream_sample_rate(self, config: Dict[str, Any]) -> int:
+        return _voice_sample_rate(Path(config["voice"]))
+
+    def synth_stream(
+        self, text: str, config: Dict[str, Any]
+    ) -> Generator[np.ndarray, None, Dict[str, float]]:
+        # Piper flushes raw PCM sentence by sentence, so stdout reads arrive as audio is produced.
+        with span("piper.spawn", model=self.name):
+            process = _start(_command(config), text, stderr=None)
+        remainder = b""
+        try:
+            while block := process.stdout.read1(STREAM_READ_BYTES):
+                block = remainder + block
+                usable = len(block) - len(block) % 2
+                remainder = block[usable:]
+                if usable:
+                    yield np.frombuffer(block[:usable], dtype=np.int16).astype(np.float32) / 32768.0
+        finally:
+            process.stdout.close()
+            stats = wait_with_rusage(process)
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, _command(config))
+        return stats
+
     def synth(self, text: str, config: Dict[str, Any], out_dir: Path) -> SynthResult:
-        voice = config.get("voice")
-        if not voice:
-            raise ValueError("Piper requires config['voice'] pointing to a .onnx voice file.")
-        out_dir.mkdir(parents=True, exist_ok=True)
-        output_path = out_dir / "audio.wav"
-        cmd = [
-            "piper",
-            "--model",
-            str(voice),
-            "--output_file",
-            str(output_path),
-        ]
-        if config.get("speaker"):
-            cmd += ["--speaker", str(config["speaker"])]
+        cmd = _command(config)
         start = time.perf_counter()
-        subprocess.run(cmd, input=text, text=True, check=True)
+        with tempfile.TemporaryFile() as stderr:
+            with span("piper.spawn", model=self.name):
+                process = _start(cmd, text, stderr=stderr)
+            with span("piper.inference", model=self.name), process.stdout:
+                pcm = process.stdout.read()
+            stats = wait_with_rusage(process)
+            if process.returncode != 0:
+                stderr.seek(0)
+                raise subprocess.CalledProcessError(
+                    process.returncode, cmd, output=pcm, stderr=stderr.read()
+                )
         total = time.perf_counter() - start
-        audio, sr = read_audio(output_path)
-        duration = audio.shape[0] / sr if sr > 0 else 0.0
+        # Raw 16-bit mono PCM on stdout; viewed in place rather than round-tripped through a WAV.
+        audio = memoryview(pcm).cast("h")
+        sr = _voice_sample_rate(Path(config["voice"]))
+        duration = len(audio) / sr if sr > 0 else 0.0
         timings = {
-            "time_to_first_audio_ms": total * 1000.0,
             "total_time_s": total,
             "rtf": total / duration if duration > 0 else 0.0,
         }
-        stats: Dict[str, float] = {}
-        return SynthResult(audio_path=output_path, sample_rate=sr, timings=timings, stats=stats)
+        return SynthResult(
+            audio_path=None, sample_rate=sr, timings=timings, stats=stats, audio=audio
+        )
+
+
+def _start(cmd: List[str], text: str, stderr: IO[bytes] | None) -> subprocess.Popen:
+    """Launch Piper with the text already on stdin.
+
+    Prompts are far below the pipe buffer size, so writing them up front cannot block on Piper
+    filling stdout. The caller reaps the process to collect its resource usage.
+    """
+    process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=stderr)
+    process.stdin.write(text.encode("utf-8"))
+    process.stdin.close()
+    return process
+
+
+def _command(config: Dict[str, Any]) -> List[str]:
+    voice = config.get("voice")
+    if not voice:
+        raise ValueError("Piper requires config['voice'] pointing to a .onnx voice file.")
+    cmd = [
+        "piper",
+        "--model",
+        str(voice),
+        "--output_raw",
+    ]
+    if config.get("speaker"):
+        cmd += ["--speaker", str(config["speaker"])]
+    return cmd
+
+
+def _voice_sample_rate(voice: Path) -> int:
+    """Sample rate from the ``<voice>.onnx.json`` config Piper ships next to each voice."""
+    config_path = voice.with_name(voice.name + ".json")
+    if config_path.exists():
+        data = json.loads(config_path.read_text())
+        return int(data.get("audio", {}).get("sample_rate", DEFAULT_SAMPLE_RATE))
+    return DEFAULT_SAMPLE_RATE
 
 
 def _which(binary: str) -> str | None:
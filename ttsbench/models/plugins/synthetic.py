@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+import numpy as np
+
+from ttsbench.models.base import ANY_LANGUAGE, BaseTTSModel, ModelCapabilities, SynthResult
+
+# Options read from ``model_options: {synthetic: {...}}`` in the prompt YAML.
+DEFAULT_OPTIONS: Dict[str, Any] = {
+    "seed": 0,
+    # "tone" (a sine per utterance) or "noise" (white noise), both under a word envelope.
+    "signal": "tone",
+    "chars_per_second": 15.0,
+    # Fixed delay before the first audio, plus a real-time factor applied to the duration.
+    "latency_ms": 0.0,
+    "rtf": 0.0,
+    # Streaming chunk length; 0 disables streaming.
+    "chunk_ms": 200.0,
+    # Probability that a call raises, drawn deterministically per input.
+    "failure_rate": 0.0,
+}
+
+
+class SyntheticModel(BaseTTSModel):
+    """Deterministic synthetic audio with simulated latency, for exercising the harness.
+
+    The same text, style, language and seed always produce the same samples and the same
+    injected failures, so runs are reproducible without any model weights.
+    """
+
+    name = "synthetic"
+    description = "Synthetic tones/noise with configurable latency (harness testing)"
+    capabilities = ModelCapabilities(
+        languages=[ANY_LANGUAGE], supports_cloning=False, supports_styles=True
+    )
+    cache_keys = BaseTTSModel.cache_keys + ("model_options", "sample_rate")
+    synthetic = True
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    @classmethod
+    def availability_help(cls) -> str:
+        return "The synthetic model is built in and always available."
+
+    def options(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        overrides = (config.get("model_options") or {}).get(self.name) or {}
+        unknown = set(overrides) - set(DEFAULT_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown synthetic model options: {', '.join(sorted(unknown))}")
+        return {**DEFAULT_OPTIONS, **overrides}
+
+    def synth(self, text: str, config: Dict[str, Any], out_dir: Path) -> SynthResult:
+        options = self.options(config)
+        sample_rate = int(config.get("sample_rate") or 24000)
+        start = time.perf_counter()
+        audio = self._generate(text, config, options, sample_rate)
+        duration = audio.shape[0] / sample_rate
+        _sleep_until(start + options["latency_ms"] / 1000.0 + options["rtf"] * duration)
+        total = time.perf_counter() - start
+        return SynthResult(
+            audio_path=None,
+            sample_rate=sample_rate,
+            timings={"total_time_s": total, "rtf": total / duration if duration > 0 else 0.0},
+            stats={},
+            audio=audio,
+        )
+
+    def can_stream(self, config: Dict[str, Any]) -> bool:
+        return self.options(config)["chunk_ms"] > 0
+
+    def stream_sample_rate(self, config: Dict[str, Any]) -> int:
+        return int(config.get("sample_rate") or 24000)
+
+    def synth_stream(self, text: str, config: Dict[str, Any]) -> Iterator[np.ndarray]:
+        options = self.options(config)
+        sample_rate = self.stream_sample_rate(config)
+        start = time.perf_counter()
+        audio = self._generate(text, config, options, sample_rate)
+        chunk = max(1, int(sample_rate * options["chunk_ms"] / 1000.0))
+        deadline = start + options["latency_ms"] / 1000.0
+        for offset in range(0, audio.shape[0], chunk):
+            piece = audio[offset : offset + chunk]
+            deadline += options["rtf"] * piece.shape[0] / sample_rate
+            _sleep_until(deadline)
+            yield piece
+
+    def _generate(
+        self, text: str, config: Dict[str, Any], options: Dict[str, Any], sample_rate: int
+    ) -> np.ndarray:
+        rng = np.random.default_rng(_input_seed(text, config, options["seed"]))
+        if rng.random() < options["failure_rate"]:
+            raise RuntimeError("Injected failure from the synthetic model.")
+        duration = max(0.1, len(text) / float(options["chars_per_second"]))
+        samples = int(duration * sample_rate)
+        if options["signal"] == "noise":
+            audio = rng.normal(0.0, 0.1, samples)
+        elif options["signal"] == "tone":
+            frequency = rng.uniform(110.0, 440.0)
+            audio = 0.3 * np.sin(2.0 * np.pi * frequency * np.arange(samples) / sample_rate)
+        else:
+            raise ValueError(f"Unknown synthetic model signal: {options['signal']}")
+        return (audio * _word_envelope(text, samples)).astype(np.float32)
+
+
+def _input_seed(text: str, config: Dict[str, Any], seed: int) -> int:
+    payload = "\x00".join([str(seed), text, str(config.get("style")), str(config.get("language"))])
+    return int.from_bytes(hashlib.blake2b(payload.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _word_envelope(text: str, samples: int) -> np.ndarray:
+    """Split the utterance into one segment per word with a short pause after each."""
+    words = max(1, len(text.split()))
+    position = np.arange(samples) * words / max(1, samples)
+    return (position % 1.0 < 0.85).astype(np.float64)
+
+
+def _sleep_until(deadline: float) -> None:
+    delay = deadline - time.perf_counter()
+    if delay > 0:
+        time.sleep(delay)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+from ttsbench.models.base import BaseTTSModel
+from ttsbench.models.registry import get_model
+from ttsbench.utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoadedModel:
+    model: BaseTTSModel
+    load_time_s: float
+
+
+class ModelPool:
+    """Keeps loaded model instances alive for the length of a run.
+
+    Instances are keyed by ``BaseTTSModel.instance_key`` so the same weights are loaded once
+    no matter how many prompts are synthesized, while a different checkpoint gets its own slot.
+    ``replica`` asks for an additional independent instance, e.g. one per synthesis thread.
+    """
+
+    def __init__(self) -> None:
+        self._loaded: Dict[Tuple[Any, ...], LoadedModel] = {}
+        # ``_lock`` only guards the dicts; a load holds its own key's lock, so other keys load
+        # in parallel and loaded instances are handed out meanwhile.
+        self._loading: Dict[Tuple[Any, ...], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, name: str, config: Dict[str, Any], replica: int = 0) -> LoadedModel:
+        model_cls = get_model(name)
+        key = model_cls.instance_key(config) + (replica,)
+        with self._lock:
+            cached = self._loaded.get(key)
+            if cached is not None:
+                return cached
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                cached = self._loaded.get(key)
+            if cached is not None:
+                return cached
+            model = model_cls()
+            start = time.perf_counter()
+            with span("model_load", model=name, replica=replica):
+                model.load(config)
+            load_time = time.perf_counter() - start
+            logger.info("Model loaded", extra={"model": name, "load_time_s": load_time})
+            loaded = LoadedModel(model=model, load_time_s=load_time)
+            with self._lock:
+                self._loaded[key] = loaded
+            return loaded
+
+    def close(self) -> None:
+        for loaded in self._loaded.values():
+            loaded.model.unload()
+        self._loaded.clear()
+        self._loading.clear()
+
+    def __enter__(self) -> "ModelPool":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
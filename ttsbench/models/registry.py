@@ -11,6 +11,7 @@ from ttsbench.models.plugins.stub import (
     StyleTTS2StubModel,
     VITSStubModel,
 )
+from ttsbench.models.plugins.synthetic import SyntheticModel
 
 MODEL_REGISTRY: Dict[str, Type[BaseTTSModel]] = {
     CoquiXTTSModel.name: CoquiXTTSModel,
@@ -19,6 +20,7 @@ MODEL_REGISTRY: Dict[str, Type[BaseTTSModel]] = {
     VITSStubModel.name: VITSStubModel,
     BarkStubModel.name: BarkStubModel,
     QwenTTSStubModel.name: QwenTTSStubModel,
+    SyntheticModel.name: SyntheticModel,
 }
 
 
@@ -1,23 +1,56 @@
 from __future__ import annotations
 
+import hashlib
 import math
+from collections import deque
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
-from typing import Tuple
+from typing import Callable, Deque, Dict, Optional, Tuple
 
 import numpy as np
 import soundfile as sf
 
+from ttsbench.utils.tracing import span
+
 
 def read_audio(path: Path) -> Tuple[np.ndarray, int]:
-    audio, sr = sf.read(path)
+    with span("read_audio"):
+        audio, sr = sf.read(path)
     if audio.ndim > 1:
         audio = np.mean(audio, axis=1)
     return audio.astype(np.float32), sr
 
 
+def to_pcm16(audio: np.ndarray) -> np.ndarray:
+    """Quantize float samples to int16 so that decoding (``value / 32768``) round-trips."""
+    audio = np.asarray(audio)
+    if audio.dtype == np.int16:
+        return audio
+    return np.clip(np.round(audio * 32768.0), -32768, 32767).astype(np.int16)
+
+
 def write_audio(path: Path, audio: np.ndarray, sr: int) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    sf.write(path, audio, sr)
+    sf.write(path, to_pcm16(audio), sr)
+
+
+def audio_hash(samples: np.ndarray, sr: int) -> str:
+    """Content hash of a buffer that matches the hash of its re-read 16-bit WAV."""
+    pcm = to_pcm16(samples)
+    digest = hashlib.blake2b(f"{sr}:{pcm.shape}".encode("utf-8"), digest_size=16)
+    digest.update(np.ascontiguousarray(pcm).tobytes())
+    return digest.hexdigest()
+
+
+def _write_then(
+    path: Path, audio: np.ndarray, sr: int, on_written: Optional[Callable[[Path], None]]
+) -> None:
+    with span("audio_write"):
+        write_audio(path, audio, sr)
+    if on_written is not None:
+        on_written(path)
 
 
 def duration_seconds(audio: np.ndarray, sr: int) -> float:
@@ -38,3 +71,111 @@ def clipping_percent(audio: np.ndarray, threshold: float = 0.99) -> float:
         return 0.0
     clipped = np.sum(np.abs(audio) >= threshold)
     return float(clipped / audio.size * 100.0)
+
+
+def resample(audio: np.ndarray, sr: int, target_sr: int) -> np.ndarray:
+    """Band-limited FFT resample of a mono buffer."""
+    if sr == target_sr or audio.size == 0:
+        return audio.astype(np.float32, copy=False)
+    n_out = max(1, int(round(audio.shape[0] * target_sr / sr)))
+    spectrum = np.fft.rfft(audio)
+    n_bins = n_out // 2 + 1
+    if n_bins <= spectrum.shape[0]:
+        spectrum = spectrum[:n_bins]
+    else:
+        spectrum = np.pad(spectrum, (0, n_bins - spectrum.shape[0]))
+    out = np.fft.irfft(spectrum, n_out) * (n_out / audio.shape[0])
+    return out.astype(np.float32)
+
+
+class AudioArtifact:
+    """One decoded output shared by every metric stage.
+
+    Holds the float32 samples as decoded (mono or ``(frames, channels)``) and caches derived
+    views on first use, so the file is read once and e.g. the 16 kHz resample used by both
+    ASR and speaker embedding is computed once.
+    """
+
+    def __init__(self, samples: np.ndarray, sample_rate: int, path: Optional[Path] = None) -> None:
+        self.samples = samples.astype(np.float32, copy=False)
+        self.sample_rate = sample_rate
+        self.path = path
+        self._resampled: Dict[int, np.ndarray] = {}
+
+    @classmethod
+    def from_path(cls, path: Path) -> "AudioArtifact":
+        with span("read_audio"):
+            samples, sr = sf.read(str(path), dtype="float32")
+        return cls(samples, sr, path=path)
+
+    @property
+    def duration_s(self) -> float:
+        return duration_seconds(self.samples, self.sample_rate) if self.sample_rate > 0 else 0.0
+
+    @cached_property
+    def mono(self) -> np.ndarray:
+        if self.samples.ndim > 1:
+            return np.mean(self.samples, axis=1, dtype=np.float32)
+        return self.samples
+
+    def at_rate(self, sample_rate: int) -> np.ndarray:
+        """Mono view resampled to ``sample_rate``, cached per rate."""
+        if sample_rate not in self._resampled:
+            self._resampled[sample_rate] = resample(self.mono, self.sample_rate, sample_rate)
+        return self._resampled[sample_rate]
+
+    @cached_property
+    def frame_energy_db(self) -> np.ndarray:
+        """Mean-square energy of consecutive 20 ms mono frames, in dBFS."""
+        frame = max(1, int(self.sample_rate * 0.02))
+        usable = (self.mono.shape[0] // frame) * frame
+        if usable == 0:
+            return np.zeros(0, dtype=np.float32)
+        energy = np.mean(np.square(self.mono[:usable].reshape(-1, frame)), axis=1)
+        with np.errstate(divide="ignore"):
+            return (10.0 * np.log10(energy)).astype(np.float32)
+
+
+class AudioPersister:
+    """Writes synthesized buffers to disk on background threads.
+
+    Keeps file encoding off the synthesis timing path. At most ``max_pending`` writes are in
+    flight; submitting more waits for the oldest, which bounds the audio held in memory.
+    """
+
+    writes_files = True
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="audio-writer"
+        )
+        self._pending: Deque[Future[None]] = deque()
+        self._lock = threading.Lock()
+        self.max_pending = max_pending
+
+    def submit(
+        self,
+        path: Path,
+        audio: np.ndarray,
+        sr: int,
+        on_written: Optional[Callable[[Path], None]] = None,
+    ) -> Path:
+        """Queue a write; ``on_written`` runs on the writer thread once the file is complete."""
+        with self._lock:
+            while len(self._pending) >= self.max_pending:
+                self._pending.popleft().result()
+            self._pending.append(self._executor.submit(_write_then, path, audio, sr, on_written))
+        return path
+
+    def close(self) -> None:
+        try:
+            while self._pending:
+                self._pending.popleft().result()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "AudioPersister":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from ttsbench.utils.audio import AudioArtifact, to_pcm16, write_audio
+from ttsbench.utils.tracing import span
+
+AUDIO_STORES = ("files", "packed")
+PACK_FILE = "audio.pack"
+INDEX_FILE = "audio.index"
+PACK_DTYPES = ("int16", "float32")
+# ``audio_path`` of a packed output: ``pack:<model>/<prompt_id>/<style>``, relative to its run.
+PACK_SCHEME = "pack:"
+# Entry offsets are padded to this many bytes so every view is aligned for its dtype.
+ALIGNMENT = 16
+
+
+@dataclass(frozen=True)
+class PackEntry:
+    offset: int
+    frames: int
+    channels: int
+    sample_rate: int
+    dtype: str
+
+
+@dataclass(frozen=True)
+class PackedRef:
+    """A packed output located in its run directory; picklable for scoring workers."""
+
+    run_dir: Path
+    key: str
+
+
+AudioSource = Union[Path, PackedRef]
+
+
+def is_packed(audio_path: Optional[str]) -> bool:
+    return bool(audio_path) and str(audio_path).startswith(PACK_SCHEME)
+
+
+def pack_key(run_dir: Path, path: Path) -> str:
+    """``<model>/<prompt_id>/<style>`` of an output laid out as ``<run_dir>/.../audio.wav``."""
+    return path.relative_to(run_dir).parent.as_posix()
+
+
+def pack_reference(run_dir: Path, path: Path) -> str:
+    return PACK_SCHEME + pack_key(run_dir, path)
+
+
+def resolve_audio_path(run_dir: Path, audio_path: str) -> Path:
+    """Find an output recorded relative to another working directory or before a move."""
+    path = Path(audio_path)
+    if path.exists():
+        return path
+    # Outputs are laid out as <run_dir>/<model>/<prompt>/<style>/audio.wav.
+    return run_dir.joinpath(*path.parts[-4:])
+
+
+def resolve_audio(run_dir: Path, audio_path: str) -> AudioSource:
+    """Where a results ``audio_path`` lives: a packed entry of ``run_dir`` or a file."""
+    if is_packed(audio_path):
+        return PackedRef(run_dir, audio_path[len(PACK_SCHEME) :])
+    return resolve_audio_path(run_dir, audio_path)
+
+
+def audio_exists(source: AudioSource) -> bool:
+    if isinstance(source, PackedRef):
+        return source.key in open_pack(source.run_dir)
+    return source.exists()
+
+
+def load_audio(source: AudioSource) -> AudioArtifact:
+    if isinstance(source, PackedRef):
+        return open_pack(source.run_dir).artifact(source.key)
+    return AudioArtifact.from_path(source)
+
+
+class PackedAudioReader:
+    """Memory-mapped view of a run's ``audio.pack``.
+
+    ``view`` returns NumPy arrays backed directly by the mapping, so reading an output copies
+    nothing until a metric needs float samples. ``refresh`` picks up entries appended since
+    the reader was opened; a torn last index line (a crash mid-append) is ignored.
+
+    The reader keeps ``audio.index`` and ``audio.pack`` open, so a pack rebuilt under it (new
+    files in place of the ones it holds, e.g. by a repeated merge) is detected and re-read
+    instead of served from the old mapping. ``close`` releases both files; a closed reader
+    reopens them on next use.
+    """
+
+    def __init__(self, run_dir: Path) -> None:
+        self.run_dir = run_dir
+        self.entries: Dict[str, PackEntry] = {}
+        self._index_bytes = 0
+        self._index: Optional[BinaryIO] = None
+        self._pack: Optional[BinaryIO] = None
+        self._map: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._refresh_index()
+            self._refresh_pack()
+
+    def _refresh_index(self) -> None:
+        index_path = self.run_dir / INDEX_FILE
+        if self._index is not None and (
+            _replaced(self._index, index_path)
+            or os.fstat(self._index.fileno()).st_size < self._index_bytes
+        ):
+            # The pack was rebuilt; start over from the new files.
+            self._close_files()
+        if self._index is None:
+            if not index_path.exists():
+                return
+            self._index = index_path.open("rb")
+            self.entries.clear()
+            self._index_bytes = 0
+        self._index.seek(self._index_bytes)
+        for line in self._index:
+            if not line.endswith(b"\n"):
+                break
+            self._index_bytes += len(line)
+            record = json.loads(line)
+            key = record.pop("key")
+            self.entries[key] = PackEntry(**record)
+
+    def _refresh_pack(self) -> None:
+        pack_path = self.run_dir / PACK_FILE
+        if self._pack is not None and _replaced(self._pack, pack_path):
+            self._close_map()
+            self._pack.close()
+            self._pack = None
+        if self._pack is None:
+            if not pack_path.exists():
+                return
+            self._pack = pack_path.open("rb")
+        size = os.fstat(self._pack.fileno()).st_size
+        if size and (self._map is None or size > len(self._map)):
+            # Views into an older, shorter mapping stay valid; it is released with them.
+            self._map = mmap.mmap(self._pack.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def keys(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def view(self, key: str) -> Tuple[np.ndarray, int]:
+        """Zero-copy, read-only samples in the stored dtype, and the sample rate."""
+        entry = self.entries[key]
+        count = entry.frames * entry.channels
+        end = entry.offset + count * np.dtype(entry.dtype).itemsize
+        if self._map is None or end > len(self._map):
+            self.refresh()
+        samples = np.frombuffer(
+            self._map,
+            dtype=entry.dtype,
+            count=count,
+            offset=entry.offset,
+        )
+        if entry.channels > 1:
+            samples = samples.reshape(entry.frames, entry.channels)
+        return samples, entry.sample_rate
+
+    def artifact(self, key: str) -> AudioArtifact:
+        """Float32 samples scaled like a decoded 16-bit WAV; float32 entries stay zero-copy."""
+        with span("read_audio"):
+            samples, sample_rate = self.view(key)
+            if samples.dtype == np.int16:
+                samples = samples.astype(np.float32) / np.float32(32768.0)
+        return AudioArtifact(samples, sample_rate)
+
+    def export(self, key: str, path: Path) -> Path:
+        samples, sample_rate = self.view(key)
+        write_audio(path, samples, sample_rate)
+        return path
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_files()
+
+    def _close_files(self) -> None:
+        self._close_map()
+        for handle in (self._index, self._pack):
+            if handle is not None:
+                handle.close()
+        self._index = self._pack = None
+
+    def _close_map(self) -> None:
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Views handed out still reference the mapping; it closes when they go.
+                pass
+            self._map = None
+
+    def __enter__(self) -> "PackedAudioReader":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _replaced(handle: BinaryIO, path: Path) -> bool:
+    """Whether ``path`` no longer names the open file ``handle`` (removed or replaced)."""
+    opened = os.fstat(handle.fileno())
+    try:
+        current = path.stat()
+    except FileNotFoundError:
+        return True
+    # The open handle keeps its inode allocated, so a new file cannot reuse the number.
+    return (opened.st_dev, opened.st_ino) != (current.st_dev, current.st_ino)
+
+
+# Readers shared by ``open_pack``, least recently used first; each holds two open files.
+MAX_OPEN_PACKS = 16
+_READERS: "OrderedDict[Path, PackedAudioReader]" = OrderedDict()
+_READERS_LOCK = threading.Lock()
+
+
+def open_pack(run_dir: Path) -> PackedAudioReader:
+    """A shared reader per run directory, refreshed on every call.
+
+    At most ``MAX_OPEN_PACKS`` readers stay open; the least recently used one is closed to
+    make room (it reopens its files if a caller still uses it). ``close_packs`` closes all.
+    """
+    with _READERS_LOCK:
+        reader = _READERS.get(run_dir)
+        if reader is None:
+            reader = _READERS[run_dir] = PackedAudioReader(run_dir)
+            while len(_READERS) > MAX_OPEN_PACKS:
+                _READERS.popitem(last=False)[1].close()
+        else:
+            _READERS.move_to_end(run_dir)
+            reader.refresh()
+        return reader
+
+
+def close_packs() -> None:
+    """Close every reader opened by ``open_pack``."""
+    with _READERS_LOCK:
+        while _READERS:
+            _READERS.popitem()[1].close()
+
+
+class PackedAudioStore:
+    """Append-only audio container for a run, used in place of ``AudioPersister``.
+
+    Each output's PCM (``int16`` like the WAV files, or ``float32``) is appended to
+    ``audio.pack`` and then indexed by a line in ``audio.index``, so an entry is only visible
+    once its samples are written. Raw PCM rather than a compressed codec keeps entries
+    mappable as arrays. Re-opening a run keeps earlier entries; ``get`` serves them to resume.
+    """
+
+    writes_files = False
+
+    def __init__(self, run_dir: Path, dtype: str = "int16") -> None:
+        if dtype not in PACK_DTYPES:
+            raise ValueError(f"dtype must be one of {', '.join(PACK_DTYPES)}, got {dtype!r}")
+        run_dir.mkdir(parents=True, exist_ok=True)
+        self.run_dir = run_dir
+        self.dtype = dtype
+        self._existing = PackedAudioReader(run_dir)
+        index_path = run_dir / INDEX_FILE
+        if index_path.exists() and index_path.stat().st_size > self._existing._index_bytes:
+            # Drop the torn line of an interrupted append before adding to the index.
+            with index_path.open("r+b") as index:
+                index.truncate(self._existing._index_bytes)
+        self._pack = (run_dir / PACK_FILE).open("ab")
+        self._index = index_path.open("a", encoding="utf-8")
+        self._offset = self._pack.tell()
+        self._lock = threading.Lock()
+
+    def get(self, path: Path) -> Optional[AudioArtifact]:
+        """The output stored for ``path``'s layout slot before this store was opened."""
+        key = pack_key(self.run_dir, path)
+        return self._existing.artifact(key) if key in self._existing else None
+
+    def submit(self, path: Path, audio: np.ndarray, sr: int) -> str:
+        """Append ``audio`` for the layout slot ``path`` and return its ``audio_path``."""
+        return self.append(pack_key(self.run_dir, path), audio, sr)
+
+    def append(self, key: str, audio: np.ndarray, sr: int) -> str:
+        if self.dtype == "int16":
+            data = to_pcm16(audio)
+        else:
+            data = np.asarray(audio, dtype=np.float32)
+        return self._write(key, np.ascontiguousarray(data), sr)
+
+    def copy_from(self, reader: PackedAudioReader, key: str) -> str:
+        """Append another pack's entry unchanged, keeping its stored dtype."""
+        samples, sample_rate = reader.view(key)
+        return self._write(key, samples, sample_rate)
+
+    def _write(self, key: str, data: np.ndarray, sr: int) -> str:
+        channels = data.shape[1] if data.ndim > 1 else 1
+        with span("audio_write"), self._lock:
+            padding = -self._offset % ALIGNMENT
+            if padding:
+                self._pack.write(bytes(padding))
+            offset = self._offset + padding
+            self._pack.write(data.data)
+            self._pack.flush()
+            self._offset = offset + data.nbytes
+            record = {
+                "key": key,
+                "offset": offset,
+                "frames": int(data.shape[0]),
+                "channels": channels,
+                "sample_rate": sr,
+                "dtype": data.dtype.name,
+            }
+            self._index.write(json.dumps(record) + "\n")
+            self._index.flush()
+        return PACK_SCHEME + key
+
+    def close(self) -> None:
+        with self._lock:
+            self._pack.close()
+            self._index.close()
+        self._existing.close()
+
+    def __enter__(self) -> "PackedAudioStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def export_wavs(run_dir: Path, out: Optional[Path] = None, prefix: str = "") -> int:
+    """Write packed outputs under ``prefix`` (``model[/prompt_id]``) as ``<out>/<key>/audio.wav``.
+
+    An empty ``prefix`` exports every output; ``out`` defaults to the run directory.
+    """
+    out = out or run_dir
+    prefix = prefix.strip("/")
+    written = 0
+    with PackedAudioReader(run_dir) as reader:
+        for key in reader.keys():
+            if not prefix or key == prefix or key.startswith(prefix + "/"):
+                reader.export(key, out / key / "audio.wav")
+                written += 1
+    return written
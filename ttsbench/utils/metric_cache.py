@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, create_engine, event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ttsbench.utils.results import apply_sqlite_pragmas
+from ttsbench.utils.synth_cache import cache_root
+
+
+def default_metric_cache_path() -> Path:
+    return cache_root() / "metrics.sqlite"
+
+
+def metric_cache_key(audio_hash: str, metric: str, version: int, params: Dict[str, Any]) -> str:
+    payload = json.dumps([audio_hash, metric, version, params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MetricCache:
+    """Stored metric values keyed by audio content, metric name, version and parameters.
+
+    A metric group (e.g. ``asr``) is recomputed only when the audio, its parameters or its
+    implementation version change; bumping one metric's version leaves the others cached.
+    Safe to share between runs and scoring processes (SQLite in WAL mode).
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or default_metric_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.engine = create_engine(f"sqlite:///{self.path}", connect_args={"timeout": 30})
+        event.listen(self.engine, "connect", apply_sqlite_pragmas)
+        self.metadata = MetaData()
+        self.entries = Table(
+            "metric_values",
+            self.metadata,
+            Column("key", String, primary_key=True),
+            Column("audio_hash", String, index=True),
+            Column("metric", String),
+            Column("version", Integer),
+            Column("values_json", String),
+            Column("created_at", Float),
+        )
+        self.metadata.create_all(self.engine)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        unique = list(dict.fromkeys(keys))
+        found: Dict[str, Dict[str, float]] = {}
+        with self.engine.begin() as conn:
+            # Chunked to stay under SQLite's bound-parameter limit.
+            for start in range(0, len(unique), 500):
+                chunk = unique[start : start + 500]
+                rows = conn.execute(
+                    select(self.entries.c.key, self.entries.c.values_json).where(
+                        self.entries.c.key.in_(chunk)
+                    )
+                )
+                found.update((key, json.loads(values)) for key, values in rows)
+        return found
+
+    def put_many(self, entries: List[Tuple[str, str, str, int, Dict[str, float]]]) -> None:
+        """Store ``(key, audio_hash, metric, version, values)`` tuples."""
+        if not entries:
+            return
+        now = time.time()
+        rows = [
+            {
+                "key": key,
+                "audio_hash": audio_hash,
+                "metric": metric,
+                "version": version,
+                "values_json": json.dumps(values),
+                "created_at": now,
+            }
+            for key, audio_hash, metric, version, values in entries
+        ]
+        statement = sqlite_insert(self.entries)
+        statement = statement.on_conflict_do_update(
+            index_elements=["key"],
+            set_={"values_json": statement.excluded.values_json, "created_at": now},
+        )
+        with self.engine.begin() as conn:
+            conn.execute(statement, rows)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import csv
+import json
+from itertools import chain, islice
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
 
 class PromptItem(BaseModel):
@@ -25,17 +28,42 @@ class PromptConfig(BaseModel):
     model_path: Optional[str] = None
     speaker_wav: Optional[str] = None
     styles: List[str] = Field(default_factory=list)
-    prompts: List[PromptItem]
+    # Plugin-specific settings keyed by model name, e.g. ``{"synthetic": {"latency_ms": 50}}``.
+    model_options: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    # Inline prompts; empty when they stream from ``PromptSet.source``.
+    prompts: List[PromptItem] = Field(default_factory=list)
 
 
 class PromptSet(BaseModel):
     config: PromptConfig
+    # JSONL/CSV file or directory of ``.txt`` files read lazily by ``iter_prompts``.
+    source: Optional[Path] = None
+
+    def iter_prompts(self, limit: Optional[int] = None) -> Iterator[PromptItem]:
+        """Inline prompts followed by the streamed source, validated row by row."""
+        prompts: Iterator[PromptItem] = iter(self.config.prompts)
+        if self.source is not None:
+            prompts = chain(prompts, iter_source(self.source))
+        return islice(prompts, limit)
+
+
+class PromptError(ValueError):
+    """A prompt row that fails validation, located as ``path:line``."""
 
 
 DEFAULT_STYLES = ["neutral", "excited", "whisper", "fast", "slow"]
+YAML_SUFFIXES = {".yaml", ".yml"}
+PROMPT_FIELDS = ("id", "text", "language", "style")
 
 
 def load_prompts(path: Path) -> PromptSet:
+    """Read a prompt YAML, or use defaults for a JSONL/CSV/directory passed directly.
+
+    A YAML ``source:`` (relative to the YAML file) streams prompts from a corpus instead of,
+    or after, the inline ``prompts:`` list.
+    """
+    if path.is_dir() or path.suffix.lower() not in YAML_SUFFIXES:
+        return PromptSet(config=PromptConfig(styles=DEFAULT_STYLES), source=path)
     data = yaml.safe_load(path.read_text())
     if "styles" not in data:
         data["styles"] = DEFAULT_STYLES
@@ -50,9 +78,73 @@ def load_prompts(path: Path) -> PromptSet:
         model_path=data.get("model_path"),
         speaker_wav=data.get("speaker_wav"),
         styles=data.get("styles", DEFAULT_STYLES),
-        prompts=[PromptItem(**item) for item in data["prompts"]],
+        model_options=data.get("model_options") or {},
+        prompts=[PromptItem(**item) for item in data.get("prompts") or []],
     )
-    return PromptSet(config=prompt_config)
+    source = path.parent / data["source"] if data.get("source") else None
+    if source is None and not prompt_config.prompts:
+        raise PromptError(f"{path}: needs a 'prompts' list or a 'source' corpus")
+    return PromptSet(config=prompt_config, source=source)
+
+
+def iter_source(path: Path) -> Iterator[PromptItem]:
+    """Stream prompts from a ``.jsonl``, ``.csv``/``.tsv`` or a directory of ``.txt`` files.
+
+    JSONL and CSV rows carry the ``PromptItem`` fields (``id`` and ``text`` required). In a
+    directory each text file is one prompt whose id is its relative path without suffix.
+    """
+    if path.is_dir():
+        return _iter_text_dir(path)
+    suffix = path.suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return _iter_jsonl(path)
+    if suffix in (".csv", ".tsv"):
+        return _iter_csv(path, "\t" if suffix == ".tsv" else ",")
+    raise PromptError(f"{path}: unsupported prompt source (expected .jsonl, .csv, .tsv or a dir)")
+
+
+def _validate(row: Dict[str, Any], location: str) -> PromptItem:
+    # Empty CSV cells mean "not set", so the model defaults apply.
+    fields = {key: value for key, value in row.items() if key in PROMPT_FIELDS and value != ""}
+    # Corpora often number their rows; ids are strings everywhere else.
+    if isinstance(fields.get("id"), int):
+        fields["id"] = str(fields["id"])
+    try:
+        return PromptItem(**fields)
+    except ValidationError as exc:
+        problems = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in exc.errors()
+        )
+        raise PromptError(f"{location}: {problems}") from None
+
+
+def _iter_jsonl(path: Path) -> Iterator[PromptItem]:
+    with path.open(encoding="utf-8") as handle:
+        for number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise PromptError(f"{path}:{number}: invalid JSON ({exc.msg})") from None
+            if not isinstance(row, dict):
+                raise PromptError(f"{path}:{number}: expected an object")
+            yield _validate(row, f"{path}:{number}")
+
+
+def _iter_csv(path: Path, delimiter: str) -> Iterator[PromptItem]:
+    with path.open(encoding="utf-8", newline="") as handle:
+        reader = csv.DictReader(handle, delimiter=delimiter)
+        for row in reader:
+            yield _validate(row, f"{path}:{reader.line_num}")
+
+
+def _iter_text_dir(path: Path) -> Iterator[PromptItem]:
+    for text_path in sorted(path.rglob("*.txt")):
+        prompt_id = text_path.relative_to(path).with_suffix("").as_posix()
+        text = text_path.read_text(encoding="utf-8")
+        yield _validate({"id": prompt_id, "text": text}, str(text_path))
 
 
 def normalize_prompt(text: str) -> str:
@@ -1,62 +1,555 @@
 from __future__ import annotations
 
+import json
+import math
+from array import array
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 
+import numpy as np
 from tabulate import tabulate
 
+from ttsbench.utils import stats
+from ttsbench.utils.results_stream import read_results_stream
 
-def _aggregate_metrics(outputs: List[Dict[str, object]]) -> Dict[str, Dict[str, float]]:
-    sums: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
-    counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-    for output in outputs:
+# Timing metrics summarized over every measured trial in the Latency section.
+LATENCY_METRICS = ("total_time_s", "rtf", "time_to_first_audio_ms")
+# Leaderboard and breakdown columns, when any model has them.
+HEADLINE_METRICS = (
+    "rtf",
+    "time_to_first_audio_ms",
+    "duration_s",
+    "wer",
+    "cer",
+    "speaker_similarity",
+)
+BREAKDOWNS = ("style", "language", "length")
+# Prompt-length buckets by normalized character count (upper bound inclusive).
+LENGTH_BUCKETS = ((40, "short"), (120, "medium"), (None, "long"))
+SUMMARY_FILE = "summary.json"
+
+
+class ReportData:
+    """Everything ``write_report`` needs, accumulated one record at a time.
+
+    Metric values are kept as per-model float columns (NaN where an output lacks a metric)
+    instead of per-output dicts, so a run's outputs never have to be in memory together and
+    aggregation is vectorized.
+    """
+
+    def __init__(self) -> None:
+        self.run: Dict[str, Any] = {}
+        self.models: List[Dict[str, Any]] = []
+        self.phases: List[Dict[str, Any]] = []
+        self.outputs: Dict[str, int] = defaultdict(int)
+        # prompt id -> (language, length bucket)
+        self.prompts: Dict[str, tuple] = {}
+        # Per model and breakdown, one label code per output; labels[dimension][code].
+        self._groups: Dict[str, Dict[str, array]] = defaultdict(
+            lambda: {dimension: array("i") for dimension in BREAKDOWNS}
+        )
+        self.labels: Dict[str, List[str]] = {dimension: [] for dimension in BREAKDOWNS}
+        self._codes: Dict[str, Dict[str, int]] = {dimension: {} for dimension in BREAKDOWNS}
+        self._columns: Dict[str, Dict[str, array]] = defaultdict(dict)
+        self._trials: Dict[str, Dict[str, array]] = defaultdict(lambda: defaultdict(_floats))
+        # (model, kind) -> [count, distinct reasons]
+        self._skipped: Dict[tuple, List[Any]] = {}
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "ReportData":
+        data = cls()
+        data.add("run", payload.get("run", {}))
+        for kind, key in (
+            ("model", "models"),
+            ("prompt", "prompts"),
+            ("output", "outputs"),
+            ("skipped", "skipped"),
+        ):
+            for record in payload.get(key) or []:
+                data.add(kind, record)
+        for record in payload.get("phases") or []:
+            data.add("phase", record)
+        return data
+
+    @classmethod
+    def from_stream(cls, path: Path) -> "ReportData":
+        data = cls()
+        for kind, record in read_results_stream(path):
+            data.add(kind, record)
+        return data
+
+    def add(self, kind: str, record: Dict[str, Any]) -> None:
+        if kind == "run":
+            self.run = record
+        elif kind == "model":
+            self.models.append(record)
+        elif kind == "prompt":
+            self.prompts[record["id"]] = (
+                record.get("language") or "unknown",
+                length_bucket(record.get("text") or ""),
+            )
+        elif kind == "output":
+            self.add_output(record)
+        elif kind == "skipped":
+            self.add_skipped(record)
+        elif kind == "phase":
+            self.phases.append(record)
+
+    def add_output(self, output: Dict[str, Any]) -> None:
         model = output["model"]
-        metrics = output["metrics"]
-        for name, value in metrics.items():
-            if isinstance(value, (int, float)):
-                sums[model][name] += float(value)
-                counts[model][name] += 1
-    averages: Dict[str, Dict[str, float]] = defaultdict(dict)
-    for model, metric_values in sums.items():
-        for name, total in metric_values.items():
-            averages[model][name] = total / counts[model][name]
-    return averages
-
-
-def write_report(path: Path, payload: Dict[str, object]) -> None:
-    outputs = payload.get("outputs", [])
-    averages = _aggregate_metrics(outputs)
+        row = self.outputs[model]
+        columns = self._columns[model]
+        for name, value in output["metrics"].items():
+            if not isinstance(value, (int, float)):
+                continue
+            if name not in columns:
+                columns[name] = _floats([float("nan")] * row)
+            columns[name].append(float(value))
+        for column in columns.values():
+            if len(column) == row:
+                column.append(float("nan"))
+        self.outputs[model] = row + 1
+        language, length = self.prompts.get(output.get("prompt_id"), ("unknown", "unknown"))
+        groups = self._groups[model]
+        for dimension, label in (
+            ("style", output.get("style") or "neutral"),
+            ("language", language),
+            ("length", length),
+        ):
+            groups[dimension].append(self._code(dimension, label))
+        # Payloads written before per-trial timings carry them in the metrics only.
+        trials = output.get("trials")
+        for timings in trials if trials is not None else [output["metrics"]]:
+            for name in LATENCY_METRICS:
+                if name in timings:
+                    self._trials[model][name].append(float(timings[name]))
+
+    def add_skipped(self, item: Dict[str, Any]) -> None:
+        group = self._skipped.setdefault((item["model"], item["kind"]), [0, {}])
+        group[0] += 1
+        if item["kind"] != "collapsed":
+            group[1].setdefault(str(item["reason"]), None)
+
+    def _code(self, dimension: str, label: str) -> int:
+        codes = self._codes[dimension]
+        if label not in codes:
+            codes[label] = len(codes)
+            self.labels[dimension].append(label)
+        return codes[label]
+
+    def groups(self, model: str, dimension: str) -> np.ndarray:
+        return np.frombuffer(self._groups[model][dimension], dtype=np.int32)
+
+    def headline_metrics(self) -> List[str]:
+        return [
+            name
+            for name in HEADLINE_METRICS
+            if any(name in columns for columns in self._columns.values())
+        ]
+
+    def summary(
+        self,
+        samples: int = stats.BOOTSTRAP_SAMPLES,
+        confidence: float = stats.CONFIDENCE,
+        seed: int = 0,
+    ) -> Dict[str, Any]:
+        """Per-model statistics, rankings and breakdowns, as written to ``summary.json``.
+
+        Every model gets count/mean/std/min/max/p50/p95/p99 and a bootstrap CI of the mean for
+        each metric. Rankable headline metrics are ordered with a significance test against
+        the next model, and headline metrics are broken down by style, language and prompt
+        length without resampling.
+        """
+        models: Dict[str, Any] = {}
+        boots: Dict[str, Dict[str, np.ndarray]] = {}
+        for model, columns in self._columns.items():
+            values = {name: self.column(model, name) for name in sorted(columns)}
+            if samples > 0:
+                boots[model] = stats.bootstrap_columns(
+                    values, samples, stats.model_seed(seed, model)
+                )
+            metrics = {}
+            for name, column in values.items():
+                described = stats.describe(
+                    column, samples, confidence, means=boots.get(model, {}).get(name)
+                )
+                if described is not None:
+                    metrics[name] = described
+            models[model] = {"outputs": self.outputs[model], "metrics": metrics}
+
+        headline = self.headline_metrics()
+        rankings = {}
+        for name in headline:
+            if name not in stats.LOWER_IS_BETTER:
+                continue
+            columns = {
+                model: self.column(model, name)
+                for model in self._columns
+                if name in self._columns[model]
+            }
+            rankings[name] = {
+                "lower_is_better": stats.LOWER_IS_BETTER[name],
+                "models": stats.rank(
+                    columns,
+                    stats.LOWER_IS_BETTER[name],
+                    samples,
+                    confidence,
+                    seed,
+                    boots={model: boots[model][name] for model in columns if model in boots},
+                ),
+            }
+
+        breakdowns: Dict[str, Any] = {}
+        for dimension in BREAKDOWNS:
+            by_group: Dict[str, Any] = {}
+            for model in self._columns:
+                codes = self.groups(model, dimension)
+                for code in np.unique(codes):
+                    mask = codes == code
+                    cell = {"outputs": int(mask.sum())}
+                    for name in headline:
+                        values = self.column(model, name)
+                        quick = stats.quick_stats(values[mask]) if values is not None else None
+                        if quick is not None:
+                            cell[name] = quick
+                    label = self.labels[dimension][int(code)]
+                    by_group.setdefault(label, {})[model] = cell
+            breakdowns[dimension] = by_group
+
+        return {
+            "run_id": self.run.get("run_id"),
+            "confidence": confidence,
+            "bootstrap_samples": samples,
+            "models": models,
+            "rankings": rankings,
+            "breakdowns": breakdowns,
+        }
+
+    def column(self, model: str, name: str) -> Optional[np.ndarray]:
+        values = self._columns[model].get(name)
+        return np.frombuffer(values, dtype=np.float64) if values is not None else None
+
+    def latency_rows(self) -> List[List[object]]:
+        rows = []
+        for model, by_metric in self._trials.items():
+            for name in LATENCY_METRICS:
+                values = np.frombuffer(by_metric.get(name, _floats()), dtype=np.float64)
+                if values.size == 0:
+                    continue
+                p50, p90, p99 = np.percentile(values, [50, 90, 99])
+                rows.append(
+                    [model, name, values.size]
+                    + [f"{value:.4f}" for value in (p50, p90, p99, values.mean(), values.std())]
+                )
+        return rows
+
+    def resource_rows(self) -> List[List[object]]:
+        """Per model: CPU per output and per audio-second (process plus children), and peaks."""
+        rows = []
+        for model in self._columns:
+            user = self.column(model, "cpu_user_s")
+            if user is None:
+                continue
+            measured = ~np.isnan(user)
+            if not measured.any():
+                continue
+            cpu = np.zeros(int(measured.sum()))
+            for name in ("cpu_user_s", "cpu_sys_s", "child_cpu_user_s", "child_cpu_sys_s"):
+                values = self.column(model, name)
+                if values is not None:
+                    cpu += np.nan_to_num(values[measured])
+            duration = self.column(model, "duration_s")
+            audio_s = float(np.nansum(duration[measured])) if duration is not None else 0.0
+            rows.append(
+                [
+                    model,
+                    int(measured.sum()),
+                    f"{cpu.mean():.4f}",
+                    f"{cpu.sum() / audio_s:.4f}" if audio_s > 0 else "n/a",
+                    f"{self._nanmax(model, 'peak_rss_delta_mb', measured) or 0.0:.1f}",
+                    _format_optional(self._nanmax(model, "child_peak_rss_mb", measured), ".1f"),
+                    int(self._nanmax(model, "threads", measured) or 0),
+                ]
+            )
+        return rows
+
+    def skipped_rows(self) -> List[List[object]]:
+        """One row per model and skip kind; distinct reasons are listed (collapsed summarized)."""
+        rows = []
+        for (model, kind), (count, reasons) in self._skipped.items():
+            if kind == "collapsed":
+                reason = "identical output to another job"
+            else:
+                reason = "; ".join(reasons)
+            rows.append([model, kind, count, reason])
+        return rows
+
+    def _nanmax(self, model: str, name: str, mask: np.ndarray) -> Optional[float]:
+        values = self.column(model, name)
+        if values is None or np.isnan(values[mask]).all():
+            return None
+        return float(np.nanmax(values[mask]))
+
+
+def length_bucket(text: str) -> str:
+    for limit, label in LENGTH_BUCKETS:
+        if limit is None or len(text) <= limit:
+            return label
+    return LENGTH_BUCKETS[-1][1]
+
+
+def _floats(values: Optional[List[float]] = None) -> array:
+    return array("d", values or [])
+
+
+def _format_optional(value: Optional[float], spec: str) -> str:
+    return format(value, spec) if value is not None and not math.isnan(value) else "n/a"
+
+
+def _format_ci(stat: Dict[str, Any]) -> str:
+    if "ci" not in stat:
+        return f"{stat['mean']:.4f}"
+    low, high = stat["ci"]
+    return f"{stat['mean']:.4f} [{low:.4f}, {high:.4f}]"
+
+
+def write_report(path: Path, payload: Dict[str, Any]) -> None:
+    render_report(path, ReportData.from_payload(payload))
+
+
+def write_report_from_stream(path: Path, stream_path: Path) -> None:
+    """Render ``report.md`` from ``results.jsonl`` without loading every output."""
+    render_report(path, ReportData.from_stream(stream_path))
+
+
+def render_report(path: Path, data: ReportData) -> Dict[str, Any]:
+    """Write ``report.md`` and, beside it, the same statistics as ``summary.json``."""
+    summary = data.summary()
+    path.parent.joinpath(SUMMARY_FILE).write_text(json.dumps(summary, indent=2))
+    models = summary["models"]
+    confidence = f"{summary['confidence']:.0%}"
 
     lines = [
         "# TTS Benchmark Report\n",
-        f"Run ID: {payload['run']['run_id']}\n",
+        f"Run ID: {data.run.get('run_id')}\n",
     ]
 
-    if not averages:
+    if not models:
         lines.append("No outputs generated.\n")
         path.write_text("\n".join(lines))
-        return
+        return summary
 
-    headers = ["Model", "avg_rtf", "avg_duration_s", "avg_wer"]
+    headline = data.headline_metrics()
+    headers = ["Model", "Outputs"] + [f"{name} (mean [{confidence} CI])" for name in headline]
     rows = []
-    for model, metrics in averages.items():
+    for model, entry in models.items():
+        # Timings are absent when every output came from the synthesis cache.
         rows.append(
-            [
-                model,
-                f"{metrics.get('rtf', 0.0):.3f}",
-                f"{metrics.get('duration_s', 0.0):.3f}",
-                f"{metrics.get('wer', 0.0):.3f}",
+            [model, entry["outputs"]]
+            + [
+                _format_ci(entry["metrics"][name]) if name in entry["metrics"] else "not measured"
+                for name in headline
             ]
         )
-    leaderboard = tabulate(rows, headers=headers, tablefmt="github")
     lines.append("## Leaderboard\n")
-    lines.append(leaderboard)
+    lines.append(tabulate(rows, headers=headers, tablefmt="github"))
+    if summary["rankings"]:
+        lines.append("\n## Rankings\n")
+        rank_rows = []
+        for name, ranking in summary["rankings"].items():
+            last = len(ranking["models"])
+            for row in ranking["models"]:
+                marker = ">" if row["significant"] else ("=" if row["rank"] < last else "")
+                rank_rows.append([name, row["rank"], row["model"], _format_ci(row), marker])
+        headers = ["Metric", "Rank", "Model", f"mean [{confidence} CI]", "vs next"]
+        lines.append(tabulate(rank_rows, headers=headers, tablefmt="github"))
+        lines.append(
+            f"\n`>`: better than the next-ranked model ({confidence} bootstrap CI of the"
+        )
+        lines.append("difference excludes zero); `=`: not distinguishable from it.")
+    titles = {"style": "Style", "language": "Language", "length": "Prompt length"}
+    for dimension, by_group in summary["breakdowns"].items():
+        # A single group repeats the leaderboard.
+        if len(by_group) < 2:
+            continue
+        lines.append(f"\n## By {titles[dimension].lower()}\n")
+        group_rows = []
+        for label, by_model in by_group.items():
+            for model, cell in by_model.items():
+                group_rows.append(
+                    [label, model, cell["outputs"]]
+                    + [
+                        f"{cell[name]['mean']:.4f} / {cell[name]['p95']:.4f}"
+                        if name in cell
+                        else "n/a"
+                        for name in headline
+                    ]
+                )
+        headers = [titles[dimension], "Model", "Outputs"] + [
+            f"{name} mean / p95" for name in headline
+        ]
+        lines.append(tabulate(group_rows, headers=headers, tablefmt="github"))
+    load_rows = [
+        [model["name"], f"{model['load_time_s']:.3f}"]
+        for model in data.models
+        if model.get("load_time_s") is not None
+    ]
+    if load_rows:
+        lines.append("\n## Model load\n")
+        lines.append(tabulate(load_rows, headers=["Model", "load_time_s"], tablefmt="github"))
+    latency_rows = data.latency_rows()
+    if latency_rows:
+        lines.append("\n## Latency\n")
+        headers = ["Model", "Metric", "Trials", "p50", "p90", "p99", "mean", "std"]
+        lines.append(tabulate(latency_rows, headers=headers, tablefmt="github"))
+    resource_rows = data.resource_rows()
+    if resource_rows:
+        lines.append("\n## Resources\n")
+        headers = [
+            "Model",
+            "Outputs",
+            "cpu_s",
+            "cpu_s_per_audio_s",
+            "max_rss_delta_mb",
+            "max_child_rss_mb",
+            "max_threads",
+        ]
+        lines.append(tabulate(resource_rows, headers=headers, tablefmt="github"))
+    if data.phases:
+        lines.append("\n## Phases\n")
+        phase_rows = [
+            [
+                row["model"],
+                row["phase"],
+                row["calls"],
+                f"{row['total_s']:.3f}",
+                f"{row['total_s'] * 1000.0 / max(1, row['calls']):.2f}",
+            ]
+            for row in data.phases
+        ]
+        headers = ["Model", "Phase", "Calls", "Total s", "Mean ms"]
+        lines.append(tabulate(phase_rows, headers=headers, tablefmt="github"))
+        lines.append("\nPhases nest (e.g. `metrics.loudness` inside `metrics.audio`) and overlap")
+        lines.append("across threads, so totals do not add up to the run's wall time.")
+    skipped_rows = data.skipped_rows()
+    if skipped_rows:
+        lines.append("\n## Skipped\n")
+        lines.append(
+            tabulate(skipped_rows, headers=["Model", "Kind", "Count", "Reason"], tablefmt="github")
+        )
     lines.append("\n## Per-model metrics\n")
-    for model, metrics in averages.items():
+    headers = ["Metric", "n", "mean", f"{confidence} CI", "std", "min", "p50", "p95", "p99", "max"]
+    for model, entry in models.items():
         lines.append(f"### {model}\n")
-        metric_rows = [[name, f"{value:.4f}"] for name, value in sorted(metrics.items())]
-        lines.append(tabulate(metric_rows, headers=["Metric", "Average"], tablefmt="github"))
+        metric_rows = []
+        for name, stat in entry["metrics"].items():
+            interval = "[{:.4f}, {:.4f}]".format(*stat["ci"]) if "ci" in stat else "n/a"
+            metric_rows.append(
+                [name, stat["count"], f"{stat['mean']:.4f}", interval]
+                + [f"{stat[key]:.4f}" for key in ("std", "min", "p50", "p95", "p99", "max")]
+            )
+        lines.append(tabulate(metric_rows, headers=headers, tablefmt="github"))
         lines.append("")
 
     path.write_text("\n".join(lines))
+    return summary
+
+
+def write_loadtest_report(path: Path, payload: Dict[str, object]) -> None:
+    run = payload["run"]
+    lines = [
+        "# TTS Load Test Report\n",
+        f"Run ID: {run['run_id']}\n",
+        f"Model: {run['model']} ({run['workers']} worker(s), {run['mode']} load)\n",
+    ]
+    levels = payload.get("levels", [])
+    if not levels:
+        lines.append("No requests issued.\n")
+        path.write_text("\n".join(lines))
+        return
+    unit = "clients" if run["mode"] == "closed" else "offered_rps"
+    headers = [unit, "requests", "errors", "throughput_rps", "p50_s", "p95_s", "p99_s"]
+    headers += ["queue_mean_s", "service_mean_s"]
+    rows = [
+        [
+            level["level"],
+            level["requests"],
+            level["errors"],
+            f"{level['throughput_rps']:.3f}",
+            _format_optional(level["latency_p50_s"], ".4f"),
+            _format_optional(level["latency_p95_s"], ".4f"),
+            _format_optional(level["latency_p99_s"], ".4f"),
+            _format_optional(level["queue_mean_s"], ".4f"),
+            _format_optional(level["service_mean_s"], ".4f"),
+        ]
+        for level in levels
+    ]
+    lines.append("## Latency vs load\n")
+    lines.append(tabulate(rows, headers=headers, tablefmt="github"))
+    saturation = payload.get("saturation")
+    if saturation:
+        lines.append("\n## Saturation\n")
+        lines.append(
+            f"Peak throughput {saturation['throughput_rps']:.3f} req/s at {unit} = "
+            f"{saturation['level']:g} "
+            f"(p95 latency {_format_optional(saturation['latency_p95_s'], '.4f')} s)."
+        )
+    path.write_text("\n".join(lines))
+
+
+def write_compare_report(path: Path, payload: Dict[str, Any]) -> None:
+    lines = [
+        "# TTS Run Comparison\n",
+        f"Baseline: {payload['baseline']}  ",
+        f"Candidate: {payload['candidate']}\n",
+    ]
+    if payload["history"]:
+        lines.append(f"Noise estimated from: {', '.join(payload['history'])}\n")
+    lines.append(
+        f"Unmatched outputs: {payload['baseline_only']} baseline-only, "
+        f"{payload['candidate_only']} candidate-only.\n"
+    )
+    if not payload["metrics"]:
+        lines.append("No paired outputs to compare.\n")
+        path.write_text("\n".join(lines))
+        return
+    confidence = f"{1.0 - payload['alpha']:.0%}"
+    rows = [
+        [
+            item["model"],
+            item["metric"],
+            item["pairs"],
+            f"{item['baseline']:.4f}",
+            f"{item['candidate']:.4f}",
+            f"{item['delta']:+.4f}",
+            _format_optional(item["relative_pct"], "+.1f"),
+            "[{:+.4f}, {:+.4f}]".format(*item["ci"]),
+            f"{item['p_value']:.4f}",
+            _format_optional(item["noise"], ".4g"),
+            f"{item['threshold']:g}",
+            item["verdict"],
+        ]
+        for item in payload["metrics"]
+    ]
+    headers = [
+        "Model",
+        "Metric",
+        "Pairs",
+        "Baseline",
+        "Candidate",
+        "Delta",
+        "Delta %",
+        f"{confidence} CI",
+        "p",
+        "Noise",
+        "Threshold",
+        "Verdict",
+    ]
+    lines.append(f"## Metrics ({payload['regressions']} regression(s))\n")
+    # Keep the signs on the delta columns.
+    lines.append(tabulate(rows, headers=headers, tablefmt="github", disable_numparse=[5, 6]))
+    lines.append("\nOutputs are paired by (model, prompt, style); p is a two-sided sign-flip")
+    lines.append("permutation test. Thresholds and noise are percent of the baseline for timings")
+    lines.append("and metric units otherwise.")
+    path.write_text("\n".join(lines))
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+# ``ru_maxrss`` is in kilobytes on Linux and bytes on macOS.
+_MAXRSS_TO_MB = 1 / 1024**2 if sys.platform == "darwin" else 1 / 1024
+RESOURCE_METRICS = (
+    "wall_time_s",
+    "cpu_user_s",
+    "cpu_sys_s",
+    "peak_rss_delta_mb",
+    "threads",
+    "child_cpu_user_s",
+    "child_cpu_sys_s",
+    "child_peak_rss_mb",
+)
+
+
+def thread_count() -> int:
+    """Native threads in this process, including those started by model runtimes."""
+    tasks = Path("/proc/self/task")
+    if tasks.exists():
+        return len(os.listdir(tasks))
+    return threading.active_count()
+
+
+@contextmanager
+def measure_resources() -> Iterator[Dict[str, float]]:
+    """Fill the yielded dict with the wall time and process usage of the enclosed block.
+
+    CPU time is process-wide (every thread, not child processes), so it overlaps between
+    concurrent synthesis workers. ``peak_rss_delta_mb`` is how far the block raised the
+    process's peak RSS: zero when it stayed under an earlier high-water mark.
+    """
+    usage: Dict[str, float] = {}
+    before = resource.getrusage(resource.RUSAGE_SELF) if resource is not None else None
+    start = time.perf_counter()
+    try:
+        yield usage
+    finally:
+        usage["wall_time_s"] = time.perf_counter() - start
+        usage["threads"] = float(thread_count())
+        if before is not None:
+            after = resource.getrusage(resource.RUSAGE_SELF)
+            usage["cpu_user_s"] = after.ru_utime - before.ru_utime
+            usage["cpu_sys_s"] = after.ru_stime - before.ru_stime
+            usage["peak_rss_delta_mb"] = (after.ru_maxrss - before.ru_maxrss) * _MAXRSS_TO_MB
+
+
+def wait_with_rusage(process: subprocess.Popen) -> Dict[str, float]:
+    """Reap ``process`` and return the resources it alone used.
+
+    ``os.wait4`` reports this child's usage exactly, unlike ``RUSAGE_CHILDREN`` deltas that
+    also pick up subprocesses finishing on other synthesis threads.
+    """
+    if not hasattr(os, "wait4"):
+        process.wait()
+        return {}
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return {
+        "child_cpu_user_s": usage.ru_utime,
+        "child_cpu_sys_s": usage.ru_stime,
+        "child_peak_rss_mb": usage.ru_maxrss * _MAXRSS_TO_MB,
+    }
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import atexit
 import json
+import logging
+import queue as _queue_module
+import signal
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote
 
 from sqlalchemy import (
     Boolean,
@@ -12,15 +19,35 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     MetaData,
     String,
     Table,
+    bindparam,
     create_engine,
+    delete,
+    event,
+    func,
+    select,
 )
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.engine import Engine
 from sqlalchemy.sql import insert
 
+from ttsbench.utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Applied to every connection: WAL lets readers (reports, rescoring) run alongside the
+# writer, and NORMAL sync only fsyncs at checkpoints, which WAL keeps crash-safe.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
 
 @dataclass
 class RunInfo:
@@ -35,9 +62,18 @@ class ResultsWriter:
     def __init__(self, sqlite_path: Path) -> None:
         self.sqlite_path = sqlite_path
         self.engine = create_engine(f"sqlite:///{sqlite_path}")
+        event.listen(self.engine, "connect", apply_sqlite_pragmas)
         self.metadata = MetaData()
         self._init_tables()
         self.metadata.create_all(self.engine)
+        # create_all skips indexes and new columns of tables that already exist, e.g. in
+        # older runs.
+        for index in self.metrics.indexes:
+            index.create(self.engine, checkfirst=True)
+        with self.engine.begin() as conn:
+            columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(outputs)")}
+            if "style" not in columns:
+                conn.exec_driver_sql("ALTER TABLE outputs ADD COLUMN style VARCHAR")
 
     def _init_tables(self) -> None:
         self.runs = Table(
@@ -57,6 +93,7 @@ class ResultsWriter:
             Column("name", String),
             Column("description", String),
             Column("available", Boolean),
+            Column("load_time_s", Float),
         )
         self.prompts = Table(
             "prompts",
@@ -77,6 +114,8 @@ class ResultsWriter:
             Column("prompt_id", Integer, ForeignKey("prompts.id")),
             Column("audio_path", String),
             Column("sample_rate", Integer),
+            # NULL in runs written before styles were recorded; see ``output_style``.
+            Column("style", String),
         )
         self.metrics = Table(
             "metrics",
@@ -85,75 +124,387 @@ class ResultsWriter:
             Column("output_id", Integer, ForeignKey("outputs.id")),
             Column("name", String),
             Column("value", Float),
+            Index("ix_metrics_output_id", "output_id"),
+        )
+        self.trials = Table(
+            "trials",
+            self.metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("output_id", Integer, ForeignKey("outputs.id")),
+            Column("trial", Integer),
+            Column("name", String),
+            Column("value", Float),
+            Index("ix_trials_output_id", "output_id"),
+        )
+        self.skipped_jobs = Table(
+            "skipped_jobs",
+            self.metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("run_id", String, ForeignKey("runs.id")),
+            Column("model", String),
+            Column("prompt_id", String),
+            Column("style", String),
+            Column("language", String),
+            Column("kind", String),
+            Column("reason", String),
         )
 
     def write_run(self, run: RunInfo) -> None:
+        """Record a run. Re-writing an existing run id (a resume) replaces its earlier rows."""
         with self.engine.begin() as conn:
+            output_ids = select(self.outputs.c.id).where(self.outputs.c.run_id == run.run_id)
+            conn.execute(delete(self.metrics).where(self.metrics.c.output_id.in_(output_ids)))
+            conn.execute(delete(self.trials).where(self.trials.c.output_id.in_(output_ids)))
+            for table in (self.outputs, self.prompts, self.models, self.skipped_jobs):
+                conn.execute(delete(table).where(table.c.run_id == run.run_id))
+            statement = sqlite_insert(self.runs).values(
+                id=run.run_id,
+                created_at=run.created_at,
+                prompts_path=run.prompts_path,
+                seed=run.seed,
+                notes=run.notes,
+            )
             conn.execute(
-                insert(self.runs).values(
-                    id=run.run_id,
-                    created_at=run.created_at,
-                    prompts_path=run.prompts_path,
-                    seed=run.seed,
-                    notes=run.notes,
+                statement.on_conflict_do_update(
+                    index_elements=["id"],
+                    set_={
+                        "prompts_path": statement.excluded.prompts_path,
+                        "seed": statement.excluded.seed,
+                        "notes": statement.excluded.notes,
+                    },
                 )
             )
 
     def write_models(self, run_id: str, models: Iterable[Dict[str, object]]) -> List[int]:
-        ids: List[int] = []
-        with self.engine.begin() as conn:
-            for model in models:
-                result = conn.execute(
-                    insert(self.models).values(
-                        run_id=run_id,
-                        name=model["name"],
-                        description=model["description"],
-                        available=bool(model["available"]),
-                    )
-                )
-                ids.append(int(result.inserted_primary_key[0]))
-        return ids
+        rows = [
+            {
+                "run_id": run_id,
+                "name": model["name"],
+                "description": model["description"],
+                "available": bool(model["available"]),
+                "load_time_s": model.get("load_time_s"),
+            }
+            for model in models
+        ]
+        return self._insert_returning_ids(self.models, rows)
 
     def write_prompts(self, run_id: str, prompts: Iterable[Dict[str, object]]) -> List[int]:
-        ids: List[int] = []
+        rows = [
+            {
+                "run_id": run_id,
+                "prompt_id": prompt["id"],
+                "text": prompt["text"],
+                "language": prompt["language"],
+                "style": prompt["style"],
+            }
+            for prompt in prompts
+        ]
+        return self._insert_returning_ids(self.prompts, rows)
+
+    def write_skipped(self, run_id: str, skipped: Iterable[Dict[str, object]]) -> None:
+        """Record planned combinations that were not synthesized, with the reason."""
+        rows = [dict(item, run_id=run_id) for item in skipped]
+        if rows:
+            with self.engine.begin() as conn:
+                conn.execute(insert(self.skipped_jobs), rows)
+
+    def _insert_returning_ids(self, table: Table, rows: List[Dict[str, Any]]) -> List[int]:
+        if not rows:
+            return []
+        statement = insert(table).returning(table.c.id, sort_by_parameter_order=True)
         with self.engine.begin() as conn:
-            for prompt in prompts:
-                result = conn.execute(
-                    insert(self.prompts).values(
-                        run_id=run_id,
-                        prompt_id=prompt["id"],
-                        text=prompt["text"],
-                        language=prompt["language"],
-                        style=prompt["style"],
-                    )
-                )
-                ids.append(int(result.inserted_primary_key[0]))
-        return ids
+            return [int(row[0]) for row in conn.execute(statement, rows)]
 
     def write_output(
         self,
         run_id: str,
         model_id: int,
         prompt_id: int,
-        audio_path: str,
+        audio_path: Optional[str],
         sample_rate: int,
         metrics: Dict[str, float],
+        trials: Optional[List[Dict[str, float]]] = None,
+        style: Optional[str] = None,
     ) -> None:
+        message = output_message(
+            run_id, model_id, prompt_id, audio_path, sample_rate, metrics, trials, style
+        )
+        self.write_outputs([message[1]])
+
+    def write_outputs(self, outputs: List[Dict[str, Any]]) -> List[int]:
+        """Insert many outputs and their metrics in one transaction with ``executemany``."""
+        if not outputs:
+            return []
         with self.engine.begin() as conn:
-            result = conn.execute(
-                insert(self.outputs).values(
-                    run_id=run_id,
-                    model_id=model_id,
-                    prompt_id=prompt_id,
-                    audio_path=audio_path,
-                    sample_rate=sample_rate,
+            max_id = select(func.coalesce(func.max(self.outputs.c.id), 0))
+            next_id = int(conn.execute(max_id).scalar_one()) + 1
+            output_rows = []
+            metric_rows = []
+            trial_rows = []
+            for offset, output in enumerate(outputs):
+                output_id = next_id + offset
+                output_rows.append(
+                    {
+                        "id": output_id,
+                        "run_id": output["run_id"],
+                        "model_id": output["model_id"],
+                        "prompt_id": output["prompt_id"],
+                        "audio_path": output["audio_path"],
+                        "sample_rate": output["sample_rate"],
+                        "style": output.get("style"),
+                    }
+                )
+                metric_rows.extend(
+                    {"output_id": output_id, "name": name, "value": value}
+                    for name, value in output["metrics"].items()
                 )
+                trial_rows.extend(
+                    {"output_id": output_id, "trial": trial, "name": name, "value": value}
+                    for trial, timings in enumerate(output.get("trials") or [])
+                    for name, value in timings.items()
+                )
+            conn.execute(insert(self.outputs), output_rows)
+            if metric_rows:
+                conn.execute(insert(self.metrics), metric_rows)
+            if trial_rows:
+                conn.execute(insert(self.trials), trial_rows)
+        return [row["id"] for row in output_rows]
+
+    def read_outputs(self) -> List[Dict[str, Any]]:
+        """Every output with its model name and prompt text, in insertion order."""
+        query = (
+            select(
+                self.outputs.c.id,
+                self.outputs.c.run_id,
+                self.outputs.c.audio_path,
+                self.outputs.c.sample_rate,
+                self.outputs.c.style,
+                self.models.c.name.label("model"),
+                self.prompts.c.prompt_id,
+                self.prompts.c.text,
+                self.prompts.c.language,
+                self.prompts.c.style.label("prompt_style"),
             )
-            output_id = int(result.inserted_primary_key[0])
+            .join(self.models, self.models.c.id == self.outputs.c.model_id)
+            .join(self.prompts, self.prompts.c.id == self.outputs.c.prompt_id)
+            .order_by(self.outputs.c.id)
+        )
+        with self.engine.begin() as conn:
+            rows = [dict(row._mapping) for row in conn.execute(query)]
+        for row in rows:
+            prompt_style = row.pop("prompt_style")
+            row["style"] = output_style(row["style"], row["audio_path"], prompt_style)
+        return rows
+
+    def update_metrics(self, values: Dict[int, Dict[str, float]]) -> None:
+        """Replace the named metrics of existing outputs in one transaction."""
+        stale: List[Dict[str, Any]] = []
+        fresh: List[Dict[str, Any]] = []
+        for output_id, metrics in values.items():
             for name, value in metrics.items():
-                conn.execute(
-                    insert(self.metrics).values(output_id=output_id, name=name, value=value)
-                )
+                stale.append({"target_id": output_id, "target_name": name})
+                fresh.append({"output_id": output_id, "name": name, "value": value})
+        if not stale:
+            return
+        statement = delete(self.metrics).where(
+            self.metrics.c.output_id == bindparam("target_id"),
+            self.metrics.c.name == bindparam("target_name"),
+        )
+        with self.engine.begin() as conn:
+            conn.execute(statement, stale)
+            conn.execute(insert(self.metrics), fresh)
 
     def dump_json(self, path: Path, payload: Dict[str, object]) -> None:
         path.write_text(json.dumps(payload, indent=2))
+
+
+def read_only_engine(sqlite_path: Path) -> Engine:
+    """An engine that can only read an existing ``results.sqlite``.
+
+    Unlike ``ResultsWriter`` it runs no DDL or pragmas, so reading an older run leaves the file
+    untouched, and runs on read-only storage can be opened.
+    """
+    path = quote(str(sqlite_path.resolve()))
+    return create_engine(f"sqlite:///file:{path}?mode=ro&uri=true")
+
+
+def apply_sqlite_pragmas(dbapi_connection: Any, _record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def output_style(
+    style: Optional[str], audio_path: Optional[str], prompt_style: Optional[str]
+) -> str:
+    """An output's style, recovering it for runs that predate the ``outputs.style`` column.
+
+    Those runs only have it in the audio layout ``<model>/<prompt>/<style>/audio.wav``; for
+    metrics-only outputs of multi-style prompts the prompt's own style is the best guess.
+    """
+    if style:
+        return style
+    if audio_path and len(Path(audio_path).parts) >= 4:
+        return Path(audio_path).parts[-2]
+    return prompt_style or "neutral"
+
+
+def output_message(
+    run_id: str,
+    model_id: int,
+    prompt_id: int,
+    audio_path: Optional[str],
+    sample_rate: int,
+    metrics: Dict[str, float],
+    trials: Optional[List[Dict[str, float]]] = None,
+    style: Optional[str] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """Queue message for ``BufferedResultsWriter``; picklable, so other processes can send it."""
+    return (
+        "output",
+        {
+            "run_id": run_id,
+            "model_id": model_id,
+            "prompt_id": prompt_id,
+            "audio_path": audio_path,
+            "sample_rate": sample_rate,
+            "metrics": dict(metrics),
+            "trials": [dict(timings) for timings in trials or []],
+            "style": style,
+        },
+    )
+
+
+class BufferedResultsWriter:
+    """Batches outputs onto a background thread that commits them in large transactions.
+
+    Outputs arrive on ``queue`` (a ``multiprocessing`` queue works too, so worker processes can
+    ``put(output_message(...))`` directly) and are flushed every ``flush_rows`` outputs or
+    ``flush_interval_s`` seconds. One thread owns the SQLite connection. Pending rows are
+    flushed on ``close()``, when leaving the context manager (including on exceptions and
+    Ctrl-C), and at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        writer: ResultsWriter,
+        flush_rows: int = 1000,
+        flush_interval_s: float = 2.0,
+        queue: Optional[Any] = None,
+    ) -> None:
+        self.writer = writer
+        self.flush_rows = max(1, flush_rows)
+        self.flush_interval_s = flush_interval_s
+        self.queue = queue if queue is not None else _queue_module.Queue()
+        self.written = 0
+        self._error: Optional[BaseException] = None
+        self._flush_requested = 0
+        self._flush_done = 0
+        self._flushed = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="results-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write_output(
+        self,
+        run_id: str,
+        model_id: int,
+        prompt_id: int,
+        audio_path: Optional[str],
+        sample_rate: int,
+        metrics: Dict[str, float],
+        trials: Optional[List[Dict[str, float]]] = None,
+        style: Optional[str] = None,
+    ) -> None:
+        self._raise_if_failed()
+        message = output_message(
+            run_id, model_id, prompt_id, audio_path, sample_rate, metrics, trials, style
+        )
+        self.queue.put(message)
+
+    def flush(self) -> None:
+        """Block until every output queued so far is committed."""
+        with self._flushed:
+            self._flush_requested += 1
+            token = self._flush_requested
+        self.queue.put(("flush", token))
+        with self._flushed:
+            self._flushed.wait_for(lambda: self._flush_done >= token or self._error is not None)
+        self._raise_if_failed()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self.queue.put(("stop", None))
+        self._thread.join()
+        self._raise_if_failed()
+
+    def __enter__(self) -> "BufferedResultsWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("Results writer failed") from self._error
+
+    def _run(self) -> None:
+        pending: List[Dict[str, Any]] = []
+        try:
+            while True:
+                try:
+                    kind, payload = self.queue.get(timeout=self.flush_interval_s)
+                except _queue_module.Empty:
+                    self._commit(pending)
+                    continue
+                if kind == "output":
+                    pending.append(payload)
+                    if len(pending) >= self.flush_rows:
+                        self._commit(pending)
+                elif kind == "flush":
+                    self._commit(pending)
+                    with self._flushed:
+                        self._flush_done = max(self._flush_done, payload)
+                        self._flushed.notify_all()
+                elif kind == "stop":
+                    self._commit(pending)
+                    return
+        except BaseException as exc:  # surfaced to the producer on its next call
+            logger.exception("Results writer failed")
+            with self._flushed:
+                self._error = exc
+                self._flushed.notify_all()
+
+    def _commit(self, pending: List[Dict[str, Any]]) -> None:
+        if pending:
+            with span("db_write", rows=len(pending)):
+                self.writer.write_outputs(pending)
+            self.written += len(pending)
+            pending.clear()
+
+
+@contextmanager
+def sigterm_flush() -> Iterator[None]:
+    """Turn SIGTERM into ``SystemExit`` inside the block so context managers flush results.
+
+    The previous handler comes back on exit, so library callers keep their own.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _handler(signum: int, _frame: Any) -> None:
+        raise SystemExit(128 + signum)
+
+    previous = signal.getsignal(signal.SIGTERM)
+    signal.signal(signal.SIGTERM, _handler)
+    try:
+        yield
+    finally:
+        # None means a handler installed outside Python; the default is the closest match.
+        signal.signal(signal.SIGTERM, signal.SIG_DFL if previous is None else previous)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RESULTS_STREAM = "results.jsonl"
+# results.json keys, in file order, and the stream record type each list is built from.
+JSON_SECTIONS = (
+    ("run", "run"),
+    ("models", "model"),
+    ("prompts", "prompt"),
+    ("outputs", "output"),
+    ("skipped", "skipped"),
+    ("phases", "phase"),
+)
+# Sections holding a single object rather than a list.
+SINGLE_SECTIONS = {"run"}
+
+
+class ResultsStream:
+    """Append-only JSONL record of a run, one ``{"type": ..., ...}`` object per line.
+
+    Lines are flushed as they are written, so an interrupted run keeps every output that
+    completed. Opening an existing stream truncates it, matching how ``write_run`` replaces a
+    resumed run's rows.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("w", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+
+    def write(self, kind: str, record: Dict[str, Any]) -> None:
+        line = json.dumps({"type": kind, **record}, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def write_many(self, kind: str, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            self.write(kind, record)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self) -> "ResultsStream":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def read_results_stream(path: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ``(type, record)`` pairs; a line cut short by a crash ends the stream."""
+    with path.open(encoding="utf-8") as handle:
+        for number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(
+                    "Truncated results stream", extra={"path": str(path), "line": number}
+                )
+                return
+            yield record.pop("type"), record
+
+
+def write_results_json(stream_path: Path, json_path: Optional[Path] = None) -> Path:
+    """Build the classic single-document ``results.json`` from a stream.
+
+    Each section is copied in its own pass over the stream, so only one record is in memory
+    at a time. The file is written beside the target and renamed into place.
+    """
+    json_path = json_path or stream_path.with_suffix(".json")
+    partial = json_path.with_name(json_path.name + ".partial")
+    with partial.open("w", encoding="utf-8") as out:
+        out.write("{")
+        for position, (key, kind) in enumerate(JSON_SECTIONS):
+            out.write(",\n" if position else "\n")
+            out.write(f"  {json.dumps(key)}: ")
+            stream = read_results_stream(stream_path)
+            records = (record for found, record in stream if found == kind)
+            if key in SINGLE_SECTIONS:
+                out.write(json.dumps(next(records, {}), default=str))
+                continue
+            out.write("[")
+            empty = True
+            for record in records:
+                out.write("\n    " if empty else ",\n    ")
+                out.write(json.dumps(record, default=str))
+                empty = False
+            out.write("]" if empty else "\n  ]")
+        out.write("\n}\n")
+    os.replace(partial, json_path)
+    return json_path
+
+
+def rewrite_results_stream(
+    path: Path, update: Callable[[str, Dict[str, Any]], Dict[str, Any]]
+) -> None:
+    """Pass every record through ``update`` and atomically replace the stream."""
+    partial = path.with_name(path.name + ".partial")
+    with partial.open("w", encoding="utf-8") as out:
+        for kind, record in read_results_stream(path):
+            out.write(json.dumps({"type": kind, **update(kind, record)}, default=str) + "\n")
+    os.replace(partial, path)
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import math
+import zlib
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+CONFIDENCE = 0.95
+BOOTSTRAP_SAMPLES = 1000
+# Resamples are drawn at most this size and rescaled; see ``bootstrap_means``.
+MAX_RESAMPLE = 2_000
+# Ranking direction per metric; metrics not listed are summarized but never ranked.
+LOWER_IS_BETTER = {
+    "rtf": True,
+    "time_to_first_audio_ms": True,
+    "total_time_s": True,
+    "wer": True,
+    "cer": True,
+    "speaker_similarity": False,
+}
+
+
+def finite(values: np.ndarray) -> np.ndarray:
+    return values[np.isfinite(values)]
+
+
+def model_seed(seed: int, model: str) -> int:
+    """A per-model seed: resamples stay independent across models and stable across runs."""
+    return seed + zlib.crc32(model.encode("utf-8"))
+
+
+def bootstrap_means(
+    values: np.ndarray, samples: int = BOOTSTRAP_SAMPLES, seed: int = 0
+) -> np.ndarray:
+    """Bootstrap distribution of the mean of ``values`` (which must be finite).
+
+    Large inputs use m-out-of-n resampling: ``MAX_RESAMPLE`` values per draw, with the
+    deviation from the sample mean scaled by ``sqrt(m / n)``. For a mean this gives the same
+    spread as full-size resamples at a fraction of the cost.
+    """
+    n = values.size
+    if n == 0:
+        return np.empty(0)
+    m = min(n, MAX_RESAMPLE)
+    rng = np.random.default_rng(seed)
+    means = np.empty(samples)
+    # Bound the index matrix to a few million entries per step.
+    step = max(1, 4_000_000 // m)
+    for start in range(0, samples, step):
+        count = min(step, samples - start)
+        means[start : start + count] = values[rng.integers(0, n, (count, m))].mean(axis=1)
+    if m < n:
+        center = values.mean()
+        means = center + (means - center) * np.sqrt(m / n)
+    return means
+
+
+def bootstrap_columns(
+    columns: Dict[str, np.ndarray], samples: int = BOOTSTRAP_SAMPLES, seed: int = 0
+) -> Dict[str, np.ndarray]:
+    """``bootstrap_means`` for several metrics of the same outputs.
+
+    Columns with a value for every output share one set of resample indices, so the gather
+    is done once for all of them; partially filled columns are resampled on their own.
+    """
+    dense = [name for name, values in columns.items() if np.isfinite(values).all()]
+    boots = {
+        name: bootstrap_means(finite(values), samples, seed)
+        for name, values in columns.items()
+        if name not in dense
+    }
+    if not dense:
+        return boots
+    matrix = np.column_stack([columns[name] for name in dense])
+    n = matrix.shape[0]
+    m = min(n, MAX_RESAMPLE)
+    rng = np.random.default_rng(seed)
+    means = np.empty((samples, len(dense)))
+    step = max(1, 4_000_000 // (m * len(dense)))
+    for start in range(0, samples, step):
+        count = min(step, samples - start)
+        means[start : start + count] = matrix[rng.integers(0, n, (count, m))].mean(axis=1)
+    if m < n:
+        center = matrix.mean(axis=0)
+        means = center + (means - center) * np.sqrt(m / n)
+    boots.update({name: means[:, index] for index, name in enumerate(dense)})
+    return boots
+
+
+def confidence_interval(means: np.ndarray, confidence: float = CONFIDENCE) -> List[float]:
+    """Percentile interval of a bootstrap distribution."""
+    tail = (1.0 - confidence) / 2.0 * 100.0
+    low, high = np.percentile(means, [tail, 100.0 - tail])
+    return [float(low), float(high)]
+
+
+def describe(
+    values: np.ndarray,
+    samples: int = BOOTSTRAP_SAMPLES,
+    confidence: float = CONFIDENCE,
+    seed: int = 0,
+    means: Optional[np.ndarray] = None,
+) -> Optional[Dict[str, Any]]:
+    """Count, mean, spread, percentiles and a bootstrap CI of the mean; ``None`` if empty.
+
+    ``means`` is a precomputed bootstrap distribution (see ``bootstrap_columns``).
+    """
+    values = finite(values)
+    if values.size == 0:
+        return None
+    percentiles = np.percentile(values, PERCENTILES)
+    summary: Dict[str, Any] = {
+        "count": int(values.size),
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+    }
+    summary.update({f"p{p}": float(v) for p, v in zip(PERCENTILES, percentiles)})
+    if means is None and samples > 0:
+        means = bootstrap_means(values, samples, seed)
+    if means is not None and means.size:
+        summary["ci"] = confidence_interval(means, confidence)
+    return summary
+
+
+def quick_stats(values: np.ndarray) -> Optional[Dict[str, Any]]:
+    """Count, mean, p50 and p95 without resampling, for breakdown cells."""
+    values = finite(values)
+    if values.size == 0:
+        return None
+    p50, p95 = np.percentile(values, [50, 95])
+    return {
+        "count": int(values.size),
+        "mean": float(values.mean()),
+        "p50": float(p50),
+        "p95": float(p95),
+    }
+
+
+def rank(
+    columns: Dict[str, np.ndarray],
+    lower_is_better: bool,
+    samples: int = BOOTSTRAP_SAMPLES,
+    confidence: float = CONFIDENCE,
+    seed: int = 0,
+    boots: Optional[Dict[str, np.ndarray]] = None,
+) -> List[Dict[str, Any]]:
+    """Order models by mean and test each against the next one down.
+
+    ``significant`` is true when the bootstrap CI of the difference between a model's mean
+    and the next-ranked model's mean excludes zero, i.e. the ordering between the two is not
+    noise. The last model has nothing below it and is never marked. ``boots`` reuses
+    bootstrap distributions already computed per model.
+    """
+    boots = dict(boots or {})
+    means: Dict[str, float] = {}
+    for model, values in columns.items():
+        values = finite(values)
+        if values.size == 0:
+            continue
+        means[model] = float(values.mean())
+        if model not in boots:
+            boots[model] = bootstrap_means(values, samples, model_seed(seed, model))
+    order: Sequence[str] = sorted(means, key=means.get, reverse=not lower_is_better)
+    rows = []
+    for position, model in enumerate(order):
+        row: Dict[str, Any] = {"rank": position + 1, "model": model, "mean": means[model]}
+        if samples > 0:
+            row["ci"] = confidence_interval(boots[model], confidence)
+        significant = False
+        if samples > 0 and position + 1 < len(order):
+            low, high = confidence_interval(boots[model] - boots[order[position + 1]], confidence)
+            significant = low > 0 or high < 0
+        row["significant"] = significant
+        rows.append(row)
+    return rows
+
+
+def sign_flip_test(differences: np.ndarray, samples: int = 10_000, seed: int = 0) -> float:
+    """Two-sided p-value that paired ``differences`` have zero mean (sign-flip permutation).
+
+    Under the null each difference is as likely positive as negative, so random sign flips
+    give the null distribution of the mean. Beyond ``MAX_RESAMPLE`` pairs that distribution
+    is normal with variance ``sum(d**2) / n**2`` and the p-value is taken from it instead.
+    """
+    differences = finite(differences)
+    n = differences.size
+    if n == 0 or not differences.any():
+        return 1.0
+    observed = abs(differences.mean())
+    if n > MAX_RESAMPLE:
+        scale = np.sqrt(np.sum(differences**2)) / n
+        return float(math.erfc(observed / scale / math.sqrt(2.0)))
+    rng = np.random.default_rng(seed)
+    extreme = 0
+    step = max(1, 4_000_000 // n)
+    for start in range(0, samples, step):
+        count = min(step, samples - start)
+        signs = rng.integers(0, 2, (count, n), dtype=np.int8) * 2 - 1
+        means = np.abs(signs @ differences) / n
+        # Tolerance: a flip that reproduces the observed split must count as extreme.
+        extreme += int(np.count_nonzero(means >= observed * (1 - 1e-12)))
+    return (extreme + 1) / (samples + 1)
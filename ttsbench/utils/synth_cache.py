@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Type
+
+import numpy as np
+from sqlalchemy import (
+    Column,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    delete,
+    event,
+    func,
+    select,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+
+from ttsbench.models.base import BaseTTSModel
+from ttsbench.utils.audio import AudioArtifact, write_audio
+from ttsbench.utils.results import apply_sqlite_pragmas
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 20 * 1024**3
+# Least recently used entries fetched per eviction query.
+_EVICT_BATCH = 64
+
+
+def cache_root() -> Path:
+    """Directory holding the caches shared by every run on the machine."""
+    env = os.environ.get("TTSBENCH_CACHE_DIR")
+    if env:
+        return Path(env)
+    return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "ttsbench"
+
+
+def default_cache_dir() -> Path:
+    return cache_root() / "synth"
+
+
+def file_fingerprint(value: Any) -> str:
+    """Identify a weights/voice file by path, size and mtime instead of hashing gigabytes."""
+    if not isinstance(value, str) or not value:
+        return json.dumps(value)
+    path = Path(value)
+    if not path.exists():
+        return value
+    files = [path] if path.is_file() else sorted(p for p in path.rglob("*") if p.is_file())
+    parts = [str(path.resolve())]
+    for file in files:
+        stat = file.stat()
+        name = file.relative_to(path) if file != path else ""
+        parts.append(f"{name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(parts)
+
+
+def synth_cache_key(
+    model_cls: Type[BaseTTSModel],
+    config: Dict[str, Any],
+    text: str,
+    style: str,
+    language: str,
+    seed: int,
+) -> str:
+    """Content address of one synthesis: identical inputs map to the same cached audio."""
+    keys = model_cls.load_keys + model_cls.cache_keys
+    fields = {key: file_fingerprint(config.get(key)) for key in keys}
+    payload = {
+        "model": model_cls.name,
+        "config": fields,
+        "text": text,
+        "style": style if model_cls.capabilities.supports_styles else None,
+        "language": language,
+        "seed": seed,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    entries: int
+    total_bytes: int
+    hits: int
+    max_bytes: int
+
+
+class SynthCache:
+    """Content-addressed audio store shared by every run on the machine.
+
+    Objects live under ``objects/<aa>/<key>.wav``; ``index.sqlite`` tracks size and last access
+    for LRU eviction once the store grows past ``max_bytes``. Cached audio is hard-linked into
+    run directories (copied when the run is on another filesystem).
+
+    The store's size is summed from the index once and then kept as a running total, so adding
+    an entry costs the same however large the store is. Other processes' additions are only
+    counted the next time this one prunes, which re-reads the total.
+    """
+
+    def __init__(self, root: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = root or default_cache_dir()
+        self.max_bytes = max_bytes
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        self.engine = create_engine(
+            f"sqlite:///{self.root / 'index.sqlite'}", connect_args={"timeout": 30}
+        )
+        event.listen(self.engine, "connect", apply_sqlite_pragmas)
+        self.metadata = MetaData()
+        self.entries = Table(
+            "entries",
+            self.metadata,
+            Column("key", String, primary_key=True),
+            Column("model", String),
+            Column("sample_rate", Integer),
+            Column("size_bytes", Integer),
+            Column("created_at", Float),
+            Column("last_access", Float),
+            Column("hits", Integer, default=0),
+            Index("ix_entries_last_access", "last_access"),
+        )
+        self.metadata.create_all(self.engine)
+        # create_all skips indexes of a table that already exists, e.g. in an older store.
+        for index in self.entries.indexes:
+            index.create(self.engine, checkfirst=True)
+        self._total_bytes: Optional[int] = None
+        self._total_lock = threading.Lock()
+
+    def object_path(self, key: str) -> Path:
+        return self.root / "objects" / key[:2] / f"{key}.wav"
+
+    def get(self, key: str) -> Optional[AudioArtifact]:
+        path = self.object_path(key)
+        if not path.exists():
+            return None
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(self.entries)
+                .where(self.entries.c.key == key)
+                .values(last_access=time.time(), hits=self.entries.c.hits + 1)
+            )
+        try:
+            return AudioArtifact.from_path(path)
+        except (OSError, RuntimeError):
+            # Another process pruned the entry after the existence check.
+            logger.debug("Cached audio vanished", extra={"key": key})
+            return None
+
+    def put(self, key: str, model: str, samples: np.ndarray, sample_rate: int) -> Path:
+        """Encode ``samples`` straight into the store."""
+        tmp_path = self._tmp_path(key)
+        write_audio(tmp_path, samples, sample_rate)
+        return self._commit(key, model, sample_rate, tmp_path)
+
+    def adopt(self, key: str, model: str, sample_rate: int, path: Path) -> Path:
+        """Store an already written output by hard-linking it, so the audio is encoded once."""
+        tmp_path = self._tmp_path(key)
+        tmp_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, tmp_path)
+        except OSError:
+            shutil.copyfile(path, tmp_path)
+        return self._commit(key, model, sample_rate, tmp_path)
+
+    def _tmp_path(self, key: str) -> Path:
+        return self.object_path(key).with_name(f".{key}.{os.getpid()}.{threading.get_ident()}.wav")
+
+    def _commit(self, key: str, model: str, sample_rate: int, tmp_path: Path) -> Path:
+        path = self.object_path(key)
+        os.replace(tmp_path, path)
+        size = path.stat().st_size
+        now = time.time()
+        with self._total_lock, self.engine.begin() as conn:
+            if self._total_bytes is None:
+                self._total_bytes = self._stored_bytes(conn)
+            previous = conn.execute(
+                select(self.entries.c.size_bytes).where(self.entries.c.key == key)
+            ).scalar_one_or_none()
+            statement = sqlite_insert(self.entries).values(
+                key=key,
+                model=model,
+                sample_rate=sample_rate,
+                size_bytes=size,
+                created_at=now,
+                last_access=now,
+                hits=0,
+            )
+            conn.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["key"], set_={"last_access": now, "size_bytes": size}
+                )
+            )
+            self._total_bytes += size - int(previous or 0)
+            if self._total_bytes > self.max_bytes:
+                removed, self._total_bytes = self._evict(conn, self._total_bytes, self.max_bytes)
+                logger.info("Pruned synthesis cache", extra={"removed": removed})
+        return path
+
+    def link_into(self, key: str, target: Path) -> Optional[Path]:
+        """Place the cached audio at ``target``; None if the entry was pruned meanwhile."""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            target.unlink()
+        try:
+            os.link(self.object_path(key), target)
+        except OSError:
+            try:
+                shutil.copyfile(self.object_path(key), target)
+            except OSError:
+                logger.debug("Cached audio vanished", extra={"key": key})
+                return None
+        return target
+
+    def stats(self) -> CacheStats:
+        with self.engine.begin() as conn:
+            entries, total, hits = conn.execute(
+                select(
+                    func.count(),
+                    func.coalesce(func.sum(self.entries.c.size_bytes), 0),
+                    func.coalesce(func.sum(self.entries.c.hits), 0),
+                )
+            ).one()
+        return CacheStats(
+            entries=int(entries), total_bytes=int(total), hits=int(hits), max_bytes=self.max_bytes
+        )
+
+    def prune(self, max_bytes: int) -> int:
+        """Evict least recently used entries until the store fits in ``max_bytes``."""
+        with self._total_lock, self.engine.begin() as conn:
+            total = self._stored_bytes(conn)
+            removed, self._total_bytes = self._evict(conn, total, max_bytes)
+        logger.info("Pruned synthesis cache", extra={"removed": removed})
+        return removed
+
+    def _stored_bytes(self, conn: Connection) -> int:
+        total_query = select(func.coalesce(func.sum(self.entries.c.size_bytes), 0))
+        return int(conn.execute(total_query).scalar_one())
+
+    def _evict(self, conn: Connection, total: int, max_bytes: int) -> Tuple[int, int]:
+        """Evict oldest entries while ``total`` exceeds ``max_bytes``; return count and total."""
+        removed = 0
+        while total > max_bytes:
+            rows = conn.execute(
+                select(self.entries.c.key, self.entries.c.size_bytes)
+                .order_by(self.entries.c.last_access)
+                .limit(_EVICT_BATCH)
+            ).all()
+            if not rows:
+                break
+            for key, size in rows:
+                if total <= max_bytes:
+                    break
+                self.object_path(key).unlink(missing_ok=True)
+                conn.execute(delete(self.entries).where(self.entries.c.key == key))
+                total -= int(size)
+                removed += 1
+        return removed, total
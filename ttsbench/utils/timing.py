@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from ttsbench.models.base import BaseTTSModel, SynthResult
+
+
+def synth_streamed(model: BaseTTSModel, text: str, config: Dict[str, Any]) -> SynthResult:
+    """Drive ``model.synth_stream`` and timestamp the chunks as they arrive.
+
+    ``time_to_first_audio_ms`` is the delay until the first non-empty chunk; gaps between
+    later chunks show whether playback could keep up without underruns. A stats dict returned
+    by the generator (e.g. a subprocess's resource usage) becomes ``SynthResult.stats``.
+    """
+    sample_rate = model.stream_sample_rate(config)
+    chunks: List[np.ndarray] = []
+    arrivals: List[float] = []
+    stream = model.synth_stream(text, config)
+    start = time.perf_counter()
+    while True:
+        try:
+            chunk = next(stream)
+        except StopIteration as stop:
+            stats = dict(stop.value or {})
+            break
+        if chunk.size == 0:
+            continue
+        arrivals.append(time.perf_counter())
+        chunks.append(chunk)
+    total = time.perf_counter() - start
+
+    audio = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+    duration = audio.shape[0] / sample_rate if sample_rate > 0 else 0.0
+    timings = {
+        "total_time_s": total,
+        "rtf": total / duration if duration > 0 else 0.0,
+        "chunk_count": float(len(chunks)),
+    }
+    if arrivals:
+        timings["time_to_first_audio_ms"] = (arrivals[0] - start) * 1000.0
+        gaps = np.diff(np.asarray(arrivals)) * 1000.0
+        timings["max_chunk_gap_ms"] = float(gaps.max()) if gaps.size else 0.0
+        timings["mean_chunk_gap_ms"] = float(gaps.mean()) if gaps.size else 0.0
+    return SynthResult(
+        audio_path=None, sample_rate=sample_rate, timings=timings, stats=stats, audio=audio
+    )
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Row label for spans that are not tied to one model (DB commits, shared scoring batches).
+SHARED = "(shared)"
+
+
+@dataclass
+class SpanRecord:
+    name: str
+    start_us: int
+    duration_us: int
+    pid: int
+    tid: int
+    thread: str
+    model: Optional[str] = None
+    args: Dict[str, Any] = field(default_factory=dict)
+    # Fraction of a model-less span's time owed to each model (see ``model_shares``).
+    shares: Optional[Dict[str, float]] = None
+
+
+class Tracer:
+    """Collects timed spans from any thread.
+
+    Per ``(model, span)`` totals are always kept, which is what the report's phase breakdown
+    needs. Individual spans are only kept with ``record_events`` (for ``write_chrome_trace``),
+    and with ``profile`` the outermost span on each thread runs under cProfile.
+    """
+
+    def __init__(self, record_events: bool = False, profile: bool = False) -> None:
+        self.record_events = record_events
+        self.profile = profile
+        self.events: List[SpanRecord] = []
+        self.totals: Dict[Tuple[str, str], List[float]] = defaultdict(lambda: [0, 0.0])
+        self._profiles: Dict[str, List[cProfile.Profile]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def span(self, name: str, model: Optional[str] = None, **args: Any) -> Iterator[None]:
+        profiler = self._start_profiler(name) if self.profile else None
+        shares = None if model else _current_shares()
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - start
+            if profiler is not None:
+                profiler.disable()
+                self._local.profiling = False
+            thread = threading.current_thread()
+            self.add(
+                SpanRecord(
+                    name=name,
+                    start_us=start // 1000,
+                    duration_us=duration // 1000,
+                    pid=os.getpid(),
+                    tid=thread.native_id or 0,
+                    thread=thread.name,
+                    model=model,
+                    args=args,
+                    shares=shares,
+                )
+            )
+
+    def add(self, record: SpanRecord) -> None:
+        with self._lock:
+            self._accumulate(record.name, record.model, record.shares, record.duration_us / 1e6)
+            if self.record_events:
+                self.events.append(record)
+
+    def _accumulate(
+        self,
+        name: str,
+        model: Optional[str],
+        shares: Optional[Dict[str, float]],
+        seconds: float,
+    ) -> None:
+        # Callers hold ``self._lock``. A shared span counts as one call for every model in it.
+        if model is None and shares:
+            for share_model, share in shares.items():
+                total = self.totals[(share_model, name)]
+                total[0] += 1
+                total[1] += seconds * share
+            return
+        total = self.totals[(model or SHARED, name)]
+        total[0] += 1
+        total[1] += seconds
+
+    def extend(self, records: List[SpanRecord]) -> None:
+        """Merge spans recorded in another process (e.g. a scoring worker)."""
+        for record in records:
+            self.add(record)
+
+    def drain(self) -> List[SpanRecord]:
+        with self._lock:
+            events, self.events = self.events, []
+            self.totals.clear()
+        return events
+
+    def breakdown(self) -> List[Dict[str, Any]]:
+        """Calls and total seconds per model and span name, slowest first."""
+        with self._lock:
+            rows = [
+                {"model": model, "phase": name, "calls": int(calls), "total_s": seconds}
+                for (model, name), (calls, seconds) in self.totals.items()
+            ]
+        return sorted(rows, key=lambda row: (row["model"], -row["total_s"]))
+
+    def write_chrome_trace(self, path: Path) -> None:
+        """Chrome/Perfetto trace-event JSON: one complete ("X") event per span."""
+        with self._lock:
+            events = list(self.events)
+        trace: List[Dict[str, Any]] = []
+        threads = {(event.pid, event.tid): event.thread for event in events}
+        for (pid, tid), thread in threads.items():
+            trace.append(
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread}}
+            )
+        for event in events:
+            args = dict(event.args, model=event.model) if event.model else event.args
+            if event.shares:
+                args = dict(args, shares=event.shares)
+            trace.append(
+                {
+                    "name": event.name,
+                    "cat": event.model or SHARED,
+                    "ph": "X",
+                    "ts": event.start_us,
+                    "dur": event.duration_us,
+                    "pid": event.pid,
+                    "tid": event.tid,
+                    "args": args,
+                }
+            )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"traceEvents": trace, "displayTimeUnit": "ms"}, default=str))
+
+    def write_profiles(self, directory: Path) -> List[Path]:
+        """One ``<span>.prof`` per profiled span name, merged across threads (pstats format)."""
+        directory.mkdir(parents=True, exist_ok=True)
+        written = []
+        with self._lock:
+            profiles = {name: list(items) for name, items in self._profiles.items()}
+        for name, items in profiles.items():
+            stats = pstats.Stats(items[0])
+            for profile in items[1:]:
+                stats.add(profile)
+            path = directory / f"{name}.prof"
+            stats.dump_stats(path)
+            written.append(path)
+        return written
+
+    def _start_profiler(self, name: str) -> Optional[cProfile.Profile]:
+        # cProfile hooks one profiler per thread, so nested spans stay inside their parent's.
+        if getattr(self._local, "profiling", False):
+            return None
+        profiles: Dict[str, cProfile.Profile] = getattr(self._local, "profiles", None) or {}
+        self._local.profiles = profiles
+        if name not in profiles:
+            profiles[name] = cProfile.Profile()
+            with self._lock:
+                self._profiles[name].append(profiles[name])
+        try:
+            profiles[name].enable()
+        except ValueError:  # Python 3.12+ allows one active profiler per process
+            return None
+        self._local.profiling = True
+        return profiles[name]
+
+
+class _TotalsSpan:
+    __slots__ = ("collector", "name", "model", "shares", "start")
+
+    def __init__(self, collector: "PhaseTotals", name: str, model: Optional[str]) -> None:
+        self.collector = collector
+        self.name = name
+        self.model = model
+        self.shares = None if model else _current_shares()
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc: object) -> None:
+        seconds = (time.perf_counter_ns() - self.start) / 1e9
+        with self.collector._lock:
+            self.collector._accumulate(self.name, self.model, self.shares, seconds)
+
+
+class PhaseTotals(Tracer):
+    """Only the per ``(model, span)`` totals, for runs without ``--trace`` or ``--profile``.
+
+    Spans are timed with a slotted context manager and added straight to the totals, skipping
+    the span record, thread lookup and profiler checks of a full ``Tracer``.
+    """
+
+    def span(self, name: str, model: Optional[str] = None, **args: Any) -> ContextManager[None]:
+        return _TotalsSpan(self, name, model)
+
+
+_LOCAL = threading.local()
+
+
+@contextmanager
+def model_shares(models: Sequence[str]) -> Iterator[None]:
+    """Charge model-less spans in the block to ``models``, in proportion to their counts.
+
+    Scoring batches mix outputs of several models; this splits a batch's metric time between
+    them instead of reporting it all under ``SHARED``.
+    """
+    previous = _current_shares()
+    counts = Counter(models)
+    _LOCAL.shares = {model: count / len(models) for model, count in counts.items()} or None
+    try:
+        yield
+    finally:
+        _LOCAL.shares = previous
+
+
+def _current_shares() -> Optional[Dict[str, float]]:
+    return getattr(_LOCAL, "shares", None)
+
+
+_TRACER: Optional[Tracer] = None
+_DISABLED: ContextManager[None] = nullcontext()
+
+
+def set_tracer(tracer: Optional[Tracer]) -> Optional[Tracer]:
+    """Install the process-wide tracer (``None`` disables tracing); returns the previous one."""
+    global _TRACER
+    previous, _TRACER = _TRACER, tracer
+    return previous
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _TRACER
+
+
+@contextmanager
+def use_tracer(tracer: Optional[Tracer]) -> Iterator[Optional[Tracer]]:
+    previous = set_tracer(tracer)
+    try:
+        yield tracer
+    finally:
+        set_tracer(previous)
+
+
+def span(name: str, model: Optional[str] = None, **args: Any) -> ContextManager[None]:
+    """Time the enclosed block under ``name``. A shared no-op while no tracer is installed."""
+    tracer = _TRACER
+    if tracer is None:
+        return _DISABLED
+    return tracer.span(name, model, **args)
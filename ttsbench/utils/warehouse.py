@@ -0,0 +1,609 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import (
+    Column,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    delete,
+    event,
+    literal,
+    select,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+
+from ttsbench.utils.report import length_bucket
+from ttsbench.utils.results import apply_sqlite_pragmas, output_style, read_only_engine
+
+logger = logging.getLogger(__name__)
+
+# Fixed per-output columns; every other column of ``outputs`` (and of the Parquet files) is a
+# metric, one REAL column per metric name.
+OUTPUT_COLUMNS = (
+    "run_id",
+    "created_at",
+    "week",
+    "model",
+    "prompt_id",
+    "language",
+    "style",
+    "length",
+    "audio_path",
+    "sample_rate",
+)
+# Dimensions ``query`` can group by; time buckets come from the run's creation time.
+GROUP_BY = ("model", "run_id", "language", "style", "length", "day", "week", "month")
+TIME_BUCKETS = ("day", "week", "month")
+# Leading columns of the scan index; the SQLite engine reads outputs one such group at a time.
+PARTITION_COLUMNS = ("model", "created_at", "run_id")
+STATS = ("count", "mean", "min", "max", "p50", "p90", "p95", "p99")
+_METRIC_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_UNSAFE = re.compile(r"[^A-Za-z0-9_]")
+_INGEST_CHUNK = 10_000
+# Group labels and one code per output indexing into them.
+Key = Tuple[List[Any], np.ndarray]
+
+
+def metric_column(name: str) -> str:
+    """Column for a metric name: ``/`` becomes ``__`` and any other unsafe character ``_``."""
+    column = _UNSAFE.sub("_", name.replace("/", "__"))
+    return column if _METRIC_NAME.match(column) else f"_{column}"
+
+
+def parquet_available() -> bool:
+    return find_spec("pyarrow") is not None
+
+
+def week_label(created_at: float) -> str:
+    year, week, _ = datetime.fromtimestamp(created_at, timezone.utc).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _time_label(created_at: float, bucket: str) -> str:
+    moment = datetime.fromtimestamp(created_at, timezone.utc)
+    if bucket == "week":
+        return week_label(created_at)
+    return moment.strftime("%Y-%m-%d" if bucket == "day" else "%Y-%m")
+
+
+@dataclass
+class IngestSummary:
+    run_id: str
+    outputs: int
+    metrics: int
+    replaced: bool
+
+
+class Warehouse:
+    """Outputs of many runs in one place.
+
+    ``warehouse.sqlite`` holds one wide row per output (fixed columns plus one column per
+    metric) with indexes for point lookups by run, model and prompt and for time-ranged
+    scans per model. With ``pyarrow`` installed the same rows are also written as Parquet,
+    partitioned as ``parquet/model=<name>/week=<YYYY-Www>/<run_id>.parquet``, which is what
+    ``query`` reads for analytics when it is present.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.parquet_dir = root / "parquet"
+        root.mkdir(parents=True, exist_ok=True)
+        self.engine = create_engine(f"sqlite:///{root / 'warehouse.sqlite'}")
+        event.listen(self.engine, "connect", apply_sqlite_pragmas)
+        self.metadata = MetaData()
+        self.runs = Table(
+            "runs",
+            self.metadata,
+            Column("run_id", String, primary_key=True),
+            Column("created_at", Float),
+            Column("prompts_path", String),
+            Column("seed", Integer),
+            Column("source", String),
+            Column("outputs", Integer),
+            Column("ingested_at", Float),
+        )
+        self.outputs = Table(
+            "outputs",
+            self.metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("run_id", String),
+            Column("created_at", Float),
+            Column("week", String),
+            Column("model", String),
+            Column("prompt_id", String),
+            Column("language", String),
+            Column("style", String),
+            Column("length", String),
+            Column("audio_path", String),
+            Column("sample_rate", Integer),
+            Index("ix_outputs_model_created_at_run", *PARTITION_COLUMNS),
+            Index("ix_outputs_run_model_prompt", "run_id", "model", "prompt_id"),
+            Index("ix_outputs_prompt_id", "prompt_id"),
+        )
+        # Metric name behind each metric column, for names that are not valid column names.
+        self.metrics = Table(
+            "metrics",
+            self.metadata,
+            Column("column", String, primary_key=True),
+            Column("name", String, unique=True),
+        )
+        self.metadata.create_all(self.engine)
+        # create_all skips indexes of tables that already exist.
+        for index in self.outputs.indexes:
+            index.create(self.engine, checkfirst=True)
+
+    def metric_columns(self) -> List[str]:
+        with self.engine.begin() as conn:
+            columns = [row[1] for row in conn.exec_driver_sql("PRAGMA table_info(outputs)")]
+        return [name for name in columns if name != "id" and name not in OUTPUT_COLUMNS]
+
+    def metric_names(self) -> Dict[str, str]:
+        """Metric name by column, for every metric column (older stores kept names as is)."""
+        with self.engine.begin() as conn:
+            named = dict(conn.execute(select(self.metrics.c.column, self.metrics.c.name)).all())
+        return {column: named.get(column, column) for column in self.metric_columns()}
+
+    def _metric_columns_for(self, names: Sequence[str]) -> Dict[str, str]:
+        """Column by metric name; names whose column is taken by something else are left out."""
+        # SQLite column names are case-insensitive.
+        owners = {column.lower(): name for column, name in self.metric_names().items()}
+        owners.update({name: name for name in OUTPUT_COLUMNS + ("id",)})
+        columns: Dict[str, str] = {}
+        clashes = []
+        for name in names:
+            column = metric_column(name)
+            if owners.setdefault(column.lower(), name) == name:
+                columns[name] = column
+            else:
+                clashes.append(name)
+        if clashes:
+            logger.warning(
+                "Skipping metrics whose column is taken by another name",
+                extra={"metrics": clashes},
+            )
+        return columns
+
+    def _add_metric_columns(self, metrics: Dict[str, str]) -> None:
+        existing = set(self.metric_columns())
+        with self.engine.begin() as conn:
+            for name, column in metrics.items():
+                if column not in existing:
+                    conn.exec_driver_sql(f'ALTER TABLE outputs ADD COLUMN "{column}" REAL')
+                conn.execute(
+                    sqlite_insert(self.metrics)
+                    .values(column=column, name=name)
+                    .on_conflict_do_nothing()
+                )
+
+    def ingest(self, run_dir: Path) -> IngestSummary:
+        """Copy one run's ``results.sqlite`` in; re-ingesting a run replaces its rows."""
+        source = run_dir / "results.sqlite"
+        if not source.exists():
+            raise FileNotFoundError(f"{run_dir} has no results.sqlite")
+        run, chunks = read_run(source)
+        with self.engine.begin() as conn:
+            replaced = conn.execute(
+                delete(self.outputs).where(self.outputs.c.run_id == run["run_id"])
+            ).rowcount
+        self._remove_parquet(run["run_id"])
+
+        outputs = 0
+        metrics: Dict[str, str] = {}
+        for rows in chunks:
+            names = sorted({name for row in rows for name in row["metrics"]})
+            columns = self._metric_columns_for(names)
+            self._add_metric_columns(columns)
+            metrics.update(columns)
+            self._insert(rows, columns)
+            if parquet_available():
+                self._write_parquet(rows, columns)
+            outputs += len(rows)
+
+        statement = sqlite_insert(self.runs).values(
+            run_id=run["run_id"],
+            created_at=run["created_at"],
+            prompts_path=run["prompts_path"],
+            seed=run["seed"],
+            source=str(run_dir),
+            outputs=outputs,
+            ingested_at=time.time(),
+        )
+        with self.engine.begin() as conn:
+            conn.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["run_id"],
+                    set_={
+                        "created_at": statement.excluded.created_at,
+                        "prompts_path": statement.excluded.prompts_path,
+                        "seed": statement.excluded.seed,
+                        "source": statement.excluded.source,
+                        "outputs": statement.excluded.outputs,
+                        "ingested_at": statement.excluded.ingested_at,
+                    },
+                )
+            )
+        logger.info("Run ingested", extra={"run_id": run["run_id"], "outputs": outputs})
+        return IngestSummary(run["run_id"], outputs, len(metrics), replaced > 0)
+
+    def _insert(self, rows: List[Dict[str, Any]], metrics: Dict[str, str]) -> None:
+        columns = list(OUTPUT_COLUMNS) + list(metrics.values())
+        quoted = ", ".join(f'"{name}"' for name in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        values = [
+            tuple(row[name] for name in OUTPUT_COLUMNS)
+            + tuple(row["metrics"].get(name) for name in metrics)
+            for row in rows
+        ]
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(f"INSERT INTO outputs ({quoted}) VALUES ({placeholders})", values)
+
+    def _write_parquet(self, rows: List[Dict[str, Any]], metrics: Dict[str, str]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        partitions: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for row in rows:
+            partitions.setdefault((row["model"], row["week"]), []).append(row)
+        # Explicit types: a column that is all null in one file must not become ``null`` there.
+        types = {"created_at": pa.float64(), "sample_rate": pa.int64()}
+        for (model, week), members in partitions.items():
+            columns: Dict[str, Any] = {
+                # Partition values live in the directory names, as hive partitioning expects.
+                name: pa.array([row[name] for row in members], type=types.get(name, pa.string()))
+                for name in OUTPUT_COLUMNS
+                if name not in ("model", "week")
+            }
+            for name, column in metrics.items():
+                columns[column] = pa.array(
+                    [row["metrics"].get(name) for row in members], type=pa.float64()
+                )
+            directory = self.parquet_dir / f"model={model}" / f"week={week}"
+            directory.mkdir(parents=True, exist_ok=True)
+            # Ingest chunks of one run land in numbered parts of the same partition.
+            part = len(list(directory.glob(f"{members[0]['run_id']}-*.parquet")))
+            pq.write_table(
+                pa.table(columns), directory / f"{members[0]['run_id']}-{part:04d}.parquet"
+            )
+
+    def _remove_parquet(self, run_id: str) -> None:
+        if self.parquet_dir.exists():
+            for path in self.parquet_dir.glob(f"model=*/week=*/{run_id}-*.parquet"):
+                path.unlink()
+
+    def lookup(
+        self,
+        run_id: Optional[str] = None,
+        model: Optional[str] = None,
+        prompt_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Indexed point lookup; metric columns an output lacks are left out of its row."""
+        where = ["1"]
+        params: List[Any] = []
+        for column, value in (("run_id", run_id), ("model", model), ("prompt_id", prompt_id)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        # Raw SQL: the Table object only knows the fixed columns, not the metric ones.
+        sql = f"SELECT * FROM outputs WHERE {' AND '.join(where)} ORDER BY id LIMIT ?"
+        with self.engine.begin() as conn:
+            cursor = conn.exec_driver_sql(sql, tuple(params + [limit]))
+            names = [description[0] for description in cursor.cursor.description]
+            rows = [dict(zip(names, values)) for values in cursor]
+        fixed = set(OUTPUT_COLUMNS) | {"id"}
+        metric_names = self.metric_names()
+        return [
+            {
+                metric_names.get(name, name): value
+                for name, value in row.items()
+                if value is not None or name in fixed
+            }
+            for row in rows
+        ]
+
+    def query(
+        self,
+        metric: str,
+        stats: Sequence[str] = ("count", "mean", "p95"),
+        group_by: Sequence[str] = ("model",),
+        models: Optional[Sequence[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        engine: str = "auto",
+    ) -> List[Dict[str, Any]]:
+        """Aggregate one metric over every ingested output, grouped by ``group_by``.
+
+        ``engine`` is ``parquet``, ``sqlite`` or ``auto`` (Parquet when ``pyarrow`` is
+        installed and files exist). Both read only the metric and the grouped columns: SQLite
+        walks its ``(model, created_at, run_id)`` index one run at a time, Parquet prunes by
+        partition directory.
+        """
+        unknown = [name for name in group_by if name not in GROUP_BY]
+        if unknown:
+            raise ValueError(f"Cannot group by {unknown}; choose from {list(GROUP_BY)}")
+        unknown = [name for name in stats if name not in STATS]
+        if unknown:
+            raise ValueError(f"Unknown statistics {unknown}; choose from {list(STATS)}")
+        # Metrics are asked for by name; their column is accepted as well.
+        stored = {name: column for column, name in self.metric_names().items()}
+        if metric not in stored and metric not in stored.values():
+            raise ValueError(f"No metric {metric!r} in the warehouse")
+        metric = stored.get(metric, metric)
+        if engine == "auto":
+            use_parquet = parquet_available() and any(self.parquet_dir.glob("model=*"))
+            engine = "parquet" if use_parquet else "sqlite"
+        start = since.replace(tzinfo=timezone.utc).timestamp() if since else None
+        end = until.replace(tzinfo=timezone.utc).timestamp() if until else None
+        # Time buckets are derived from created_at rather than stored per bucket size.
+        columns = [name for name in group_by if name not in TIME_BUCKETS]
+        if len(columns) < len(group_by):
+            columns.append("created_at")
+        if engine == "parquet":
+            keys, values = self._scan_parquet(metric, columns, models, start, end)
+        elif engine == "sqlite":
+            keys, values = self._scan_sqlite(metric, columns, models, start, end)
+        else:
+            raise ValueError(f"Unknown engine {engine!r}; use auto, sqlite or parquet")
+        for bucket in TIME_BUCKETS:
+            if bucket in group_by:
+                stamps, codes = keys["created_at"]
+                keys[bucket] = _relabel([_time_label(stamp, bucket) for stamp in stamps], codes)
+        return aggregate({name: keys[name] for name in group_by}, values, stats)
+
+    def _scan_sqlite(
+        self,
+        metric: str,
+        columns: List[str],
+        models: Optional[Sequence[str]],
+        start: Optional[float],
+        end: Optional[float],
+    ) -> Tuple[Dict[str, Key], np.ndarray]:
+        where: List[str] = []
+        params: List[Any] = []
+        if models:
+            where.append(f"model IN ({', '.join('?' for _ in models)})")
+            params.extend(models)
+        if start is not None:
+            where.append("created_at >= ?")
+            params.append(start)
+        if end is not None:
+            where.append("created_at < ?")
+            params.append(end)
+        # Partitions come from the index alone; the metric filter needs the rows themselves.
+        condition = " AND ".join(where) or "1"
+        extra = [name for name in columns if name not in PARTITION_COLUMNS]
+        selected = ", ".join(f'"{name}"' for name in extra + [metric])
+        # The raw DB-API cursor: row objects cost more than the scan itself at this size.
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            partitions = cursor.execute(
+                f"SELECT DISTINCT model, created_at, run_id FROM outputs "
+                f"INDEXED BY ix_outputs_model_created_at_run WHERE {condition}",
+                params,
+            ).fetchall()
+            counts: List[int] = []
+            chunks: List[np.ndarray] = []
+            extra_chunks: List[List[Any]] = [[] for _ in extra]
+            for model, created_at, run_id in partitions:
+                rows = cursor.execute(
+                    f"SELECT {selected} FROM outputs WHERE model = ? AND created_at = ? "
+                    f'AND run_id = ? AND "{metric}" IS NOT NULL',
+                    [model, created_at, run_id],
+                ).fetchall()
+                for index, chunk in enumerate(extra_chunks):
+                    chunk.extend(row[index] for row in rows)
+                values = np.array([row[-1] for row in rows], dtype=np.float64)
+                chunks.append(values)
+                counts.append(values.size)
+        finally:
+            connection.close()
+
+        keys: Dict[str, Key] = {}
+        for position, name in enumerate(PARTITION_COLUMNS):
+            if name in columns:
+                labels = [partition[position] for partition in partitions]
+                keys[name] = _relabel(labels, np.repeat(np.arange(len(partitions)), counts))
+        for name, chunk in zip(extra, extra_chunks):
+            labels, codes = np.unique(np.asarray(chunk, dtype=str), return_inverse=True)
+            keys[name] = (labels.tolist(), codes)
+        values = np.concatenate(chunks) if chunks else np.empty(0)
+        return keys, values
+
+    def _scan_parquet(
+        self,
+        metric: str,
+        columns: List[str],
+        models: Optional[Sequence[str]],
+        start: Optional[float],
+        end: Optional[float],
+    ) -> Tuple[Dict[str, Key], np.ndarray]:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        dataset = ds.dataset(self.parquet_dir, format="parquet", partitioning="hive")
+        # Files written by different runs can carry different metric columns.
+        schema = pa.unify_schemas(
+            [dataset.schema] + [fragment.physical_schema for fragment in dataset.get_fragments()]
+        )
+        dataset = ds.dataset(
+            self.parquet_dir, format="parquet", partitioning="hive", schema=schema
+        )
+        condition = ds.field(metric).is_valid()
+        if models:
+            condition &= ds.field("model").isin(list(models))
+        if start is not None:
+            condition &= ds.field("created_at") >= start
+        if end is not None:
+            condition &= ds.field("created_at") < end
+        table = dataset.to_table(columns=columns + [metric], filter=condition)
+        keys: Dict[str, Key] = {}
+        for name in columns:
+            column = table.column(name).combine_chunks()
+            if pa.types.is_string(column.type):
+                column = column.fill_null("None")  # as the SQLite engine labels NULL
+            encoded = column.dictionary_encode()
+            codes = encoded.indices.to_numpy(zero_copy_only=False)
+            # Dictionary order is first appearance; relabel to sorted like the SQLite engine.
+            keys[name] = _relabel(encoded.dictionary.to_pylist(), codes)
+        values = table.column(metric).to_numpy(zero_copy_only=False).astype(np.float64)
+        return keys, values
+
+
+def _relabel(labels: Sequence[Any], codes: np.ndarray) -> Key:
+    """Merge codes whose labels are equal, e.g. several runs falling in one week."""
+    if not len(labels):
+        return [], codes
+    unique, inverse = np.unique(np.asarray(labels), return_inverse=True)
+    return unique.tolist(), inverse[codes]
+
+
+def aggregate(
+    keys: Dict[str, Key], values: np.ndarray, stats: Sequence[str]
+) -> List[Dict[str, Any]]:
+    """Summarize ``values`` per distinct combination of the key codes."""
+    if values.size == 0:
+        return []
+    names = list(keys)
+    if names:
+        codes = np.stack([keys[name][1] for name in names])
+        order = np.lexsort(codes[::-1])
+        codes = codes[:, order]
+        values = values[order]
+        boundaries = np.flatnonzero(np.any(np.diff(codes, axis=1) != 0, axis=0)) + 1
+    else:
+        codes = np.zeros((0, values.size), dtype=np.int64)
+        boundaries = np.empty(0, dtype=np.int64)
+    starts = np.concatenate([[0], boundaries])
+    ends = np.concatenate([boundaries, [values.size]])
+    results = []
+    for start, end in zip(starts, ends):
+        group = values[start:end]
+        row: Dict[str, Any] = {
+            name: keys[name][0][codes[index, start]] for index, name in enumerate(names)
+        }
+        for stat in stats:
+            row[stat] = _statistic(group, stat)
+        results.append(row)
+    return results
+
+
+def _statistic(values: np.ndarray, stat: str) -> float:
+    if stat == "count":
+        return int(values.size)
+    if stat == "mean":
+        return float(values.mean())
+    if stat == "min":
+        return float(values.min())
+    if stat == "max":
+        return float(values.max())
+    return float(np.percentile(values, float(stat[1:])))
+
+
+def read_run(source: Path) -> Tuple[Dict[str, Any], Iterator[List[Dict[str, Any]]]]:
+    """A run's metadata and its outputs in chunks, pivoted from ``results.sqlite``.
+
+    Works on every ``results.sqlite`` layout this package has written: metrics are read from
+    the narrow ``metrics(output_id, name, value)`` table a chunk of outputs at a time. The file
+    is opened read-only and its tables reflected, so reading never migrates an older run and
+    archived runs on read-only storage can be read.
+    """
+    engine = read_only_engine(source)
+    metadata = MetaData()
+    metadata.reflect(engine, only=("runs", "models", "prompts", "outputs", "metrics"))
+    runs = metadata.tables["runs"]
+    with engine.begin() as conn:
+        run_row = conn.execute(select(runs)).first()
+    if run_row is None:
+        engine.dispose()
+        raise ValueError(f"{source} has no run")
+    if run_row.created_at is not None:
+        # SQLite DateTime columns are naive UTC (see ``datetime.utcnow`` in the CLI).
+        created_at = run_row.created_at.replace(tzinfo=timezone.utc).timestamp()
+    else:
+        created_at = source.stat().st_mtime
+    run = {
+        "run_id": run_row.id,
+        "created_at": created_at,
+        "prompts_path": run_row.prompts_path,
+        "seed": run_row.seed,
+    }
+    return run, _read_outputs(engine, metadata, run, _INGEST_CHUNK)
+
+
+def _read_outputs(
+    engine: Engine, metadata: MetaData, run: Dict[str, Any], chunk: int
+) -> Iterator[List[Dict[str, Any]]]:
+    outputs, models, prompts, metrics = (
+        metadata.tables[name] for name in ("outputs", "models", "prompts", "metrics")
+    )
+    # Runs written before styles were recorded have no ``outputs.style``; see ``output_style``.
+    style = outputs.c.style if "style" in outputs.c else literal(None, String)
+    week = week_label(run["created_at"])
+    last_id = 0
+    try:
+        while True:
+            query = (
+                select(
+                    outputs.c.id,
+                    outputs.c.audio_path,
+                    outputs.c.sample_rate,
+                    style.label("style"),
+                    models.c.name.label("model"),
+                    prompts.c.prompt_id,
+                    prompts.c.text,
+                    prompts.c.language,
+                    prompts.c.style.label("prompt_style"),
+                )
+                .join(models, models.c.id == outputs.c.model_id)
+                .join(prompts, prompts.c.id == outputs.c.prompt_id)
+                .where(outputs.c.id > last_id)
+                .order_by(outputs.c.id)
+                .limit(chunk)
+            )
+            with engine.begin() as conn:
+                rows = [dict(row._mapping) for row in conn.execute(query)]
+                if not rows:
+                    return
+                first, last_id = rows[0]["id"], rows[-1]["id"]
+                values: Dict[int, Dict[str, float]] = {}
+                metric_rows = conn.execute(
+                    select(metrics.c.output_id, metrics.c.name, metrics.c.value).where(
+                        metrics.c.output_id.between(first, last_id)
+                    )
+                )
+                for output_id, name, value in metric_rows:
+                    values.setdefault(output_id, {})[name] = value
+            yield [
+                {
+                    "run_id": run["run_id"],
+                    "created_at": run["created_at"],
+                    "week": week,
+                    "model": row["model"],
+                    "prompt_id": row["prompt_id"],
+                    "language": row["language"],
+                    "style": output_style(row["style"], row["audio_path"], row["prompt_style"]),
+                    "length": length_bucket(row["text"] or ""),
+                    "audio_path": row["audio_path"],
+                    "sample_rate": row["sample_rate"],
+                    "metrics": values.get(row["id"], {}),
+                }
+                for row in rows
+            ]
+    finally:
+        engine.dispose()